@@ -0,0 +1,12 @@
+"""Puts the shared `docs_tools` package (next to the MapGen docs validator) on `sys.path` for these scripts."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+DOCS_TOOLS_DIR = Path(__file__).resolve().parents[4] / "system" / "libs" / "mapgen" / "tools"
+
+if str(DOCS_TOOLS_DIR) not in sys.path:
+    sys.path.append(str(DOCS_TOOLS_DIR))
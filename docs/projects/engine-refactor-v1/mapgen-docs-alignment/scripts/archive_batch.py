@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+DEFAULT_JOURNAL_REL = ".cache/mapgen-docs/archive-journal.jsonl"
+JOURNAL_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ArchiveMove:
+    """Move `src_rel` to `archive_rel` and leave `stub` (a legacy router) at `src_rel`."""
+
+    src_rel: str
+    archive_rel: str
+    stub: str
+
+
+class ArchivePlanError(ValueError):
+    def __init__(self, problems: list[str]) -> None:
+        super().__init__("Archive plan is invalid:\n" + "\n".join(f"- {p}" for p in problems))
+        self.problems = problems
+
+
+def validate_plan(*, repo_root: Path, moves: list[ArchiveMove]) -> None:
+    """Check the whole batch up front, reporting every problem at once; nothing is touched on failure."""
+    problems: list[str] = []
+    srcs: set[str] = set()
+    archives: set[str] = set()
+    for move in moves:
+        if move.src_rel in srcs:
+            problems.append(f"Source listed twice: {move.src_rel}")
+        if move.archive_rel in archives:
+            problems.append(f"Archive target listed twice: {move.archive_rel}")
+        srcs.add(move.src_rel)
+        archives.add(move.archive_rel)
+
+        src_abs = repo_root / move.src_rel
+        if not src_abs.is_file():
+            problems.append(f"Missing source doc: {move.src_rel}")
+        if (repo_root / move.archive_rel).exists():
+            problems.append(f"Archive target already exists: {move.archive_rel}")
+
+    # A move whose target is another move's source would clobber a stub (or be clobbered by one).
+    for clash in sorted(srcs & archives):
+        problems.append(f"Path is both a source and an archive target: {clash}")
+    if problems:
+        raise ArchivePlanError(problems)
+
+
+class UnfinishedJournalError(RuntimeError):
+    """A journal from an interrupted batch is still on disk; it must be rolled back before another batch runs."""
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(f"Unfinished archive journal at {path}; re-run with --rollback to undo the interrupted batch.")
+        self.path = path
+
+
+class Journal:
+    """Append-only JSON Lines log of intended steps, fsynced before each step runs so a crash can be undone."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = None
+
+    def open(self, *, repo_root: Path) -> None:
+        if self.path.exists():
+            raise UnfinishedJournalError(self.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("x", encoding="utf-8")
+        self.record({"op": "begin", "version": JOURNAL_VERSION, "repo_root": str(repo_root)})
+
+    def record(self, entry: dict[str, str | int]) -> None:
+        assert self._fh is not None
+        self._fh.write(json.dumps(entry, sort_keys=True) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+
+    def close(self, *, remove: bool) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if remove:
+            self.path.unlink(missing_ok=True)
+
+    def entries(self) -> list[dict[str, str | int]]:
+        out: list[dict[str, str | int]] = []
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            try:
+                out.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn final write from a crash: that step never started.
+                break
+        return out
+
+
+def _write_stub_atomic(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _missing_dirs(path: Path, stop: Path) -> list[Path]:
+    missing: list[Path] = []
+    while path != stop and not path.exists():
+        missing.append(path)
+        path = path.parent
+    return list(reversed(missing))
+
+
+def _undo(*, repo_root: Path, entries: Iterable[dict[str, str | int]]) -> int:
+    undone = 0
+    for entry in reversed(list(entries)):
+        op = entry["op"]
+        if op == "stub":
+            # Journaled after the move completed, so anything at the source path is the stub.
+            (repo_root / str(entry["path"])).unlink(missing_ok=True)
+        elif op == "move":
+            src_abs = repo_root / str(entry["src"])
+            dst_abs = repo_root / str(entry["dst"])
+            if dst_abs.exists() and not src_abs.exists():
+                os.rename(dst_abs, src_abs)
+        elif op == "mkdir":
+            try:
+                (repo_root / str(entry["path"])).rmdir()
+            except OSError:
+                pass
+        else:
+            continue
+        undone += 1
+    return undone
+
+
+def rollback(*, repo_root: Path, journal_path: Path | None = None) -> int:
+    """Undo an interrupted batch from its journal; returns the number of steps reverted (0 if no journal)."""
+    journal = Journal(journal_path or repo_root / DEFAULT_JOURNAL_REL)
+    if not journal.path.exists():
+        return 0
+    undone = _undo(repo_root=repo_root, entries=journal.entries())
+    journal.close(remove=True)
+    return undone
+
+
+def _git_tracked(repo_root: Path, rels: list[str]) -> set[str] | None:
+    if not rels:
+        return set()
+    try:
+        out = subprocess.run(
+            ["git", "-C", str(repo_root), "ls-files", "-z", "--", *rels],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {p.decode("utf-8") for p in out.split(b"\0") if p}
+
+
+def _git_stage(repo_root: Path, rels: list[str]) -> None:
+    # One `update-index` call hashes every archived doc and stub into the index atomically (via index.lock).
+    # Git records no renames, and the stub keeps each source path alive, so `git diff --cached -C` (or `-B -M`)
+    # shows an archived doc as a 100% copy of its source plus a rewrite of the source, never as a rename.
+    payload = b"".join(rel.encode("utf-8") + b"\0" for rel in rels)
+    subprocess.run(
+        ["git", "-C", str(repo_root), "update-index", "--add", "-z", "--stdin"],
+        input=payload,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def execute_plan(
+    *,
+    repo_root: Path,
+    moves: list[ArchiveMove],
+    journal_path: Path | None = None,
+    stage_git: bool = True,
+) -> None:
+    """Archive every move or none: validate, journal each step, move + write stubs, stage once, roll back on failure."""
+    validate_plan(repo_root=repo_root, moves=moves)
+    tracked = _git_tracked(repo_root, [m.src_rel for m in moves]) if stage_git else None
+
+    journal = Journal(journal_path or repo_root / DEFAULT_JOURNAL_REL)
+    journal.open(repo_root=repo_root)
+    entries: list[dict[str, str | int]] = []
+
+    def step(entry: dict[str, str | int]) -> None:
+        journal.record(entry)
+        entries.append(entry)
+
+    try:
+        for move in moves:
+            src_abs = repo_root / move.src_rel
+            archive_abs = repo_root / move.archive_rel
+            for directory in _missing_dirs(archive_abs.parent, repo_root):
+                step({"op": "mkdir", "path": str(directory.relative_to(repo_root))})
+                directory.mkdir()
+            if archive_abs.exists():
+                raise FileExistsError(f"Archive target already exists: {move.archive_rel}")
+            step({"op": "move", "src": move.src_rel, "dst": move.archive_rel})
+            os.rename(src_abs, archive_abs)
+            step({"op": "stub", "path": move.src_rel})
+            _write_stub_atomic(src_abs, move.stub)
+
+        if tracked:
+            staged = [m for m in moves if m.src_rel in tracked]
+            _git_stage(repo_root, [rel for m in staged for rel in (m.archive_rel, m.src_rel)])
+    except BaseException:
+        _undo(repo_root=repo_root, entries=entries)
+        journal.close(remove=True)
+        raise
+    journal.close(remove=True)
@@ -4,16 +4,32 @@ from __future__ import annotations
 
 import argparse
 import re
-import shutil
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import _docs_tools_path  # noqa: F401  (puts `docs_tools` on sys.path)
+from archive_batch import (
+    DEFAULT_JOURNAL_REL,
+    ArchiveMove,
+    ArchivePlanError,
+    UnfinishedJournalError,
+    execute_plan,
+    rollback,
+    validate_plan,
+)
+from docs_tools import code_spans, find_repo_root, looks_like_router_stub, router_stub
+
 
 @dataclass(frozen=True)
 class ManifestRow:
     src_rel: str
     status: str
     replaced_by: list[str]
+    why: str = ""
+    notes: str = ""
+    # The table line as written, so regenerated sections can carry a triaged row over byte for byte.
+    raw: str = field(default="", compare=False)
 
 
 _SECTION_START = "## Deprecation manifest (candidates)"
@@ -21,7 +37,7 @@ _SECTION_END = "## Scan output (untriaged)"
 
 
 def _extract_backticked_paths(cell: str) -> list[str]:
-    return [m.group(1).strip() for m in re.finditer(r"`([^`]+)`", cell)]
+    return [span.strip() for span in code_spans(cell)]
 
 
 def _extract_doc_path(cell: str) -> str:
@@ -31,13 +47,24 @@ def _extract_doc_path(cell: str) -> str:
     return cell.strip().split()[0]
 
 
-def _parse_manifest_rows(*, manifest_text: str) -> list[ManifestRow]:
-    start = manifest_text.find(_SECTION_START)
+def _section_bounds(manifest_text: str, section_start: str, section_end: str | None) -> tuple[int, int]:
+    start = manifest_text.find(section_start)
     if start == -1:
-        raise ValueError(f"Missing section header: {_SECTION_START}")
-    end = manifest_text.find(_SECTION_END, start)
+        raise ValueError(f"Missing section header: {section_start}")
+    if section_end is None:
+        # Up to the next H2 heading (or end of file).
+        end = manifest_text.find("\n## ", start + len(section_start))
+        return (start, len(manifest_text) if end == -1 else end + 1)
+    end = manifest_text.find(section_end, start)
     if end == -1:
-        raise ValueError(f"Missing section header: {_SECTION_END}")
+        raise ValueError(f"Missing section header: {section_end}")
+    return (start, end)
+
+
+def _parse_manifest_rows(
+    *, manifest_text: str, section_start: str = _SECTION_START, section_end: str | None = _SECTION_END
+) -> list[ManifestRow]:
+    start, end = _section_bounds(manifest_text, section_start, section_end)
 
     lines = manifest_text[start:end].splitlines()
     rows: list[ManifestRow] = []
@@ -65,8 +92,12 @@ def _parse_manifest_rows(*, manifest_text: str) -> list[ManifestRow]:
         src_rel = _extract_doc_path(parts[0])
         status = parts[1].strip()
         replaced_by = _extract_backticked_paths(parts[3]) if len(parts) >= 4 else []
+        why = parts[2] if len(parts) >= 3 else ""
+        notes = parts[4] if len(parts) >= 5 else ""
 
-        rows.append(ManifestRow(src_rel=src_rel, status=status, replaced_by=replaced_by))
+        rows.append(
+            ManifestRow(src_rel=src_rel, status=status, replaced_by=replaced_by, why=why, notes=notes, raw=stripped)
+        )
 
     return rows
 
@@ -88,35 +119,7 @@ def _title_from_doc_text(src_text: str, fallback: str) -> str:
     return fallback
 
 
-def _router_stub(*, title: str, replaced_by: list[str], archived_as: str) -> str:
-    replaced_by_items = "\n".join(
-        [
-            '  <item id="purpose" title="Purpose"/>',
-            '  <item id="replacements" title="Canonical replacements"/>',
-            '  <item id="archive" title="Legacy archive"/>',
-        ]
-    )
-    replaced_links = "\n".join([f"- `{p}`" for p in replaced_by]) if replaced_by else "- (none listed)"
-    return (
-        "<toc>\n"
-        f"{replaced_by_items}\n"
-        "</toc>\n\n"
-        f"# {title} (legacy router)\n\n"
-        "## Purpose\n\n"
-        "This page exists only to preserve older links.\n"
-        "It is **not** canonical documentation.\n\n"
-        "## Canonical replacements\n\n"
-        f"{replaced_links}\n\n"
-        "## Legacy archive\n\n"
-        f"The previous contents of this page were moved to `{archived_as}`.\n"
-    )
-
-
-def _looks_like_router_stub(text: str) -> bool:
-    return "This page exists only to preserve older links." in text and "(legacy router)" in text
-
-
-def _move_one(*, repo_root: Path, row: ManifestRow, apply: bool) -> tuple[str, str] | None:
+def _plan_one(*, repo_root: Path, row: ManifestRow) -> ArchiveMove | None:
     if row.status != "archive":
         return None
 
@@ -127,7 +130,7 @@ def _move_one(*, repo_root: Path, row: ManifestRow, apply: bool) -> tuple[str, s
     archive_abs = repo_root / archive_rel
 
     if archive_abs.exists():
-        if src_abs.exists() and _looks_like_router_stub(src_abs.read_text(encoding="utf-8")):
+        if src_abs.exists() and looks_like_router_stub(src_abs.read_text(encoding="utf-8")):
             return None
         raise FileExistsError(f"Archive target already exists: {archive_rel}")
 
@@ -136,20 +139,18 @@ def _move_one(*, repo_root: Path, row: ManifestRow, apply: bool) -> tuple[str, s
 
     src_text = src_abs.read_text(encoding="utf-8")
     title = _title_from_doc_text(src_text, fallback=Path(src_rel).stem)
-    stub = _router_stub(title=title, replaced_by=row.replaced_by, archived_as=archive_rel)
+    stub = router_stub(title=title, replaced_by=row.replaced_by, archived_as=archive_rel)
+    return ArchiveMove(src_rel=src_rel, archive_rel=archive_rel, stub=stub)
 
-    if not apply:
-        print(f"[dry-run] move {src_rel} -> {archive_rel} + stub")
-        return (src_rel, archive_rel)
 
-    archive_abs.parent.mkdir(parents=True, exist_ok=True)
-    shutil.move(str(src_abs), str(archive_abs))
-    src_abs.write_text(stub, encoding="utf-8")
-    print(f"moved {src_rel} -> {archive_rel} + stub")
-    return (src_rel, archive_rel)
+def _report_plan_problems(problems: list[str]) -> int:
+    print("Archive plan is invalid; nothing was moved:", file=sys.stderr)
+    for problem in problems:
+        print(f"- {problem}", file=sys.stderr)
+    return 2
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Execute DEPRECATION-MANIFEST.md 'archive' rows by moving docs under docs/_archive/** and leaving router stubs."
     )
@@ -163,26 +164,84 @@ def main() -> int:
         action="store_true",
         help="Perform moves. Without this flag, runs in dry-run mode.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="",
+        help="Repo root override (default: auto-detect from this script location).",
+    )
+    parser.add_argument(
+        "--no-git",
+        action="store_true",
+        help=(
+            "Do not stage the archived docs and router stubs in the git index. (Staged, an archived doc shows up in "
+            "`git diff --cached -C` as a copy of its source plus a rewrite of the source into the stub, not as a "
+            "rename: the stub keeps the source path alive.)"
+        ),
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=DEFAULT_JOURNAL_REL,
+        help=f"Batch journal path, repo-relative (default: {DEFAULT_JOURNAL_REL}).",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Undo an interrupted --apply run from its journal and exit.",
+    )
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.root).resolve() if args.root else find_repo_root(Path(__file__))
+    journal_path = repo_root / args.journal
+    if args.rollback:
+        undone = rollback(repo_root=repo_root, journal_path=journal_path)
+        print(f"Rolled back {undone} journaled step(s)." if undone else "No interrupted archive batch found.")
+        return 0
 
-    repo_root = Path(__file__).resolve().parents[5]
     manifest_abs = repo_root / args.manifest
     manifest_text = manifest_abs.read_text(encoding="utf-8")
     rows = _parse_manifest_rows(manifest_text=manifest_text)
 
-    moved: list[tuple[str, str]] = []
+    # Plan every row before touching the tree, so one bad row reports alongside the rest instead of mid-run.
+    moves: list[ArchiveMove] = []
+    problems: list[str] = []
     for row in rows:
-        result = _move_one(repo_root=repo_root, row=row, apply=args.apply)
-        if result:
-            moved.append(result)
+        try:
+            move = _plan_one(repo_root=repo_root, row=row)
+        except (OSError, ValueError) as e:
+            problems.append(str(e))
+            continue
+        if move:
+            moves.append(move)
+    if problems:
+        return _report_plan_problems(problems)
 
-    if not moved:
+    if not moves:
         print("No archive actions to perform.")
         return 0
 
+    try:
+        if args.apply:
+            execute_plan(repo_root=repo_root, moves=moves, journal_path=journal_path, stage_git=not args.no_git)
+        else:
+            # The dry run checks the batch as a whole too, so it fails wherever --apply would.
+            validate_plan(repo_root=repo_root, moves=moves)
+    except ArchivePlanError as e:
+        return _report_plan_problems(e.problems)
+    except UnfinishedJournalError as e:
+        print(f"ERROR: an earlier --apply run was interrupted; its journal is still at {e.path}.", file=sys.stderr)
+        print("Undo it with --rollback (same --journal), then re-run --apply.", file=sys.stderr)
+        return 2
+    for move in moves:
+        if args.apply:
+            print(f"moved {move.src_rel} -> {move.archive_rel} + stub")
+        else:
+            print(f"[dry-run] move {move.src_rel} -> {move.archive_rel} + stub")
+
     print("\nArchive actions:")
-    for src_rel, archive_rel in moved:
-        print(f"- {src_rel} -> {archive_rel}")
+    for move in moves:
+        print(f"- {move.src_rel} -> {move.archive_rel}")
     if not args.apply:
         print("\n(dry-run) Re-run with --apply to execute.")
     return 0
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import _docs_tools_path  # noqa: F401  (puts `docs_tools` on sys.path)
+from docs_tools import active_doc_cache, find_repo_root, looks_like_router_stub
+from execute_deprecation_archiving import _SECTION_END, ManifestRow, _parse_manifest_rows, _section_bounds
+
+DEFAULT_MANIFEST = "docs/projects/engine-refactor-v1/mapgen-docs-alignment/DEPRECATION-MANIFEST.md"
+STANDARD_RECIPE_REL = "docs/system/libs/mapgen/reference/STANDARD-RECIPE.md"
+DOMAINS_DIR_REL = "docs/system/libs/mapgen/reference/domains"
+UNTRIAGED = "untriaged"
+
+# Canonical spine and this spike's own working docs are never deprecation candidates.
+_EXCLUDE_PREFIXES = (
+    "docs/system/libs/mapgen/",
+    "docs/projects/engine-refactor-v1/mapgen-docs-alignment/",
+)
+_STAGE_ORDER_H2 = "## Stage order (current)"
+_STAGE_ID_RE = re.compile(r"^\s*\d+\.\s+`([a-z0-9-]+)`", re.MULTILINE)
+_TABLE_HEADER = "| path | status | why obsolete / risky | replaced by (canonical) | notes |"
+_TABLE_RULE = "|---|---|---|---|---|"
+
+# Signal weights: a doc is MapGen-related once the distinct signals it carries reach the threshold.
+# - An `@mapgen/` or `@swooper/mapgen-core` import is unambiguous, so it clears the threshold by itself.
+# - The word "mapgen" and exact stage ids are strong but also show up in passing (cross-project plans, Studio and
+#   harness docs), so each needs one more signal.
+# - Domain names ("ecology", "placement", "foundation", ...) are ordinary words. They only corroborate, and only
+#   count on a line that also carries one of the signals above; counted anywhere in the doc, "mapgen" + any domain
+#   word reached the threshold and flagged 618 of 1310 docs on this tree (371 with the same-line rule).
+_WEIGHT_IMPORT = 3
+_WEIGHT_MAPGEN = 2
+_WEIGHT_STAGE = 2
+_WEIGHT_DOMAIN = 1
+DEFAULT_THRESHOLD = 3
+
+
+@dataclass(frozen=True)
+class Classification:
+    rel: str
+    score: int
+    signals: tuple[str, ...]
+
+
+def _stage_ids(repo_root: Path) -> list[str]:
+    text = (repo_root / STANDARD_RECIPE_REL).read_text(encoding="utf-8")
+    start, end = _section_bounds(text, _STAGE_ORDER_H2, None)
+    return _STAGE_ID_RE.findall(text[start:end])
+
+
+def _domain_names(repo_root: Path) -> list[str]:
+    return sorted(
+        p.stem.lower() for p in (repo_root / DOMAINS_DIR_REL).glob("*.md") if p.stem.upper() != "DOMAINS"
+    )
+
+
+_SIGNALS: list[tuple[str, int, bool, str, re.Pattern[str]]] = []
+# Same shape as `_SIGNALS`; only counted on lines that also match a `_SIGNALS` entry.
+_DOMAIN_SIGNALS: list[tuple[str, int, bool, str, re.Pattern[str]]] = []
+
+
+def _init_signals(stage_ids: list[str], domains: list[str]) -> None:
+    # Compiled once per worker process. Each signal is (name, weight, case_folded, needle, pattern); the plain
+    # substring needle rejects most docs before any regex runs. Stage ids are identifiers, so they match exactly,
+    # and ids that are also domain names (e.g. `placement`) are left to the domain signal.
+    global _SIGNALS, _DOMAIN_SIGNALS
+    _SIGNALS = [
+        # Named without the trailing "/" so generated rows do not trip the validator's `@mapgen/*` alias warning.
+        ("import:@mapgen", _WEIGHT_IMPORT, False, "@mapgen/", re.compile(re.escape("@mapgen/"))),
+        (
+            "import:@swooper/mapgen-core",
+            _WEIGHT_IMPORT,
+            False,
+            "@swooper/mapgen-core",
+            re.compile(re.escape("@swooper/mapgen-core")),
+        ),
+        ("mapgen", _WEIGHT_MAPGEN, True, "gen", re.compile(r"\bmap-?gen\b")),
+    ]
+    _SIGNALS += [
+        (f"stage:{s}", _WEIGHT_STAGE, False, s, re.compile(rf"(?<![\w-]){re.escape(s)}(?![\w-])"))
+        for s in stage_ids
+        if s not in domains
+    ]
+    _DOMAIN_SIGNALS = [(f"domain:{d}", _WEIGHT_DOMAIN, True, d, re.compile(rf"\b{re.escape(d)}\b")) for d in domains]
+
+
+def _matches(signal: tuple[str, int, bool, str, re.Pattern[str]], text: str, lower: str) -> bool:
+    _name, _weight, folded, needle, pattern = signal
+    haystack = lower if folded else text
+    return needle in haystack and pattern.search(haystack) is not None
+
+
+def _classify(args: tuple[Path, str]) -> Classification | None:
+    path, rel = args
+    cache = active_doc_cache()
+    text = cache.get(path).text if cache is not None else path.read_text(encoding="utf-8", errors="replace")
+    if looks_like_router_stub(text):
+        return None
+    lower = text.lower()
+    hits = [(signal[0], signal[1]) for signal in _SIGNALS if _matches(signal, text, lower)]
+    domains = [signal for signal in _DOMAIN_SIGNALS if _matches(signal, text, lower)] if hits else []
+    if domains:
+        found: set[str] = set()
+        for line in text.splitlines():
+            line_lower = line.lower()
+            pending = [d for d in domains if d[0] not in found and d[3] in line_lower]
+            if pending and any(_matches(signal, line, line_lower) for signal in _SIGNALS):
+                found.update(d[0] for d in pending if d[4].search(line_lower))
+        hits += [(d[0], d[1]) for d in domains if d[0] in found]
+    return Classification(rel=rel, score=sum(w for _n, w in hits), signals=tuple(n for n, _w in hits))
+
+
+def _iter_docs(repo_root: Path) -> list[tuple[Path, str]]:
+    docs: list[tuple[Path, str]] = []
+    for dirpath, dirnames, filenames in os.walk(repo_root / "docs"):
+        dirnames[:] = sorted(d for d in dirnames if d != "_archive")
+        for name in sorted(filenames):
+            if not name.endswith(".md"):
+                continue
+            path = Path(dirpath) / name
+            rel = str(path.relative_to(repo_root))
+            if rel.startswith(_EXCLUDE_PREFIXES):
+                continue
+            docs.append((path, rel))
+    return docs
+
+
+def _cell(text: str) -> str:
+    # `_parse_manifest_rows()` splits on every `|` (no escapes), so pipes cannot appear inside a cell.
+    return text.replace("|", "/").replace("\n", " ").strip()
+
+
+def _row_line(row: ManifestRow) -> str:
+    if row.raw:
+        # Triaged rows keep whatever a human wrote, free text in "replaced by" included.
+        return row.raw
+    replaced = ", ".join(f"`{p}`" for p in row.replaced_by)
+    return f"| `{row.src_rel}` | {row.status} | {row.why} | {replaced} | {row.notes} |"
+
+
+def render_scan_section(
+    *,
+    classified: list[Classification],
+    curated: set[str],
+    existing: list[ManifestRow],
+    threshold: int,
+) -> str:
+    """Render the `## Scan output (untriaged)` section; rows someone has triaged are carried over unchanged.
+
+    The section depends only on the MapGen-related docs and the triage already recorded, so adding or removing
+    unrelated docs anywhere under `docs/` never makes it stale; run-wide counts go to the console instead.
+    """
+    rows: dict[str, ManifestRow] = {
+        row.src_rel: row for row in existing if row.status != UNTRIAGED and row.src_rel not in curated
+    }
+    for c in classified:
+        if c.score < threshold:
+            continue
+        if c.rel in rows or c.rel in curated:
+            continue
+        rows[c.rel] = ManifestRow(
+            src_rel=c.rel,
+            status=UNTRIAGED,
+            replaced_by=[],
+            why=_cell("signals: " + ", ".join(c.signals)),
+            notes=f"score {c.score}",
+        )
+
+    script_rel = "docs/projects/engine-refactor-v1/mapgen-docs-alignment/scripts/generate_deprecation_scan.py"
+    lines = [
+        _SECTION_END,
+        "",
+        f"Generated by `{script_rel}`: MapGen-related docs outside the canonical spine that are not in the",
+        "curated table above. To triage a row, change its `status` (and fill in the other cells); re-running",
+        "keeps triaged rows and only refreshes `untriaged` ones. Move decided rows into the curated table to act on them.",
+        f"Untriaged rows are docs whose signal score is >= {threshold}.",
+        "",
+        _TABLE_HEADER,
+        _TABLE_RULE,
+    ]
+    lines += [_row_line(rows[rel]) for rel in sorted(rows)]
+    return "\n".join(lines) + "\n\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Regenerate the DEPRECATION-MANIFEST.md 'Scan output (untriaged)' section by classifying every "
+            "non-archived docs/**/*.md file as MapGen-related or not."
+        )
+    )
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Path to the deprecation manifest (repo-relative).")
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Rewrite the section in place. Without this flag, prints the regenerated section.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if the section is out of date (no writes).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum signal score for a doc to count as MapGen-related (default: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="",
+        help="Repo root override (default: auto-detect from this script location).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=0,
+        help="Classify docs across N worker processes (default: 0, one per CPU; 1 = serial).",
+    )
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.root).resolve() if args.root else find_repo_root(Path(__file__))
+    manifest_abs = repo_root / args.manifest
+    manifest_text = manifest_abs.read_text(encoding="utf-8")
+
+    curated = {row.src_rel for row in _parse_manifest_rows(manifest_text=manifest_text)}
+    existing = _parse_manifest_rows(manifest_text=manifest_text, section_start=_SECTION_END, section_end=None)
+
+    docs = [(path, rel) for path, rel in _iter_docs(repo_root) if rel != args.manifest]
+    init_args = (_stage_ids(repo_root), _domain_names(repo_root))
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if jobs <= 1 or len(docs) <= 1:
+        _init_signals(*init_args)
+        results = list(map(_classify, docs))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_signals, initargs=init_args) as pool:
+            results = list(pool.map(_classify, docs, chunksize=max(1, len(docs) // (jobs * 4))))
+
+    section = render_scan_section(
+        classified=[c for c in results if c is not None],
+        curated=curated,
+        existing=existing,
+        threshold=args.threshold,
+    )
+    related = sum(1 for c in results if c is not None and c.score >= args.threshold)
+    summary = f"Scanned {len(docs)} docs; {related} MapGen-related (score >= {args.threshold})."
+    start, end = _section_bounds(manifest_text, _SECTION_END, None)
+    updated = manifest_text[:start] + section + manifest_text[end:]
+
+    if args.check:
+        if updated != manifest_text:
+            print(f"{args.manifest}: scan section is out of date; re-run with --apply.")
+            return 1
+        print(f"{args.manifest}: scan section is up to date. {summary}")
+        return 0
+    if not args.apply:
+        print(section, end="")
+        print(summary, file=sys.stderr)
+        return 0
+    print(summary)
+    if updated != manifest_text:
+        manifest_abs.write_text(updated, encoding="utf-8")
+        print(f"Updated {args.manifest}")
+    else:
+        print(f"{args.manifest} already up to date.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,32 +3,68 @@
 from __future__ import annotations
 
 import argparse
-import difflib
+import io
+import os
 import re
-from dataclasses import dataclass
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
+import _docs_tools_path  # noqa: F401  (puts `docs_tools` on sys.path)
+from docs_tools import FenceTracker, active_doc_cache, find_repo_root
 
+_LIBS_DOCS_PREFIX = "docs/system/libs/"
 _MAPGEN_DOCS_PREFIX = "docs/system/libs/mapgen/"
 _CODE_SPAN_PATH_RE = re.compile(rf"`({_MAPGEN_DOCS_PREFIX}[^`\n]+?\.md)`")
-_FENCE_RE = re.compile(r"^\s*```")
+_LIBS_CODE_SPAN_PATH_RE = re.compile(rf"`({_LIBS_DOCS_PREFIX}[^`\n]+?\.md)`")
 _H1_H2_RE = re.compile(r"^\s*#{1,2}\s+")
 _GT_ANCHORS_H2 = "## Ground truth anchors"
 _INLINE_GT_ANCHORS_RE = re.compile(r"\*\*Ground truth anchors\*\*", re.IGNORECASE)
 
+# Line contexts a rewrite rule can opt out of.
+CTX_FENCE = "fence"
+CTX_GT_ANCHORS = "gt-anchors-section"
+CTX_INLINE_GT_ANCHORS = "inline-gt-anchors"
+_EVIDENCE_CONTEXTS = frozenset({CTX_FENCE, CTX_GT_ANCHORS, CTX_INLINE_GT_ANCHORS})
+
 
 @dataclass(frozen=True)
 class FileResult:
     path: Path
     changed: bool
     replacements: int
+    diff: str | None = None
+    rule_counts: dict[str, int] = field(default_factory=dict)
+    changed_lines: int = 0
+
+
+@dataclass(frozen=True)
+class RewriteRule:
+    """A declarative rewrite: each `pattern` match on a line outside the `skip` contexts becomes `replace(m, line)`.
+
+    `replace` may return None to leave a match as-is; `needle` is an optional substring prefilter per line.
+    """
+
+    name: str
+    pattern: re.Pattern[str]
+    replace: Callable[[re.Match[str], str], str | None]
+    skip: frozenset[str] = _EVIDENCE_CONTEXTS
+    needle: str | None = None
+
+
+RULES: dict[str, RewriteRule] = {}
 
 
-def _find_repo_root(start: Path) -> Path:
-    for parent in [start, *start.parents]:
-        if (parent / ".git").exists():
-            return parent
-    raise RuntimeError(f"Could not find repo root from: {start}")
+def register_rule(rule: RewriteRule) -> RewriteRule:
+    if rule.name in RULES:
+        raise ValueError(f"Duplicate rewrite rule: {rule.name}")
+    RULES[rule.name] = rule
+    return rule
 
 
 def _to_docs_site_href(label_path: str) -> str:
@@ -43,80 +79,355 @@ def _is_already_link_wrapped(text: str, match_start: int, match_end: int) -> boo
         return False
     if text[match_start - 1] != "[":
         return False
-    return text[match_end :].startswith("](")
+    return text.startswith("](", match_end)
 
 
-def _normalize_text(*, text: str) -> tuple[str, int]:
-    lines = text.splitlines(keepends=True)
+def _code_span_link(m: re.Match[str], line: str) -> str | None:
+    if _is_already_link_wrapped(line, m.start(), m.end()):
+        return None
+    label_path = m.group(1)
+    return f"[`{label_path}`]({_to_docs_site_href(label_path)})"
 
-    in_fence = False
-    in_gt_anchors_section = False
-    in_inline_gt_anchors_block = False
 
-    total_replacements = 0
-    out: list[str] = []
+register_rule(
+    RewriteRule(
+        name="mapgen-code-span-links",
+        pattern=_CODE_SPAN_PATH_RE,
+        replace=_code_span_link,
+        needle=_MAPGEN_DOCS_PREFIX,
+    )
+)
+register_rule(
+    RewriteRule(
+        name="libs-code-span-links",
+        pattern=_LIBS_CODE_SPAN_PATH_RE,
+        replace=_code_span_link,
+        needle=_LIBS_DOCS_PREFIX,
+    )
+)
 
-    for line in lines:
-        if _FENCE_RE.match(line):
-            in_fence = not in_fence
-            out.append(line)
-            continue
+DEFAULT_RULES = ("mapgen-code-span-links",)
+ALL_LIBS_DEFAULT_RULES = ("libs-code-span-links",)
 
-        if not in_fence and line.rstrip("\n").strip() == _GT_ANCHORS_H2:
-            in_gt_anchors_section = True
-            in_inline_gt_anchors_block = False
-            out.append(line)
-            continue
+
+class _LineNormalizer:
+    """Line-at-a-time rewrite engine: tracks fence / anchors-section context and runs every active rule per line."""
+
+    def __init__(self, rules: Iterable[str] = DEFAULT_RULES) -> None:
+        self.rules = [RULES[name] for name in rules]
+        self.fences = FenceTracker(toggle=True)
+        self.in_gt_anchors_section = False
+        self.in_inline_gt_anchors_block = False
+
+    def _contexts(self, line: str) -> frozenset[str]:
+        if self.fences.feed(line) in ("open", "close"):
+            return frozenset({CTX_FENCE})
+
+        if not self.fences.inside and line.rstrip("\n").strip() == _GT_ANCHORS_H2:
+            self.in_gt_anchors_section = True
+            self.in_inline_gt_anchors_block = False
+            return frozenset({CTX_GT_ANCHORS})
 
         # Exit the `## Ground truth anchors` section on the next H1/H2 heading.
         if (
-            in_gt_anchors_section
+            self.in_gt_anchors_section
             and _H1_H2_RE.match(line)
             and line.rstrip("\n").strip() != _GT_ANCHORS_H2
         ):
-            in_gt_anchors_section = False
+            self.in_gt_anchors_section = False
 
         # Inline “Ground truth anchors” blocks (not H2 headings) are treated as evidence; skip until blank line.
-        if not in_fence and not in_gt_anchors_section and _INLINE_GT_ANCHORS_RE.search(line):
-            in_inline_gt_anchors_block = True
-            out.append(line)
+        if not self.fences.inside and not self.in_gt_anchors_section and _INLINE_GT_ANCHORS_RE.search(line):
+            self.in_inline_gt_anchors_block = True
+            return frozenset({CTX_INLINE_GT_ANCHORS})
+
+        if self.in_inline_gt_anchors_block and (line.strip() == "" or _H1_H2_RE.match(line)):
+            self.in_inline_gt_anchors_block = False
+
+        contexts = []
+        if self.fences.inside:
+            contexts.append(CTX_FENCE)
+        if self.in_gt_anchors_section:
+            contexts.append(CTX_GT_ANCHORS)
+        if self.in_inline_gt_anchors_block:
+            contexts.append(CTX_INLINE_GT_ANCHORS)
+        return frozenset(contexts)
+
+    def feed(self, line: str) -> tuple[str, tuple[str, ...]]:
+        """Return the rewritten line and the rule name of each replacement made on it."""
+        contexts = self._contexts(line)
+        return _rewrite_line(line, [r for r in self.rules if not (r.skip & contexts)])
+
+
+def _rewrite_line(line: str, rules: list[RewriteRule]) -> tuple[str, tuple[str, ...]]:
+    # Gather matches from every rule, then apply them left to right; on overlap the earlier (then
+    # earlier-listed) rule wins, so one pass handles any number of rules.
+    candidates: list[tuple[int, int, RewriteRule, re.Match[str]]] = []
+    for order, rule in enumerate(rules):
+        if rule.needle is not None and rule.needle not in line:
             continue
-
-        if in_inline_gt_anchors_block and (line.strip() == "" or _H1_H2_RE.match(line)):
-            in_inline_gt_anchors_block = False
-
-        if in_fence or in_gt_anchors_section or in_inline_gt_anchors_block:
-            out.append(line)
+        candidates.extend((m.start(), order, rule, m) for m in rule.pattern.finditer(line))
+    if not candidates:
+        return line, ()
+    candidates.sort(key=lambda c: (c[0], c[1]))
+
+    parts: list[str] = []
+    applied: list[str] = []
+    pos = 0
+    for start, _order, rule, m in candidates:
+        if start < pos:
             continue
+        new = rule.replace(m, line)
+        if new is None:
+            continue
+        parts.append(line[pos:start])
+        parts.append(new)
+        pos = m.end()
+        applied.append(rule.name)
+    if not applied:
+        return line, ()
+    parts.append(line[pos:])
+    return "".join(parts), tuple(applied)
+
 
-        def repl(m: re.Match[str]) -> str:
-            nonlocal total_replacements
-            if _is_already_link_wrapped(line, m.start(), m.end()):
-                return m.group(0)
-            label_path = m.group(1)
-            href = _to_docs_site_href(label_path)
-            total_replacements += 1
-            return f"[`{label_path}`]({href})"
+def _iter_lines(fh: Iterable[str]) -> Iterator[str]:
+    # File iteration splits on "\n" only; re-split so lines match `str.splitlines(keepends=True)` exactly.
+    for raw in fh:
+        yield from raw.splitlines(keepends=True)
 
-        out.append(_CODE_SPAN_PATH_RE.sub(repl, line))
 
+def _normalize_text(*, text: str, rules: Iterable[str] = DEFAULT_RULES) -> tuple[str, int]:
+    normalizer = _LineNormalizer(rules)
+    total_replacements = 0
+    out: list[str] = []
+    for line in text.splitlines(keepends=True):
+        new_line, applied = normalizer.feed(line)
+        total_replacements += len(applied)
+        out.append(new_line)
     return ("".join(out), total_replacements)
 
 
+_NO_EOL_MARKER = "\\ No newline at end of file"
+
+
+def _strip_eol(line: str) -> str:
+    return (line.splitlines() or [""])[0]
+
+
+class _StreamingDiff:
+    """Builds `difflib.unified_diff`-style hunks for a 1:1 line rewrite, holding only the changed regions.
+
+    The normalizer never inserts or deletes lines, so line i of the output always pairs with line i of the
+    input and hunks can be cut directly from the changed positions instead of running a sequence matcher.
+
+    With `git=True` the output is a `git apply`-able file patch: a `diff --git` header, `\r` kept as line
+    content, and `\ No newline at end of file` markers; lines must then be split on `\n` only.
+    """
+
+    def __init__(self, *, rel_path: str, context: int = 3, git: bool = False) -> None:
+        self.rel_path = rel_path
+        self.context = context
+        self.git = git
+        self.missing_eol = False
+        self.changed_lines = 0
+        self.lineno = 0
+        self.recent: deque[str] = deque(maxlen=context)
+        self.hunk: list[tuple[str, str]] | None = None  # (before, after); equal lines have before == after
+        self.hunk_start = 0
+        self.hunk_rules: set[str] = set()
+        self.trailing_equal = 0
+        self.out: list[str] = []
+
+    def add(self, before: str, after: str, rules: Iterable[str] = ()) -> None:
+        """Record one line pair; `rules` (rule names that changed it) are listed after the hunk's `@@` header."""
+        self.hunk_rules.update(rules)
+        if self.git:
+            # Only the last line can lack a "\n"; a 1:1 rewrite never changes a line's terminator.
+            self.missing_eol = not before.endswith("\n")
+            before, after = before.removesuffix("\n"), after.removesuffix("\n")
+        else:
+            before, after = _strip_eol(before), _strip_eol(after)
+        if before == after:
+            if self.hunk is not None:
+                self.hunk.append((before, after))
+                self.trailing_equal += 1
+                if self.trailing_equal > 2 * self.context:
+                    self._close()
+            self.recent.append(before)
+        else:
+            if self.hunk is None:
+                self.hunk_start = self.lineno - len(self.recent)
+                self.hunk = [(line, line) for line in self.recent]
+            self.hunk.append((before, after))
+            self.trailing_equal = 0
+            self.changed_lines += 1
+        self.lineno += 1
+
+    def _close(self, *, at_eof: bool = False) -> None:
+        assert self.hunk is not None
+        drop = max(0, self.trailing_equal - self.context)
+        lines = self.hunk[: len(self.hunk) - drop]
+        if not self.out:
+            if self.git:
+                self.out.append(f"diff --git a/{self.rel_path} b/{self.rel_path}")
+            self.out += [f"--- a/{self.rel_path}", f"+++ b/{self.rel_path}"]
+        # The marker applies to the hunk's last line only if that line ends the file without a newline.
+        no_eol_last = at_eof and drop == 0 and self.git and self.missing_eol
+        span = _format_range_unified(self.hunk_start, self.hunk_start + len(lines))
+        attribution = f" {', '.join(sorted(self.hunk_rules))}" if self.hunk_rules else ""
+        self.out.append(f"@@ -{span} +{span} @@{attribution}")
+        pending_plus: list[str] = []
+        last = len(lines) - 1
+        for i, (before, after) in enumerate(lines):
+            marker = [_NO_EOL_MARKER] if no_eol_last and i == last else []
+            if before == after:
+                self.out.extend(pending_plus)
+                pending_plus = []
+                self.out.append(" " + before)
+                self.out.extend(marker)
+            else:
+                self.out.append("-" + before)
+                self.out.extend(marker)
+                pending_plus.append("+" + after)
+                pending_plus.extend(marker)
+        self.out.extend(pending_plus)
+        self.hunk = None
+        self.hunk_rules = set()
+        self.trailing_equal = 0
+
+    def finish(self) -> str:
+        if self.hunk is not None:
+            self._close(at_eof=True)
+        return "\n".join(self.out)
+
+
+def _format_range_unified(start: int, stop: int) -> str:
+    # Same range notation as `difflib.unified_diff`.
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
 def _diff(*, before: str, after: str, rel_path: str) -> str:
-    before_lines = before.splitlines()
-    after_lines = after.splitlines()
-    diff_lines = difflib.unified_diff(
-        before_lines,
-        after_lines,
-        fromfile=f"a/{rel_path}",
-        tofile=f"b/{rel_path}",
-        lineterm="",
+    diff = _StreamingDiff(rel_path=rel_path)
+    for b, a in zip(before.splitlines(keepends=True), after.splitlines(keepends=True)):
+        diff.add(b, a)
+    return diff.finish()
+
+
+class _AtomicRewrite:
+    """Sibling temp file that replaces `path` on `commit()` and is deleted otherwise.
+
+    An interrupted run never leaves a truncated doc, and a file that turns out unchanged is never replaced.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        fd, self.tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        # `newline=""`: lines are written exactly as given, so CRLF docs stay CRLF.
+        self.fh = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        self.committed = False
+
+    def __enter__(self) -> _AtomicRewrite:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.fh.close()
+        if not self.committed:
+            try:
+                os.unlink(self.tmp_name)
+            except FileNotFoundError:
+                pass
+
+    def write(self, text: str) -> None:
+        self.fh.write(text)
+
+    def commit(self) -> None:
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+        self.fh.close()
+        os.chmod(self.tmp_name, self.path.stat().st_mode & 0o7777)
+        os.replace(self.tmp_name, self.path)
+        self.committed = True
+
+
+def _iter_git_lines(fh: Iterable[bytes]) -> Iterator[str]:
+    # Patch output must number lines exactly as git does: split on "\n" only and keep any "\r".
+    for raw in fh:
+        yield raw.decode("utf-8")
+
+
+def _process_file(
+    path: Path,
+    *,
+    repo_root: Path,
+    apply: bool,
+    show_diff: bool,
+    rules: tuple[str, ...] = DEFAULT_RULES,
+    git_patch: bool = False,
+) -> FileResult:
+    # One streaming pass keeps only diff hunks. Under `--apply` each line also goes straight into a sibling temp file,
+    # which replaces the doc only if something changed, so every file is read once and written at most once.
+    normalizer = _LineNormalizer(rules)
+    rel_path = str(path.relative_to(repo_root))
+    diff = _StreamingDiff(rel_path=rel_path, git=git_patch) if show_diff or git_patch else None
+    changed = False
+    rule_counts: Counter[str] = Counter()
+    cache = active_doc_cache() if not (apply or git_patch) else None
+    with (
+        # `docs-tools check`: reuse the bytes the other tools in this interpreter already read.
+        io.TextIOWrapper(io.BytesIO(cache.get(path).data), encoding="utf-8")
+        if cache is not None
+        else path.open("rb")
+        if git_patch
+        # `--apply` reads with `newline=""` so line endings pass through untranslated: the bytes written match what
+        # `--patch-out` would produce.
+        else path.open(encoding="utf-8", newline="")
+        if apply
+        else path.open(encoding="utf-8")
+    ) as fh, (_AtomicRewrite(path) if apply else nullcontext()) as out:
+        lines = _iter_git_lines(fh) if git_patch else _iter_lines(fh)
+        for before in lines:
+            after, applied = normalizer.feed(before)
+            if applied:
+                rule_counts.update(applied)
+            if after != before:
+                changed = True
+            if diff is not None:
+                diff.add(before, after, applied)
+            if out is not None:
+                out.write(after)
+        if out is not None and changed:
+            out.commit()
+
+    replacements = sum(rule_counts.values())
+    if not changed:
+        # Unchanged files are never replaced; the temp file was discarded on exit.
+        return FileResult(path=path, changed=False, replacements=replacements)
+    return FileResult(
+        path=path,
+        changed=True,
+        replacements=replacements,
+        diff=diff.finish() if diff is not None else None,
+        rule_counts=dict(rule_counts),
+        changed_lines=diff.changed_lines if diff is not None else 0,
+    )
+
+
+def _patch_stat(result: FileResult, *, repo_root: Path) -> str:
+    # `git apply` skips text outside file patches, so per-file stats ride along as comment lines.
+    rules = ", ".join(f"{name}: {count}" for name, count in sorted(result.rule_counts.items()))
+    return (
+        f"# {result.path.relative_to(repo_root)} | {result.changed_lines} lines, "
+        f"{result.replacements} replacements ({rules})\n"
     )
-    return "\n".join(diff_lines)
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Normalize MapGen canonical docs intra-links while keeping literal repo paths as visible text.",
     )
@@ -136,53 +447,167 @@ def main() -> int:
         default="",
         help="Repo root override (default: auto-detect from this script location).",
     )
-    args = parser.parse_args()
-
-    script_path = Path(__file__).resolve()
-    repo_root = Path(args.root).resolve() if args.root else _find_repo_root(script_path)
-
-    docs_root = repo_root / "docs" / "system" / "libs" / "mapgen"
-    if not docs_root.exists():
-        raise RuntimeError(f"Expected MapGen docs root at: {docs_root}")
-
-    show_diff = args.diff if args.diff else (not args.apply)
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=0,
+        help="Normalize files across N worker processes (default: 0, one per CPU; 1 = serial).",
+    )
+    parser.add_argument(
+        "--rules",
+        type=str,
+        default="",
+        help=(
+            f"Comma-separated rewrite rules to run in the single pass (default: {','.join(DEFAULT_RULES)}; "
+            f"with --all-libs: {','.join(ALL_LIBS_DEFAULT_RULES)}). See --list-rules."
+        ),
+    )
+    parser.add_argument(
+        "--list-rules",
+        action="store_true",
+        help="List registered rewrite rules and exit.",
+    )
+    parser.add_argument(
+        "--lib",
+        action="append",
+        default=[],
+        help="Docs root under docs/system/libs/ to normalize (repeatable; default: mapgen).",
+    )
+    parser.add_argument(
+        "--all-libs",
+        action="store_true",
+        help="Normalize every docs/system/libs/* root in the same pass.",
+    )
+    parser.add_argument(
+        "--patch-out",
+        type=str,
+        default="",
+        help="Dry run that streams all changes into one `git apply`-compatible patch FILE instead of stdout.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Dry run that exits 1 if any file would change.",
+    )
+    args = parser.parse_args(argv)
+    if args.patch_out and args.apply:
+        parser.error("--patch-out is a dry run; apply the patch with `git apply` instead of --apply")
+    if args.check and args.apply:
+        parser.error("--check is a dry run and cannot be combined with --apply")
+
+    if args.list_rules:
+        for rule in RULES.values():
+            print(f"{rule.name}: /{rule.pattern.pattern}/ (skips: {', '.join(sorted(rule.skip)) or 'none'})")
+        return 0
+
+    if args.rules:
+        rules = tuple(name.strip() for name in args.rules.split(",") if name.strip())
+    else:
+        rules = ALL_LIBS_DEFAULT_RULES if args.all_libs else DEFAULT_RULES
+    unknown = [name for name in rules if name not in RULES]
+    if unknown:
+        parser.error(f"unknown rewrite rule(s): {', '.join(unknown)}")
+
+    repo_root = Path(args.root).resolve() if args.root else find_repo_root(Path(__file__))
+
+    libs_root = repo_root / "docs" / "system" / "libs"
+    if args.all_libs:
+        docs_roots = sorted(p for p in libs_root.iterdir() if p.is_dir())
+    else:
+        docs_roots = [libs_root / lib for lib in (args.lib or ["mapgen"])]
+    for docs_root in docs_roots:
+        if not docs_root.exists():
+            raise RuntimeError(f"Expected docs root at: {docs_root}")
+
+    patch_out = Path(args.patch_out).resolve() if args.patch_out else None
+    show_diff = patch_out is None and (args.diff if args.diff else (not args.apply))
+
+    paths: list[Path] = []
+    for docs_root in docs_roots:
+        for path in sorted(docs_root.rglob("*.md")):
+            # Do not churn archived / historical pages.
+            rel_from_docs_root = path.relative_to(docs_root)
+            if rel_from_docs_root.parts and rel_from_docs_root.parts[0] == "_archive":
+                continue
+            paths.append(path)
+
+    process = partial(
+        _process_file,
+        repo_root=repo_root,
+        apply=args.apply,
+        show_diff=show_diff,
+        rules=rules,
+        git_patch=patch_out is not None,
+    )
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
 
     results: list[FileResult] = []
     changed_files = 0
     total_replacements = 0
-
-    for path in sorted(docs_root.rglob("*.md")):
-        # Do not churn archived / historical pages.
-        rel_from_docs_root = path.relative_to(docs_root)
-        if rel_from_docs_root.parts and rel_from_docs_root.parts[0] == "_archive":
-            continue
-
-        before = path.read_text(encoding="utf-8")
-        after, replacements = _normalize_text(text=before)
-        changed = after != before
-
-        results.append(FileResult(path=path, changed=changed, replacements=replacements))
-
-        if not changed:
-            continue
-
-        changed_files += 1
-        total_replacements += replacements
-
-        rel_path = str(path.relative_to(repo_root))
-        if show_diff:
-            print(_diff(before=before, after=after, rel_path=rel_path))
-
-        if args.apply:
-            path.write_text(after, encoding="utf-8")
+    rule_totals: Counter[str] = Counter({name: 0 for name in rules})
+
+    if jobs <= 1 or len(paths) <= 1:
+        file_results = map(process, paths)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        file_results = pool.map(process, paths, chunksize=max(1, len(paths) // (jobs * 4)))
+
+    # The patch is streamed to a sibling temp file as results arrive and only renamed into place once complete.
+    patch_fh = None
+    if patch_out is not None:
+        patch_out.parent.mkdir(parents=True, exist_ok=True)
+        fd, patch_tmp = tempfile.mkstemp(dir=patch_out.parent, prefix=f".{patch_out.name}.", suffix=".tmp")
+        patch_fh = os.fdopen(fd, "w", encoding="utf-8", newline="")
+        patch_fh.write(f"# normalize_mapgen_doc_links.py patch (rules: {', '.join(rules)})\n")
+        patch_fh.write("# Apply from the repo root with: git apply <this file>\n")
+
+    # `map` yields in submission order, so diffs and counts come out exactly as in a serial run.
+    changed_lines = 0
+    try:
+        for result in file_results:
+            results.append(result)
+            if not result.changed:
+                continue
+            changed_files += 1
+            total_replacements += result.replacements
+            changed_lines += result.changed_lines
+            rule_totals.update(result.rule_counts)
+            if patch_fh is not None and result.diff is not None:
+                patch_fh.write(_patch_stat(result, repo_root=repo_root))
+                patch_fh.write(result.diff + "\n")
+            elif result.diff is not None:
+                print(result.diff)
+        if patch_fh is not None:
+            patch_fh.write(
+                f"# {changed_files} files changed, {changed_lines} lines rewritten, "
+                f"{total_replacements} replacements\n"
+            )
+            patch_fh.flush()
+            os.fsync(patch_fh.fileno())
+            patch_fh.close()
+            os.replace(patch_tmp, patch_out)
+    except BaseException:
+        if patch_fh is not None:
+            patch_fh.close()
+            os.unlink(patch_tmp)
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
 
     print("\nSummary:")
     print(f"- Files scanned: {len(results)}")
     print(f"- Files changed: {changed_files}")
     print(f"- Replacements:  {total_replacements}")
+    for name, count in rule_totals.items():
+        print(f"  - {name}: {count}")
     print(f"- Mode:          {'apply' if args.apply else 'dry-run'}")
+    if patch_out is not None:
+        print(f"- Patch:         {patch_out}")
 
-    return 0
+    return 1 if args.check and changed_files else 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote
+
+import _docs_tools_path  # noqa: F401  (puts `docs_tools` on sys.path)
+from docs_tools import find_repo_root, list_repo_files
+from execute_deprecation_archiving import ManifestRow, _parse_manifest_rows
+
+DEFAULT_MANIFEST = "docs/projects/engine-refactor-v1/mapgen-docs-alignment/DEPRECATION-MANIFEST.md"
+MAX_FILE_BYTES = 16 << 20
+_PATH_CHARS = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-")
+# The href of a markdown inline link (group 1), as the validator's `MD_LINK_RE` reads it. Matching from `](`
+# rather than the opening `[` lets the scan skip ahead to each `]`.
+_MD_LINK_HREF_RE = re.compile(rb"\]\(\s*(<[^>]*>|[^)\s]+)")
+_URL_SCHEME_RE = re.compile(rb"[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+@dataclass(frozen=True)
+class Reference:
+    file: str
+    line: int
+    # "path" (`docs/...`), "href" (`/...` docs-site link) or "relative" (a markdown link resolved against the
+    # referring file, or a bare mention of the docs-relative path)
+    kind: str
+
+
+def _docs_tail(src_rel: str) -> str:
+    # `docs/projects/x.md` is referenced as `docs/projects/x.md` (repo path) or `/projects/x.md` (docs-site
+    # href); both end in the docs-relative tail, so the matcher only needs one pattern per candidate.
+    return src_rel[len("docs/") :] if src_rel.startswith("docs/") else src_rel
+
+
+def _trie_pattern(words: list[bytes]) -> bytes:
+    """Compile `words` into one regex alternation shaped as a trie (shared prefixes matched once, longest first)."""
+    end = -1
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        node[end] = {}
+
+    def build(node: dict) -> bytes:
+        alts = [re.escape(bytes([b])) + build(node[b]) for b in sorted(k for k in node if k != end)]
+        if not alts:
+            return b""
+        body = alts[0] if len(alts) == 1 else b"(?:" + b"|".join(alts) + b")"
+        return b"(?:" + body + b")?" if end in node else body
+
+    return build(trie)
+
+
+_MATCHER: re.Pattern[bytes] | None = None
+# Candidate `src_rel` -> its docs-relative tail, for markdown links resolved against the referring file.
+_CANDIDATES: dict[str, bytes] = {}
+
+
+def _init_matcher(pattern: bytes, candidates: dict[str, bytes]) -> None:
+    # Compiled once per worker process instead of being pickled with every task.
+    global _MATCHER, _CANDIDATES
+    _MATCHER = re.compile(rb"(?<![\w-])(" + pattern + rb")(?![\w-])")
+    _CANDIDATES = candidates
+
+
+def _is_relative_href(href: bytes) -> bool:
+    # Docs-site hrefs (`/...`) and `docs/...` paths carry the whole tail and are left to the trie matcher.
+    return not (href.startswith((b"/", b"#", b"docs/")) or _URL_SCHEME_RE.match(href))
+
+
+def _relative_link_tail(source_rel: str, href: bytes) -> bytes | None:
+    """Resolve a relative markdown link against its file; the candidate's tail if it lands on one, else None."""
+    path = unquote(href.split(b"#", 1)[0].split(b"?", 1)[0].decode("utf-8", errors="replace"))
+    if not path:
+        return None
+    rel = os.path.normpath(os.path.join(os.path.dirname(source_rel), path))
+    # Extensionless links resolve to the doc, as in the validator's link check.
+    return _CANDIDATES.get(rel) or (None if os.path.splitext(rel)[1] else _CANDIDATES.get(rel + ".md"))
+
+
+def _classify(data: bytes, start: int) -> str | None:
+    if data.endswith(b"docs/", 0, start):
+        return "path"
+    if start == 0 or data[start - 1] != ord("/"):
+        return "relative"
+    before = data[start - 2] if start >= 2 else None
+    if before is None or before not in _PATH_CHARS:
+        return "href"
+    if before == ord("."):
+        return "relative"
+    # `<other-dir>/<tail>`: a different file that happens to share the tail.
+    return None
+
+
+def _scan_file(args: tuple[Path, str]) -> list[tuple[bytes, str, int, str]]:
+    path, rel = args
+    assert _MATCHER is not None
+    try:
+        if path.stat().st_size > MAX_FILE_BYTES:
+            return []
+        data = path.read_bytes()
+    except OSError:
+        return []
+    if b"\0" in data[:8192]:
+        return []
+
+    # (offset, tail, kind)
+    found: list[tuple[int, bytes, str]] = []
+    link_spans: list[tuple[int, int]] = []
+    if rel.endswith((".md", ".mdx")):
+        for m in _MD_LINK_HREF_RE.finditer(data):
+            href = m.group(1).strip(b"<>")
+            if not _is_relative_href(href):
+                continue
+            # A relative href is only a reference once resolved, so the trie must not count a tail inside it.
+            link_spans.append(m.span(1))
+            tail = _relative_link_tail(rel, href)
+            if tail is not None:
+                found.append((m.start(1), tail, "relative"))
+
+    spans = iter(link_spans)
+    span = next(spans, None)
+    for m in _MATCHER.finditer(data):
+        while span is not None and span[1] <= m.start():
+            span = next(spans, None)
+        if span is not None and span[0] <= m.start():
+            continue
+        kind = _classify(data, m.start())
+        if kind is not None:
+            found.append((m.start(), m.group(1), kind))
+    found.sort(key=lambda hit: hit[0])
+
+    hits: list[tuple[bytes, str, int, str]] = []
+    line, pos = 1, 0
+    for start, tail, kind in found:
+        line += data.count(b"\n", pos, start)
+        pos = start
+        hits.append((tail, rel, line, kind))
+    return hits
+
+
+def build_reverse_index(
+    *, repo_root: Path, rows: list[ManifestRow], exclude: set[str], jobs: int = 0
+) -> dict[str, list[Reference]]:
+    """Map each candidate `src_rel` to every file/line that references it, in one pass over the repo."""
+    by_tail: dict[bytes, list[str]] = {}
+    for row in rows:
+        by_tail.setdefault(_docs_tail(row.src_rel).encode("utf-8"), []).append(row.src_rel)
+    index: dict[str, list[Reference]] = {row.src_rel: [] for row in rows}
+    if not by_tail:
+        return index
+
+    pattern = _trie_pattern(sorted(by_tail))
+    candidates = {src_rel: tail for tail, src_rels in by_tail.items() for src_rel in src_rels}
+    tasks = [(repo_root / rel, rel) for rel in list_repo_files(repo_root) if rel not in exclude]
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if jobs <= 1:
+        _init_matcher(pattern, candidates)
+        results = map(_scan_file, tasks)
+        for hits in results:
+            _collect(index, by_tail, hits)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_matcher, initargs=(pattern, candidates)) as pool:
+            for hits in pool.map(_scan_file, tasks, chunksize=max(1, len(tasks) // (jobs * 8))):
+                _collect(index, by_tail, hits)
+    return index
+
+
+def _collect(
+    index: dict[str, list[Reference]], by_tail: dict[bytes, list[str]], hits: list[tuple[bytes, str, int, str]]
+) -> None:
+    for tail, rel, line, kind in hits:
+        for src_rel in by_tail[tail]:
+            if rel != src_rel:
+                index[src_rel].append(Reference(file=rel, line=line, kind=kind))
+
+
+def _render_markdown(rows: list[ManifestRow], index: dict[str, list[Reference]]) -> str:
+    out: list[str] = []
+    for row in rows:
+        refs = index[row.src_rel]
+        files = {r.file for r in refs}
+        out.append(f"## `{row.src_rel}` ({row.status}): {len(refs)} references in {len(files)} files")
+        out.append("")
+        if not refs:
+            out.append("- (no references)")
+        for ref in refs:
+            out.append(f"- `{ref.file}:{ref.line}` ({ref.kind})")
+        out.append("")
+    return "\n".join(out)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Reverse-reference impact scan for DEPRECATION-MANIFEST.md rows: one pass over the repo finds every "
+            "file/line that points at any candidate (repo path, docs-site href, or a markdown link relative to the "
+            "referring file)."
+        )
+    )
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="Path to the deprecation manifest (repo-relative).")
+    parser.add_argument(
+        "--status",
+        action="append",
+        default=[],
+        help="Only scan rows with this status (repeatable; default: every row).",
+    )
+    parser.add_argument(
+        "--root",
+        type=str,
+        default="",
+        help="Repo root override (default: auto-detect from this script location).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=0,
+        help="Scan files across N worker processes (default: 0, one per CPU; 1 = serial).",
+    )
+    parser.add_argument("--json", action="store_true", help="Emit the reverse index as JSON.")
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.root).resolve() if args.root else find_repo_root(Path(__file__))
+    manifest_text = (repo_root / args.manifest).read_text(encoding="utf-8")
+    rows = _parse_manifest_rows(manifest_text=manifest_text)
+    if args.status:
+        rows = [row for row in rows if row.status in args.status]
+
+    # The manifest lists every candidate by definition; its own rows are not impact.
+    index = build_reverse_index(repo_root=repo_root, rows=rows, exclude={args.manifest}, jobs=args.jobs)
+
+    if args.json:
+        payload = {
+            row.src_rel: {
+                "status": row.status,
+                "references": [{"file": r.file, "line": r.line, "kind": r.kind} for r in index[row.src_rel]],
+            }
+            for row in rows
+        }
+        print(json.dumps(payload, indent=2))
+    else:
+        print(_render_markdown(rows, index))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
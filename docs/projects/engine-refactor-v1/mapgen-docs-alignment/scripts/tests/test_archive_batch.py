@@ -0,0 +1,114 @@
+"""An archive batch either completes or leaves the tree exactly as it found it.
+
+Run: python -m unittest discover -s docs/projects/engine-refactor-v1/mapgen-docs-alignment/scripts/tests
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import archive_batch  # noqa: E402
+
+DOCS = {
+    "docs/system/libs/mapgen/a.md": "# A\n",
+    "docs/system/libs/mapgen/b.md": "# B\n",
+    "docs/system/libs/mapgen/c.md": "# C\n",
+}
+MOVES = [
+    archive_batch.ArchiveMove(
+        src_rel=rel,
+        archive_rel=rel.replace("mapgen/", "mapgen/_archive/legacy/"),
+        stub=f"# {rel} (legacy router)\n",
+    )
+    for rel in DOCS
+]
+
+
+def snapshot(root: Path) -> dict[str, bytes | None]:
+    """Every file (with its bytes) and directory (as None) under `root`."""
+    out: dict[str, bytes | None] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames:
+            out[os.path.relpath(os.path.join(dirpath, name), root)] = None
+        for name in filenames:
+            path = Path(dirpath, name)
+            out[str(path.relative_to(root))] = path.read_bytes()
+    return out
+
+
+class ArchiveBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for rel, text in DOCS.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        self.journal = self.root / archive_batch.DEFAULT_JOURNAL_REL
+        self.journal.parent.mkdir(parents=True)
+        self.before = snapshot(self.root)
+
+    def test_failure_mid_batch_restores_tree(self) -> None:
+        # The second stub write fails after its doc has already been moved into the archive.
+        real_write = archive_batch._write_stub_atomic
+        calls = 0
+
+        def flaky_write(path: Path, text: str) -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise OSError("disk full")
+            real_write(path, text)
+
+        with mock.patch.object(archive_batch, "_write_stub_atomic", flaky_write):
+            with self.assertRaises(OSError):
+                archive_batch.execute_plan(repo_root=self.root, moves=MOVES, stage_git=False)
+        self.assertEqual(calls, 2)
+        self.assertEqual(snapshot(self.root), self.before)
+
+    def test_rollback_after_crash_restores_tree(self) -> None:
+        # A hard exit mid-batch skips the in-process undo and leaves the journal behind.
+        crash = textwrap.dedent(
+            f"""
+            import os, sys
+            from pathlib import Path
+            sys.path.insert(0, {str(SCRIPTS_DIR)!r})
+            import archive_batch
+            from test_archive_batch import MOVES
+            real_write = archive_batch._write_stub_atomic
+            calls = []
+            def crashing_write(path, text):
+                calls.append(path)
+                if len(calls) == 2:
+                    os._exit(3)
+                real_write(path, text)
+            archive_batch._write_stub_atomic = crashing_write
+            archive_batch.execute_plan(repo_root=Path({str(self.root)!r}), moves=MOVES, stage_git=False)
+            """
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parent)}
+        proc = subprocess.run([sys.executable, "-c", crash], env=env, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 3, proc.stderr)
+        self.assertTrue(self.journal.exists())
+
+        # A new batch refuses to start on top of the interrupted one.
+        with self.assertRaises(archive_batch.UnfinishedJournalError):
+            archive_batch.Journal(self.journal).open(repo_root=self.root)
+
+        self.assertGreater(archive_batch.rollback(repo_root=self.root), 0)
+        self.assertEqual(snapshot(self.root), self.before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+from docs_tools import find_repo_root
+from docs_tools.cli import load_script
+
+
+DEFAULT_SIZES = (1_000, 10_000)
+DEFAULT_SEED = 7
+DEFAULT_CORPUS_DIR = ".cache/mapgen-docs/bench-corpus"
+
+MAPGEN_DOCS = "docs/system/libs/mapgen"
+MANIFEST_REL = "docs/projects/engine-refactor-v1/mapgen-docs-alignment/DEPRECATION-MANIFEST.md"
+
+# Repo-relative locations of the tools under benchmark.
+TOOL_PATHS = {
+    "validate": "docs/system/libs/mapgen/tools/validate-anchors-and-references.py",
+    "normalize": "docs/projects/engine-refactor-v1/mapgen-docs-alignment/scripts/normalize_mapgen_doc_links.py",
+    "archive": "docs/projects/engine-refactor-v1/mapgen-docs-alignment/scripts/execute_deprecation_archiving.py",
+}
+
+_SECTIONS = ("foundation", "morphology", "hydrology", "ecology", "narrative", "placement")
+_WORDS = (
+    "plate", "mesh", "tile", "elevation", "rainfall", "biome", "river", "coast", "shelf", "crust",
+    "stage", "step", "op", "artifact", "recipe", "config", "knob", "preset", "seed", "field",
+)
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    tool: str
+    case: str
+    size: int
+    files: int
+    bytes: int
+    seconds: float
+    files_per_s: float
+    mb_per_s: float
+    peak_rss_kb: int
+    baseline_rss_kb: int
+
+
+def load_tool(repo_root: Path, name: str) -> ModuleType:
+    return load_script(repo_root / TOOL_PATHS[name])
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 16))]
+    return " ".join(words).capitalize() + "."
+
+
+def _doc_rel(idx: int) -> str:
+    section = _SECTIONS[idx % len(_SECTIONS)]
+    return f"{MAPGEN_DOCS}/{section}/group-{idx // 100:04d}/page-{idx:06d}.md"
+
+
+def _source_rel(idx: int) -> str:
+    return f"packages/mapgen-core/src/{_SECTIONS[idx % len(_SECTIONS)]}/mod-{idx:06d}.ts"
+
+
+def _router_text(title: str, replaced_by: list[str], archived_as: str) -> str:
+    targets = "\n".join(f"- `{p}`" for p in replaced_by)
+    return (
+        "<toc>\n"
+        '  <item id="purpose" title="Purpose"/>\n'
+        '  <item id="replacements" title="Canonical replacements"/>\n'
+        "</toc>\n\n"
+        f"# {title} (legacy router)\n\n"
+        "## Purpose\n\n"
+        "This page exists only to preserve older links.\n"
+        "It is **not** canonical documentation.\n\n"
+        "## Canonical replacements\n\n"
+        f"{targets}\n\n"
+        "## Legacy archive\n\n"
+        f"The previous contents of this page were moved to `{archived_as}`.\n"
+    )
+
+
+def _doc_text(rng: random.Random, idx: int, n_docs: int, n_sources: int) -> str:
+    out = [
+        "<toc>",
+        '  <item id="purpose" title="Purpose"/>',
+        '  <item id="details" title="Details"/>',
+        '  <item id="anchors" title="Ground truth anchors"/>',
+        "</toc>",
+        "",
+        f"# Page {idx}: {rng.choice(_WORDS)} {rng.choice(_WORDS)}",
+        "",
+        "## Purpose",
+        "",
+    ]
+    for _ in range(rng.randint(2, 6)):
+        peer = rng.randrange(n_docs)
+        choice = rng.random()
+        if choice < 0.35:
+            # Bare code-span path: what the link normalizer rewrites.
+            out.append(f"{_sentence(rng)} See `{_doc_rel(peer)}` for context.")
+        elif choice < 0.6:
+            fragment = "#details" if rng.random() < 0.8 else "#no-such-heading"
+            out.append(f"{_sentence(rng)} [Related](/{_doc_rel(peer)[len('docs/'):]}{fragment}).")
+        elif choice < 0.65:
+            out.append(f"{_sentence(rng)} [Stale](./missing-{peer}.md).")
+        else:
+            out.append(_sentence(rng))
+    out.append("")
+
+    if rng.random() < 0.5:
+        out += ["```ts", 'import { stage } from "@mapgen/core";', f"// `{_doc_rel(idx)}` inside a fence", "```", ""]
+
+    out += ["## Details", ""]
+    for sub in range(rng.randint(1, 4)):
+        out += [f"### Detail {sub}", ""]
+        out += [_sentence(rng) for _ in range(rng.randint(3, 12))]
+        out.append("")
+    if rng.random() < 0.05:
+        out += [f"- **`{rng.choice(_WORDS)}`**: local term definition.", ""]
+
+    out += ["## Ground truth anchors", ""]
+    for _ in range(rng.randint(1, 5)):
+        src = rng.randrange(n_sources)
+        token = _source_rel(src) if rng.random() < 0.97 else f"packages/mapgen-core/src/gone-{src}.ts"
+        out.append(f"- `{token}`")
+    out.append("")
+    return "\n".join(out)
+
+
+def generate_corpus(*, root: Path, n_docs: int, seed: int) -> None:
+    """Write a deterministic synthetic repo with `n_docs` MapGen docs, anchored sources and a manifest."""
+    rng = random.Random(seed)
+    n_sources = max(1, n_docs // 10)
+    root.mkdir(parents=True, exist_ok=True)
+
+    for idx in range(n_sources):
+        path = root / _source_rel(idx)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"export const mod{idx} = {idx};\n", encoding="utf-8")
+
+    manifest_rows: list[str] = []
+    for idx in range(n_docs):
+        rel = _doc_rel(idx)
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if rng.random() < 0.05:
+            archived_as = rel.replace(f"{MAPGEN_DOCS}/", f"{MAPGEN_DOCS}/_archive/", 1)
+            archive = root / archived_as
+            archive.parent.mkdir(parents=True, exist_ok=True)
+            archive.write_text(_doc_text(rng, idx, n_docs, n_sources), encoding="utf-8")
+            replaced_by = [_doc_rel(rng.randrange(n_docs)) for _ in range(rng.randint(1, 3))]
+            path.write_text(_router_text(f"Page {idx}", replaced_by, archived_as), encoding="utf-8")
+        else:
+            path.write_text(_doc_text(rng, idx, n_docs, n_sources), encoding="utf-8")
+
+        if idx % 10 == 0:
+            status = rng.choice(("archive", "keep", "route", "update"))
+            manifest_rows.append(f"| `{rel}` | {status} | synthetic | `{_doc_rel(rng.randrange(n_docs))}` | |")
+
+    manifest = root / MANIFEST_REL
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    manifest.write_text(
+        "# Deprecation manifest (synthetic)\n\n"
+        "## Deprecation manifest (candidates)\n\n"
+        "| path | status | why obsolete / risky | replaced by (canonical) | notes |\n"
+        "|---|---|---|---|---|\n" + "\n".join(manifest_rows) + "\n\n"
+        "## Scan output (untriaged)\n",
+        encoding="utf-8",
+    )
+
+    # An initialized (uncommitted) repo gives the validator's git-backed path index something to list.
+    if not (root / ".git").exists():
+        subprocess.run(["git", "init", "-q", str(root)], check=True)
+
+
+def ensure_corpus(*, corpus_dir: Path, n_docs: int, seed: int) -> Path:
+    root = corpus_dir / f"docs-{n_docs}-seed{seed}"
+    stamp = root / ".bench-corpus.json"
+    if not stamp.exists():
+        generate_corpus(root=root, n_docs=n_docs, seed=seed)
+        stamp.write_text(json.dumps({"docs": n_docs, "seed": seed}) + "\n", encoding="utf-8")
+    return root
+
+
+# ---------------------------------------------------------------------------
+# Cases (each runs in a fresh interpreter so peak RSS is attributable)
+# ---------------------------------------------------------------------------
+
+
+def _corpus_docs(root: Path) -> list[Path]:
+    return sorted(p for p in (root / MAPGEN_DOCS).rglob("*.md") if "_archive" not in p.parts)
+
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        yield
+
+
+def _with_argv(argv: list[str], fn: Callable[[], int]) -> int:
+    saved = sys.argv
+    sys.argv = argv
+    try:
+        return fn()
+    finally:
+        sys.argv = saved
+
+
+def _case_validate_check_file(repo_root: Path, corpus: Path) -> tuple[int, int]:
+    tool = load_tool(repo_root, "validate")
+    files = _corpus_docs(corpus)
+    for path in files:
+        tool.check_file(file_path=path, repo_root=corpus, forbid_workspace_aliases=False, strict_terms=False)
+    return len(files), sum(p.stat().st_size for p in files)
+
+
+def _case_validate_main(repo_root: Path, corpus: Path) -> tuple[int, int]:
+    tool = load_tool(repo_root, "validate")
+    with _quiet():
+        tool.main(["--repo-root", str(corpus), "--root", MAPGEN_DOCS])
+    files = _corpus_docs(corpus)
+    return len(files), sum(p.stat().st_size for p in files)
+
+
+def _case_normalize_text(repo_root: Path, corpus: Path) -> tuple[int, int]:
+    tool = load_tool(repo_root, "normalize")
+    files = _corpus_docs(corpus)
+    total = 0
+    for path in files:
+        text = path.read_text(encoding="utf-8")
+        total += len(text.encode("utf-8"))
+        tool._normalize_text(text=text)
+    return len(files), total
+
+
+def _case_normalize_main(repo_root: Path, corpus: Path) -> tuple[int, int]:
+    tool = load_tool(repo_root, "normalize")
+    with _quiet():
+        _with_argv(["normalize", "--root", str(corpus)], tool.main)
+    files = _corpus_docs(corpus)
+    return len(files), sum(p.stat().st_size for p in files)
+
+
+def _case_archive_parse_manifest(repo_root: Path, corpus: Path) -> tuple[int, int]:
+    tool = load_tool(repo_root, "archive")
+    text = (corpus / MANIFEST_REL).read_text(encoding="utf-8")
+    rows = tool._parse_manifest_rows(manifest_text=text)
+    return len(rows), len(text.encode("utf-8"))
+
+
+def _case_archive_main(repo_root: Path, corpus: Path) -> tuple[int, int]:
+    tool = load_tool(repo_root, "archive")
+    with _quiet():
+        _with_argv(["archive", "--root", str(corpus)], tool.main)
+    text = (corpus / MANIFEST_REL).read_text(encoding="utf-8")
+    return len(tool._parse_manifest_rows(manifest_text=text)), len(text.encode("utf-8"))
+
+
+CASES: dict[tuple[str, str], Callable[[Path, Path], tuple[int, int]]] = {
+    ("validate", "check_file"): _case_validate_check_file,
+    ("validate", "main"): _case_validate_main,
+    ("normalize", "_normalize_text"): _case_normalize_text,
+    ("normalize", "main"): _case_normalize_main,
+    ("archive", "_parse_manifest_rows"): _case_archive_parse_manifest,
+    ("archive", "main"): _case_archive_main,
+}
+
+
+def _run_case_in_process(tool: str, case: str, corpus: Path) -> dict[str, float]:
+    repo_root = find_repo_root(Path(__file__))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    items, nbytes = CASES[(tool, case)](repo_root, corpus)
+    seconds = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"items": items, "bytes": nbytes, "seconds": seconds, "peak_rss_kb": peak, "baseline_rss_kb": baseline}
+
+
+def run_case(*, tool: str, case: str, corpus: Path, size: int) -> BenchResult:
+    proc = subprocess.run(
+        [sys.executable, __file__, "_case", tool, case, str(corpus)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    raw = json.loads(proc.stdout.strip().splitlines()[-1])
+    seconds = max(raw["seconds"], 1e-9)
+    return BenchResult(
+        tool=tool,
+        case=case,
+        size=size,
+        files=int(raw["items"]),
+        bytes=int(raw["bytes"]),
+        seconds=raw["seconds"],
+        files_per_s=raw["items"] / seconds,
+        mb_per_s=raw["bytes"] / seconds / 1e6,
+        peak_rss_kb=int(raw["peak_rss_kb"]),
+        baseline_rss_kb=int(raw["baseline_rss_kb"]),
+    )
+
+
+def _git_head(repo_root: Path) -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "-C", str(repo_root), "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_results(results: list[BenchResult]) -> None:
+    print(f"{'tool':<10} {'case':<22} {'size':>7} {'items':>7} {'seconds':>9} {'items/s':>10} {'MB/s':>8} {'peak RSS':>10}")
+    for r in results:
+        print(
+            f"{r.tool:<10} {r.case:<22} {r.size:>7} {r.files:>7} {r.seconds:>9.3f} "
+            f"{r.files_per_s:>10.0f} {r.mb_per_s:>8.2f} {r.peak_rss_kb / 1024:>8.1f}MB"
+        )
+
+
+def compare(*, before_path: Path, after_path: Path) -> int:
+    before = json.loads(before_path.read_text(encoding="utf-8"))
+    after = json.loads(after_path.read_text(encoding="utf-8"))
+    key = lambda r: (r["tool"], r["case"], r["size"])  # noqa: E731
+    before_by_key = {key(r): r for r in before["results"]}
+    print(f"before: {before.get('commit')}  after: {after.get('commit')}")
+    print(f"{'tool':<10} {'case':<22} {'size':>7} {'time':>9} {'peak RSS':>9}")
+    for r in after["results"]:
+        b = before_by_key.get(key(r))
+        if b is None:
+            continue
+        time_ratio = r["seconds"] / max(b["seconds"], 1e-9)
+        rss_ratio = r["peak_rss_kb"] / max(b["peak_rss_kb"], 1)
+        print(f"{r['tool']:<10} {r['case']:<22} {r['size']:>7} {time_ratio:>8.2f}x {rss_ratio:>8.2f}x")
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    if argv[:1] == ["_case"]:
+        _, tool, case, corpus = argv
+        print(json.dumps(_run_case_in_process(tool, case, Path(corpus))))
+        return 0
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the MapGen docs tooling against deterministic synthetic docs trees."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Generate (or reuse) synthetic corpora without running benchmarks.")
+    run = sub.add_parser("run", help="Generate corpora as needed and time every tool case.")
+    for p in (gen, run):
+        p.add_argument(
+            "--sizes",
+            default=",".join(str(n) for n in DEFAULT_SIZES),
+            help="Comma-separated doc counts (default: 1000,10000; add 100000 for the large tier).",
+        )
+        p.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Generator seed (default: {DEFAULT_SEED}).")
+        p.add_argument(
+            "--corpus-dir",
+            default=DEFAULT_CORPUS_DIR,
+            help=f"Where corpora are written, repo-relative (default: {DEFAULT_CORPUS_DIR}).",
+        )
+    run.add_argument("--tools", default="", help="Comma-separated tool filter (validate,normalize,archive).")
+    run.add_argument("--out", default="", help="Write results as JSON to this file.")
+
+    cmp_parser = sub.add_parser("compare", help="Compare two JSON result files (time and peak RSS ratios).")
+    cmp_parser.add_argument("before")
+    cmp_parser.add_argument("after")
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return compare(before_path=Path(args.before), after_path=Path(args.after))
+
+    repo_root = find_repo_root(Path(__file__))
+    corpus_dir = repo_root / args.corpus_dir
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    corpora = {n: ensure_corpus(corpus_dir=corpus_dir, n_docs=n, seed=args.seed) for n in sizes}
+    if args.command == "generate":
+        for n, root in corpora.items():
+            print(f"{n:>7} docs: {root}")
+        return 0
+
+    tools = {t for t in args.tools.split(",") if t} or set(TOOL_PATHS)
+    results: list[BenchResult] = []
+    for n, root in corpora.items():
+        for tool, case in CASES:
+            if tool in tools:
+                results.append(run_case(tool=tool, case=case, corpus=root, size=n))
+
+    _print_results(results)
+    if args.out:
+        payload = {
+            "commit": _git_head(repo_root),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "results": [asdict(r) for r in results],
+        }
+        Path(args.out).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
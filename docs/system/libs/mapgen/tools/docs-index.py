@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from docs_tools import find_repo_root
+from docs_tools.index import DEFAULT_DB_PATH, DEFAULT_INDEX_ROOT, DocsIndex
+
+
+def _print_rows(rows: list[tuple[object, ...]] | list[str], *, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps([list(r) if isinstance(r, tuple) else r for r in rows], indent=2))
+        return
+    for row in rows:
+        print("\t".join("" if v is None else str(v) for v in row) if isinstance(row, tuple) else row)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Query the persistent SQLite docs index (paths, hashes, headings, <toc> ids, code-span paths, links, "
+            "anchor sections, router status). Every query first updates the index incrementally by content hash."
+        )
+    )
+    parser.add_argument(
+        "--repo-root",
+        default="",
+        help="Repo root override (default: auto-detect from this script location).",
+    )
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"Index database, repo-relative (default: {DEFAULT_DB_PATH}).")
+    parser.add_argument("--root", default=DEFAULT_INDEX_ROOT, help=f"Docs tree to index (default: {DEFAULT_INDEX_ROOT}).")
+    parser.add_argument("--no-update", action="store_true", help="Answer from the index as-is, without refreshing it.")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=0,
+        help="Parse changed docs across N worker processes (default: 0, one per CPU; 1 = serial).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("update", help="Refresh the index and print what changed.")
+    p = sub.add_parser("anchors", help="Docs whose 'Ground truth anchors' section cites FILE.")
+    p.add_argument("file")
+    p = sub.add_parser("mentions", help="Every backticked mention of FILE, anchors section or not.")
+    p.add_argument("file")
+    sub.add_parser("routers", help="Every legacy router page.")
+    p = sub.add_parser("heading", help="Headings containing TEXT (case-insensitive) or with slug TEXT.")
+    p.add_argument("text")
+    p = sub.add_parser("links-to", help="Markdown links pointing at DOC.")
+    p.add_argument("doc")
+    p = sub.add_parser("toc", help="The <toc> item ids of DOC.")
+    p.add_argument("doc")
+    p = sub.add_parser("sql", help="Run a read-only SQL query against the index.")
+    p.add_argument("query")
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.repo_root).resolve() if args.repo_root else find_repo_root(Path(__file__))
+    with DocsIndex(repo_root=repo_root, db_path=repo_root / args.db, docs_root=args.root) as index:
+        if not args.no_update or args.command == "update":
+            started = time.perf_counter()
+            stats = index.update(jobs=args.jobs)
+            if args.command == "update":
+                print(
+                    f"Indexed {stats.scanned} docs: {stats.parsed} parsed, {stats.removed} removed "
+                    f"({time.perf_counter() - started:.3f}s)."
+                )
+                return 0
+
+        if args.command == "anchors":
+            rows = index.anchored_by(args.file)
+        elif args.command == "mentions":
+            rows = index.mentions(args.file)
+        elif args.command == "routers":
+            rows = index.routers()
+        elif args.command == "heading":
+            rows = index.headings(args.text)
+        elif args.command == "links-to":
+            rows = index.links_to(args.doc)
+        elif args.command == "toc":
+            rows = index.toc(args.doc)
+        else:
+            index.db.execute("PRAGMA query_only = ON")
+            try:
+                rows = index.query(args.query)
+            except sqlite3.Error as e:
+                print(f"ERROR: {e}", file=sys.stderr)
+                return 2
+    _print_rows(rows, as_json=args.json)
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
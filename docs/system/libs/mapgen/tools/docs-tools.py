@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import sys
+
+from docs_tools.cli import main
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""Shared core of the MapGen docs tooling.
+
+The validator, the link normalizer and the deprecation/archive scripts are standalone scripts; this package holds
+what they have in common: repo-root discovery and the repo file index, the Markdown block tokenizer, router-stub
+templates, and a parsed-document cache that lets `docs-tools check` run several tools in one interpreter while
+reading each doc once. Subcommands are loaded lazily by `docs_tools.cli`; `docs_tools.index` is the persistent
+SQLite docs index, `docs_tools.ts_symbols` the lexical TypeScript symbol index behind `--symbols`, and
+`docs_tools.bundle` the chunked LLM context bundle builder.
+"""
+
+from docs_tools.cache import DocCache, ParsedDoc, active_doc_cache, shared_doc_cache
+from docs_tools.markdown import (
+    ATX_HEADING_RE,
+    BACKTICK_RE,
+    FENCE_OPEN_RE,
+    Block,
+    FenceTracker,
+    code_spans,
+    tokenize_blocks,
+)
+from docs_tools.repo import (
+    PathIndex,
+    find_repo_root,
+    git_ls_files,
+    iter_markdown_files,
+    list_repo_files,
+    stat_exists,
+)
+from docs_tools.routers import looks_like_router_stub, router_stub
+
+__all__ = [
+    "ATX_HEADING_RE",
+    "BACKTICK_RE",
+    "FENCE_OPEN_RE",
+    "Block",
+    "DocCache",
+    "FenceTracker",
+    "ParsedDoc",
+    "PathIndex",
+    "active_doc_cache",
+    "code_spans",
+    "find_repo_root",
+    "git_ls_files",
+    "iter_markdown_files",
+    "list_repo_files",
+    "looks_like_router_stub",
+    "router_stub",
+    "shared_doc_cache",
+    "stat_exists",
+    "tokenize_blocks",
+]
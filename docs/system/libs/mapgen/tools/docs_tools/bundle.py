@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import IO, Any, Iterable, Iterator
+
+from docs_tools.cli import load_script
+from docs_tools.index import TOC_CLOSE_RE, TOC_OPEN_RE, VALIDATOR_SCRIPT, link_target
+from docs_tools.markdown import FenceTracker
+from docs_tools.repo import iter_markdown_files
+
+
+DEFAULT_BUNDLE_ROOT = "docs/system/libs/mapgen"
+DEFAULT_SPINE_START = "docs/system/libs/mapgen/llms/LLMS.md"
+DEFAULT_BUNDLE_DIR = ".cache/mapgen-docs/llm-bundle"
+DEFAULT_MAX_TOKENS = 16_000
+MANIFEST_NAME = "manifest.json"
+
+# Rough LLM tokenizer ratio for English Markdown; counts are estimates for budgeting, not billing.
+BYTES_PER_TOKEN = 4
+# Room left in every chunk for the per-page source headers.
+HEADER_RESERVE_BYTES = 256
+# A page whose path hashes to 0 modulo this always starts a new chunk. Boundaries tied to paths rather than to
+# running sizes let the layout re-synchronize a few pages after an edit, so one changed page cannot re-cut every
+# chunk that follows it.
+BOUNDARY_EVERY = 8
+
+# Bump whenever chunk rendering or the manifest layout changes; a mismatched manifest is rebuilt from scratch.
+BUNDLE_VERSION = 1
+
+
+def _validator() -> ModuleType:
+    # Discovery, router detection and link parsing follow the validator, like the docs index does.
+    return load_script(VALIDATOR_SCRIPT)
+
+
+def approx_tokens(n_bytes: int) -> int:
+    return -(-n_bytes // BYTES_PER_TOKEN)
+
+
+def page_lines(fh: IO[str]) -> Iterator[str]:
+    # Universal-newline text mode leaves only "\n" to strip, so measuring and rendering see the same lines.
+    return (line.rstrip("\n") for line in fh)
+
+
+def strip_boilerplate(lines: Iterable[str]) -> Iterator[str]:
+    """Drop `<toc>` blocks (outside code fences) and the blank lines that lead a page once they are gone."""
+    fences = FenceTracker()
+    in_toc = False
+    leading = True
+    for line in lines:
+        if fences.feed(line) is None:
+            if in_toc:
+                in_toc = not TOC_CLOSE_RE.match(line)
+                continue
+            if TOC_OPEN_RE.match(line):
+                in_toc = True
+                continue
+        if leading and not line.strip():
+            continue
+        leading = False
+        yield line
+
+
+@dataclass(frozen=True)
+class PageInfo:
+    """What the planner needs about one page, cached in the manifest by stat and content hash."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+    is_router: bool
+    # Repo-relative Markdown link targets in document order (duplicates dropped).
+    links: tuple[str, ...]
+    # `(first line, end line, bytes)` of each part, over the lines `strip_boilerplate` keeps.
+    parts: tuple[tuple[int, int, int], ...]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "sha256": self.sha256,
+            "router": self.is_router,
+            "links": list(self.links),
+            "parts": [list(p) for p in self.parts],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> PageInfo:
+        return cls(
+            size=data["size"],
+            mtime_ns=data["mtime_ns"],
+            sha256=data["sha256"],
+            is_router=data["router"],
+            links=tuple(data["links"]),
+            parts=tuple(tuple(p) for p in data["parts"]),
+        )
+
+
+def split_parts(lines: Iterable[str], *, budget: int) -> tuple[tuple[int, int, int], ...]:
+    """Cut a page into parts of at most `budget` bytes, preferring to cut after a blank line.
+
+    A single line longer than the budget becomes a part of its own.
+    """
+    parts: list[tuple[int, int, int]] = []
+    start = count = size = 0
+    # Last blank line in the current part: (line index, part bytes up to and including it).
+    blank: tuple[int, int] | None = None
+    for line in lines:
+        length = len(line.encode("utf-8")) + 1
+        if size and size + length > budget:
+            if blank is not None and size - blank[1] + length <= budget:
+                cut, cut_size = blank
+                parts.append((start, cut + 1, cut_size))
+                start, size = cut + 1, size - cut_size
+            else:
+                parts.append((start, count, size))
+                start, size = count, 0
+            blank = None
+        size += length
+        if not line.strip():
+            blank = (count, size)
+        count += 1
+    if size or not parts:
+        parts.append((start, count, size))
+    return tuple(parts)
+
+
+def source_header(path: str, part: int, parts: int) -> str:
+    suffix = f" (part {part + 1}/{parts})" if parts > 1 else ""
+    return f"<!-- source: {path}{suffix} -->\n\n"
+
+
+@dataclass(frozen=True)
+class Unit:
+    """One page, or one part of a page too large for a single chunk."""
+
+    path: str
+    sha256: str
+    part: int
+    parts: int
+    # Line range over the kept lines of the page, and the rendered size (header and separator included).
+    start: int
+    end: int
+    bytes: int
+
+
+@dataclass(frozen=True)
+class BuildStats:
+    pages: int
+    chunks: int
+    written: int
+    reused: int
+    removed: int
+    parsed: int
+
+
+class BundleBuilder:
+    """Streams the canonical docs, in spine order, into size-bounded Markdown chunks plus a JSON manifest.
+
+    The spine is a breadth-first walk of Markdown links from `start` (the LLM entrypoint page), in link order;
+    pages it never reaches follow in path order. Pages come from the validator's discovery rules (excluded dirs,
+    no routers). Chunk files are named by a hash of the page parts they hold, so a rebuild writes only chunks
+    whose pages changed and deletes the ones no longer planned. Only one page is held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        *,
+        repo_root: Path,
+        root: str = DEFAULT_BUNDLE_ROOT,
+        start: str = DEFAULT_SPINE_START,
+        out_dir: Path | None = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        exclude_dirs: set[str] | None = None,
+    ) -> None:
+        v = _validator()
+        self.repo_root = repo_root
+        self.root = root
+        self.start = start
+        self.out_dir = out_dir or repo_root / DEFAULT_BUNDLE_DIR
+        self.max_tokens = max_tokens
+        self.exclude_dirs = set(v.DEFAULT_EXCLUDE_DIRS) if exclude_dirs is None else exclude_dirs
+        self.pages: dict[str, PageInfo] = {}
+        self.parsed = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self.max_tokens * BYTES_PER_TOKEN
+
+    def _load_manifest(self) -> dict[str, Any] | None:
+        try:
+            data = json.loads((self.out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != BUNDLE_VERSION or data.get("max_tokens") != self.max_tokens:
+            return None
+        return data
+
+    def _page_info(self, rel: str, known: PageInfo | None) -> PageInfo:
+        path = self.repo_root / rel
+        st = path.stat()
+        if known is not None and (known.size, known.mtime_ns) == (st.st_size, st.st_mtime_ns):
+            return known
+        data = path.read_bytes()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if known is not None and known.sha256 == sha256:
+            # Touched but unchanged (checkout, rebase): refresh the stat key only.
+            return PageInfo(st.st_size, st.st_mtime_ns, sha256, known.is_router, known.links, known.parts)
+
+        v = _validator()
+        self.parsed += 1
+        links: dict[str, None] = {}
+        for _, href in v.parse_doc_links(Path(rel), data=data).links:
+            resolved = link_target(rel, href)
+            if resolved is not None and resolved[0] is not None and resolved[0] != rel:
+                links.setdefault(resolved[0])
+        with io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="replace") as fh:
+            parts = split_parts(strip_boilerplate(page_lines(fh)), budget=self.max_bytes - HEADER_RESERVE_BYTES)
+        is_router = v.is_legacy_router(data.decode("utf-8", errors="replace"))
+        return PageInfo(st.st_size, st.st_mtime_ns, sha256, is_router, tuple(links), parts)
+
+    def spine(self, pages: dict[str, PageInfo]) -> list[str]:
+        order: list[str] = []
+        seen: set[str] = set()
+        queue = deque([self.start] if self.start in pages else [])
+        seen.update(queue)
+        while queue:
+            rel = queue.popleft()
+            order.append(rel)
+            for target in pages[rel].links:
+                if target in pages and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        order.extend(rel for rel in sorted(pages) if rel not in seen)
+        return order
+
+    def plan(self, order: list[str]) -> list[list[Unit]]:
+        chunks: list[list[Unit]] = []
+        size = 0
+        for rel in order:
+            info = self.pages[rel]
+            for i, (start, end, n_bytes) in enumerate(info.parts):
+                n_bytes += len(source_header(rel, i, len(info.parts)).encode("utf-8")) + 1
+                unit = Unit(rel, info.sha256, i, len(info.parts), start, end, n_bytes)
+                anchored = i == 0 and int(hashlib.sha1(rel.encode("utf-8")).hexdigest()[:8], 16) % BOUNDARY_EVERY == 0
+                if not chunks or size + unit.bytes > self.max_bytes or (anchored and size) or unit.parts > 1:
+                    chunks.append([])
+                    size = 0
+                chunks[-1].append(unit)
+                size += unit.bytes
+        return chunks
+
+    @staticmethod
+    def chunk_name(units: list[Unit]) -> str:
+        key = json.dumps(
+            [BUNDLE_VERSION, *[(u.path, u.sha256, u.part, u.parts, u.start, u.end) for u in units]]
+        ).encode("utf-8")
+        return f"chunk-{hashlib.sha256(key).hexdigest()[:16]}.md"
+
+    def _write_chunk(self, name: str, units: list[Unit]) -> int:
+        fd, tmp = tempfile.mkstemp(dir=self.out_dir, prefix=".chunk-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as out:
+                for n, unit in enumerate(units):
+                    if n:
+                        out.write("\n")
+                    out.write(source_header(unit.path, unit.part, unit.parts))
+                    with (self.repo_root / unit.path).open(encoding="utf-8", errors="replace") as fh:
+                        for i, line in enumerate(strip_boilerplate(page_lines(fh))):
+                            if i >= unit.end:
+                                break
+                            if i >= unit.start:
+                                out.write(line + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, self.out_dir / name)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        return (self.out_dir / name).stat().st_size
+
+    def build(self) -> BuildStats:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest() or {"chunks": [], "pages": {}}
+        known = {rel: PageInfo.from_json(entry) for rel, entry in manifest["pages"].items()}
+        previous = {chunk["file"]: chunk for chunk in manifest["chunks"]}
+
+        for file_path in iter_markdown_files(self.repo_root / self.root, exclude_dirs=self.exclude_dirs):
+            rel = os.path.relpath(file_path, self.repo_root)
+            self.pages[rel] = self._page_info(rel, known.get(rel))
+        included = {rel: info for rel, info in self.pages.items() if not info.is_router}
+
+        chunks: list[dict[str, Any]] = []
+        written = 0
+        for units in self.plan(self.spine(included)):
+            name = self.chunk_name(units)
+            entry = previous.get(name)
+            if entry is None or not (self.out_dir / name).is_file():
+                n_bytes = self._write_chunk(name, units)
+                written += 1
+            else:
+                n_bytes = entry["bytes"]
+            chunks.append(
+                {
+                    "file": name,
+                    "bytes": n_bytes,
+                    "tokens": approx_tokens(n_bytes),
+                    "pages": [
+                        {"path": u.path, "sha256": u.sha256, "part": u.part + 1, "parts": u.parts} for u in units
+                    ],
+                }
+            )
+
+        planned = {chunk["file"] for chunk in chunks}
+        removed = 0
+        for stale in self.out_dir.glob("chunk-*.md"):
+            if stale.name not in planned:
+                stale.unlink()
+                removed += 1
+
+        payload = {
+            "version": BUNDLE_VERSION,
+            "root": self.root,
+            "start": self.start,
+            "max_tokens": self.max_tokens,
+            "bytes_per_token": BYTES_PER_TOKEN,
+            "total_tokens": sum(chunk["tokens"] for chunk in chunks),
+            "chunks": chunks,
+            "pages": {rel: info.to_json() for rel, info in sorted(self.pages.items())},
+        }
+        tmp = self.out_dir / (MANIFEST_NAME + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.out_dir / MANIFEST_NAME)
+        return BuildStats(
+            pages=len(included),
+            chunks=len(chunks),
+            written=written,
+            reused=len(chunks) - written,
+            removed=removed,
+            parsed=self.parsed,
+        )
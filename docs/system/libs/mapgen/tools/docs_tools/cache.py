@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import os
+from functools import cached_property
+from pathlib import Path
+from typing import Iterator
+
+
+class ParsedDoc:
+    """One doc's bytes plus views derived from them on first use (hash, decoded text)."""
+
+    def __init__(self, path: Path, data: bytes) -> None:
+        self.path = path
+        self.data = data
+
+    @cached_property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    @cached_property
+    def text(self) -> str:
+        # Same as `Path.read_text(encoding="utf-8", errors="replace")`, including universal newlines.
+        return io.TextIOWrapper(io.BytesIO(self.data), encoding="utf-8", errors="replace").read()
+
+
+class DocCache:
+    """Parsed docs keyed by path; an entry is re-read only when the file's size or mtime changes."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, tuple[int, int, ParsedDoc]] = {}
+        self.reads = 0
+        self.hits = 0
+
+    def get(self, path: Path) -> ParsedDoc:
+        key = os.fspath(path)
+        st = os.stat(key)
+        entry = self.docs.get(key)
+        if entry is not None and entry[:2] == (st.st_size, st.st_mtime_ns):
+            self.hits += 1
+            return entry[2]
+        with open(key, "rb") as fh:
+            doc = ParsedDoc(path, fh.read())
+        self.reads += 1
+        self.docs[key] = (st.st_size, st.st_mtime_ns, doc)
+        return doc
+
+
+_ACTIVE: DocCache | None = None
+
+
+def active_doc_cache() -> DocCache | None:
+    """The cache installed by `shared_doc_cache()`, if any; tools fall back to their own reads without one."""
+    return _ACTIVE
+
+
+@contextlib.contextmanager
+def shared_doc_cache() -> Iterator[DocCache]:
+    """Share one `DocCache` across every tool run in this interpreter for the duration of the block."""
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = DocCache()
+    try:
+        yield _ACTIVE
+    finally:
+        _ACTIVE = previous
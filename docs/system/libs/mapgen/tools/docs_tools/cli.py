@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from docs_tools.cache import shared_doc_cache
+from docs_tools.repo import find_repo_root
+
+
+_ALIGNMENT_SCRIPTS = "docs/projects/engine-refactor-v1/mapgen-docs-alignment/scripts"
+_TOOLS = "docs/system/libs/mapgen/tools"
+
+
+@dataclass(frozen=True)
+class Subcommand:
+    name: str
+    # Repo-relative script whose `main(argv)` implements the subcommand; imported only when it runs.
+    script_rel: str
+    help: str
+    # The script's own repo-root override flag.
+    root_flag: str = "--root"
+
+
+SUBCOMMANDS: dict[str, Subcommand] = {
+    cmd.name: cmd
+    for cmd in (
+        Subcommand(
+            "validate",
+            f"{_TOOLS}/validate-anchors-and-references.py",
+            "Validate canonical MapGen docs anchors, routers and links.",
+            root_flag="--repo-root",
+        ),
+        Subcommand(
+            "normalize",
+            f"{_ALIGNMENT_SCRIPTS}/normalize_mapgen_doc_links.py",
+            "Normalize docs intra-links (dry run unless --apply).",
+        ),
+        Subcommand(
+            "deprecation-scan",
+            f"{_ALIGNMENT_SCRIPTS}/generate_deprecation_scan.py",
+            "Regenerate or --check the manifest's untriaged scan section.",
+        ),
+        Subcommand(
+            "archive",
+            f"{_ALIGNMENT_SCRIPTS}/execute_deprecation_archiving.py",
+            "Archive manifest 'archive' rows behind router stubs.",
+        ),
+        Subcommand(
+            "impact",
+            f"{_ALIGNMENT_SCRIPTS}/scan_archive_impact.py",
+            "Reverse-reference impact scan for manifest rows.",
+        ),
+        Subcommand(
+            "index",
+            f"{_TOOLS}/docs-index.py",
+            "Query the persistent SQLite docs index (anchors, routers, headings, links).",
+            root_flag="--repo-root",
+        ),
+        Subcommand(
+            "bundle",
+            f"{_TOOLS}/llm-bundle.py",
+            "Build the chunked LLM context bundle of the canonical MapGen docs.",
+            root_flag="--repo-root",
+        ),
+        Subcommand(
+            "bench",
+            f"{_TOOLS}/bench-docs-tools.py",
+            "Benchmark the docs tools on a synthetic corpus.",
+        ),
+    )
+}
+
+# `docs-tools check`: the read-only checks, in order, with the arguments that make each one a check.
+CHECKS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("validate", ()),
+    ("normalize", ("--check",)),
+    ("deprecation-scan", ("--check",)),
+)
+
+
+def load_script(path: Path) -> ModuleType:
+    """Import a tool script (some have hyphenated names) by path, once per interpreter.
+
+    The script's directory goes on `sys.path` first, as when it runs directly, so its sibling imports resolve.
+    """
+    module_name = "_docs_tools_" + path.stem.replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_subcommand(repo_root: Path, name: str, argv: list[str]) -> int:
+    return int(load_script(repo_root / SUBCOMMANDS[name].script_rel).main(argv) or 0)
+
+
+def main_check(repo_root: Path, argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="docs-tools check",
+        description=(
+            "Run the docs checks (validate, normalize --check, deprecation-scan --check) in this interpreter, "
+            "sharing one parsed-document cache so each doc is read once."
+        ),
+    )
+    parser.add_argument(
+        "--repo-root",
+        default="",
+        help="Repo root override, forwarded to every check (default: auto-detect).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Worker processes per check (default: 1, serial, so every check reads through the shared cache).",
+    )
+    parser.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        choices=[name for name, _ in CHECKS],
+        help="Skip a check (repeatable).",
+    )
+    args = parser.parse_args(argv)
+
+    status = 0
+    with shared_doc_cache() as cache:
+        for name, check_args in CHECKS:
+            if name in args.skip:
+                continue
+            cmd = SUBCOMMANDS[name]
+            forwarded = [*check_args, "--jobs", str(args.jobs)]
+            if args.repo_root:
+                forwarded += [cmd.root_flag, args.repo_root]
+            print(f"== docs-tools {name} {' '.join(forwarded)}", flush=True)
+            result = run_subcommand(repo_root, name, forwarded)
+            sys.stdout.flush()
+            print(f"== {name}: {'ok' if result == 0 else f'exit {result}'}\n", flush=True)
+            status = max(status, result)
+        print(f"docs-tools check: {cache.reads} docs read ({cache.hits} cache hits).")
+    return status
+
+
+def main(argv: list[str]) -> int:
+    commands = "\n".join(
+        [f"  {'check':<18}Run the read-only checks in one interpreter (see `check --help`)."]
+        + [f"  {cmd.name:<18}{cmd.help}" for cmd in SUBCOMMANDS.values()]
+    )
+    usage = f"usage: docs-tools <command> [args...]\n\ncommands:\n{commands}\n"
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage, end="")
+        return 0 if argv else 2
+    name, rest = argv[0], argv[1:]
+
+    repo_root = find_repo_root(Path(__file__))
+    if name == "check":
+        return main_check(repo_root, rest)
+    if name not in SUBCOMMANDS:
+        print(f"docs-tools: unknown command {name!r}\n\n{usage}", end="", file=sys.stderr)
+        return 2
+    return run_subcommand(repo_root, name, rest)
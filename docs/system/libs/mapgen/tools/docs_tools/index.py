@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from urllib.parse import unquote
+
+from docs_tools.cli import load_script
+from docs_tools.markdown import tokenize_blocks
+from docs_tools.repo import iter_markdown_files
+
+
+DEFAULT_DB_PATH = ".cache/mapgen-docs/docs-index.sqlite"
+DEFAULT_INDEX_ROOT = "docs"
+VALIDATOR_SCRIPT = Path(__file__).resolve().parents[1] / "validate-anchors-and-references.py"
+
+TOC_OPEN_RE = re.compile(r"^\s*<toc>\s*$")
+TOC_CLOSE_RE = re.compile(r"^\s*</toc>\s*$")
+TOC_ITEM_RE = re.compile(r"<item\s+id=\"([^\"]+)\"(?:\s+title=\"([^\"]*)\")?")
+
+# Bump whenever the schema or what `parse_doc` extracts changes; a mismatched database is rebuilt from scratch.
+SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE docs (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    title TEXT,
+    is_router INTEGER NOT NULL,
+    -- First line of the `## Ground truth anchors` section body (NULL when the doc has none).
+    anchors_line INTEGER
+);
+CREATE TABLE headings (path TEXT NOT NULL, line INTEGER NOT NULL, level INTEGER NOT NULL, text TEXT NOT NULL, slug TEXT NOT NULL);
+CREATE TABLE toc_items (path TEXT NOT NULL, item_id TEXT NOT NULL, title TEXT);
+CREATE TABLE code_paths (path TEXT NOT NULL, line INTEGER NOT NULL, token TEXT NOT NULL, in_anchors INTEGER NOT NULL);
+CREATE TABLE links (path TEXT NOT NULL, line INTEGER NOT NULL, href TEXT NOT NULL, target TEXT, fragment TEXT NOT NULL);
+CREATE INDEX headings_path ON headings (path);
+CREATE INDEX headings_slug ON headings (slug);
+CREATE INDEX toc_items_path ON toc_items (path);
+CREATE INDEX code_paths_path ON code_paths (path);
+CREATE INDEX code_paths_token ON code_paths (token);
+CREATE INDEX links_path ON links (path);
+CREATE INDEX links_target ON links (target);
+"""
+_CHILD_TABLES = ("headings", "toc_items", "code_paths", "links")
+# Below this many changed docs, a worker pool costs more to start than the parsing it saves.
+_PARALLEL_MIN_DOCS = 64
+
+
+def _validator() -> ModuleType:
+    # The parsing rules belong to the validator; the index calls the same helpers so both always agree.
+    return load_script(VALIDATOR_SCRIPT)
+
+
+@dataclass
+class DocRecord:
+    """Everything the index stores for one doc."""
+
+    path: str
+    sha256: str
+    title: str | None = None
+    is_router: bool = False
+    anchors_line: int | None = None
+    headings: list[tuple[int, int, str, str]] = field(default_factory=list)
+    toc_items: list[tuple[str, str | None]] = field(default_factory=list)
+    code_paths: list[tuple[int, str, bool]] = field(default_factory=list)
+    links: list[tuple[int, str, str | None, str]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class UpdateStats:
+    scanned: int
+    parsed: int
+    removed: int
+
+
+def link_target(source_rel: str, href: str, *, docs_prefix: str = DEFAULT_INDEX_ROOT) -> tuple[str | None, str] | None:
+    """Normalize an href to `(repo-relative path or None, fragment)` from its text alone; None for external URLs.
+
+    Unlike the validator's link check this never stats the target, so a stored row depends only on its doc's
+    content and stays valid across incremental updates.
+    """
+    v = _validator()
+    href = href.strip("<>")
+    if v.URL_SCHEME_RE.match(href) or href.startswith("//"):
+        return None
+    path, _, fragment = href.partition("#")
+    path = unquote(path.split("?", 1)[0])
+    fragment = unquote(fragment)
+    if not path:
+        return source_rel, fragment
+    if path.startswith("/"):
+        # Docs-site hrefs are rooted at `docs/`.
+        target = os.path.normpath(os.path.join(docs_prefix, path[1:]))
+    else:
+        target = os.path.normpath(os.path.join(os.path.dirname(source_rel), path))
+    return (None if target.startswith("..") else target), fragment
+
+
+def parse_doc(rel: str, data: bytes) -> DocRecord:
+    v = _validator()
+    text = data.decode("utf-8", errors="replace")
+    lines = text.splitlines()
+    record = DocRecord(path=rel, sha256=hashlib.sha256(data).hexdigest(), is_router=v.is_legacy_router(text))
+
+    anchors_range = range(0)
+    section = v.anchors_section_lines(lines)
+    if section is not None:
+        start = next(i for i, line in enumerate(lines) if v.ANCHORS_H2_RE.match(line.strip())) + 1
+        record.anchors_line = start + 1
+        anchors_range = range(start, start + len(section))
+    for idx, line in enumerate(lines):
+        if "`" in line:
+            for token in v.extract_backticked_file_paths([line]):
+                record.code_paths.append((idx + 1, token, idx in anchors_range))
+
+    # Heading slugs follow the validator's link check: custom `{#id}` wins, repeats get `-1`, `-2`, ...
+    slug_counts: dict[str, int] = {}
+    for block in tokenize_blocks(lines):
+        if block.kind != "heading":
+            continue
+        heading = block.info
+        custom = v.CUSTOM_HEADING_ID_RE.search(heading)
+        if custom:
+            heading = heading[: custom.start()]
+        base = v.slugify_heading(heading.strip())
+        seen = slug_counts.get(base, 0)
+        slug_counts[base] = seen + 1
+        slug = custom.group(1) if custom else base if seen == 0 else f"{base}-{seen}"
+        record.headings.append((block.start, block.level, heading.strip(), slug))
+        if block.level == 1 and record.title is None:
+            record.title = heading.strip()
+
+    in_toc = False
+    for line in lines:
+        if TOC_OPEN_RE.match(line):
+            in_toc = True
+        elif TOC_CLOSE_RE.match(line):
+            break
+        elif in_toc:
+            record.toc_items.extend((m.group(1), m.group(2)) for m in TOC_ITEM_RE.finditer(line))
+
+    for lineno, href in v.parse_doc_links(Path(rel), data=data).links:
+        resolved = link_target(rel, href)
+        if resolved is not None:
+            record.links.append((lineno, href, *resolved))
+    return record
+
+
+def _parse_task(item: tuple[str, bytes, int, int]) -> DocRecord:
+    # Module-level so the pool can pickle it.
+    return parse_doc(item[0], item[1])
+
+
+class DocsIndex:
+    """SQLite index of every doc under a docs root, kept current incrementally by stat and content hash.
+
+    `update()` re-parses only docs whose bytes changed; the query methods answer from the database alone.
+    """
+
+    def __init__(self, *, repo_root: Path, db_path: Path | None = None, docs_root: str = DEFAULT_INDEX_ROOT) -> None:
+        self.repo_root = repo_root
+        self.docs_root = docs_root
+        self.db_path = db_path or repo_root / DEFAULT_DB_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self._ensure_schema()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> DocsIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _ensure_schema(self) -> None:
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is not None and row[0] == str(SCHEMA_VERSION):
+            return
+        with self.db:
+            for (name,) in self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                self.db.execute(f"DROP TABLE IF EXISTS {name}")
+            self.db.executescript(_SCHEMA)
+            self.db.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (str(SCHEMA_VERSION),))
+
+    def update(self, *, jobs: int = 0) -> UpdateStats:
+        """Bring the index in line with the worktree: new and changed docs are parsed, deleted ones dropped.
+
+        Parsing runs across `jobs` worker processes (0 = one per CPU) when there is enough of it to pay off.
+        """
+        known = {
+            path: (sha256, size, mtime_ns)
+            for path, sha256, size, mtime_ns in self.db.execute("SELECT path, sha256, size, mtime_ns FROM docs")
+        }
+        files = iter_markdown_files(self.repo_root / self.docs_root, exclude_dirs=set())
+        seen: set[str] = set()
+        pending: list[tuple[str, bytes, int, int]] = []
+        with self.db:
+            for file_path in files:
+                rel = os.path.relpath(file_path, self.repo_root)
+                seen.add(rel)
+                st = file_path.stat()
+                entry = known.get(rel)
+                if entry is not None and entry[1:] == (st.st_size, st.st_mtime_ns):
+                    continue
+                data = file_path.read_bytes()
+                if entry is not None and entry[0] == hashlib.sha256(data).hexdigest():
+                    # Touched but unchanged (checkout, rebase): refresh the stat key only.
+                    self.db.execute(
+                        "UPDATE docs SET size = ?, mtime_ns = ? WHERE path = ?", (st.st_size, st.st_mtime_ns, rel)
+                    )
+                    continue
+                pending.append((rel, data, st.st_size, st.st_mtime_ns))
+
+            jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+            if jobs <= 1 or len(pending) < _PARALLEL_MIN_DOCS:
+                records = map(_parse_task, pending)
+                pool = None
+            else:
+                pool = ProcessPoolExecutor(max_workers=jobs)
+                records = pool.map(_parse_task, pending, chunksize=max(1, len(pending) // (jobs * 4)))
+            try:
+                for (_rel, _data, size, mtime_ns), record in zip(pending, records):
+                    self._store(record, size=size, mtime_ns=mtime_ns)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+            removed = sorted(set(known) - seen)
+            for rel in removed:
+                self._delete(rel)
+        return UpdateStats(scanned=len(files), parsed=len(pending), removed=len(removed))
+
+    def _delete(self, rel: str) -> None:
+        for table in (*_CHILD_TABLES, "docs"):
+            self.db.execute(f"DELETE FROM {table} WHERE path = ?", (rel,))
+
+    def _store(self, record: DocRecord, *, size: int, mtime_ns: int) -> None:
+        rel = record.path
+        self._delete(rel)
+        self.db.execute(
+            "INSERT INTO docs (path, sha256, size, mtime_ns, title, is_router, anchors_line) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (rel, record.sha256, size, mtime_ns, record.title, int(record.is_router), record.anchors_line),
+        )
+        self.db.executemany(
+            "INSERT INTO headings (path, line, level, text, slug) VALUES (?, ?, ?, ?, ?)",
+            [(rel, *h) for h in record.headings],
+        )
+        self.db.executemany(
+            "INSERT INTO toc_items (path, item_id, title) VALUES (?, ?, ?)", [(rel, *t) for t in record.toc_items]
+        )
+        self.db.executemany(
+            "INSERT INTO code_paths (path, line, token, in_anchors) VALUES (?, ?, ?, ?)",
+            [(rel, line, token, int(in_anchors)) for line, token, in_anchors in record.code_paths],
+        )
+        self.db.executemany(
+            "INSERT INTO links (path, line, href, target, fragment) VALUES (?, ?, ?, ?, ?)",
+            [(rel, *link) for link in record.links],
+        )
+
+    # -- queries ---------------------------------------------------------------------------------------------
+
+    def anchored_by(self, target: str) -> list[tuple[str, int]]:
+        """`(doc, line)` for every `## Ground truth anchors` entry citing `target`."""
+        return self.db.execute(
+            "SELECT path, line FROM code_paths WHERE token = ? AND in_anchors = 1 ORDER BY path, line", (target,)
+        ).fetchall()
+
+    def mentions(self, target: str) -> list[tuple[str, int]]:
+        """`(doc, line)` for every backticked mention of `target`, inside or outside the anchors section."""
+        return self.db.execute(
+            "SELECT path, line FROM code_paths WHERE token = ? ORDER BY path, line", (target,)
+        ).fetchall()
+
+    def routers(self) -> list[str]:
+        return [row[0] for row in self.db.execute("SELECT path FROM docs WHERE is_router = 1 ORDER BY path")]
+
+    def headings(self, text: str) -> list[tuple[str, int, int, str, str]]:
+        """`(doc, line, level, text, slug)` for headings whose text contains `text` (case-insensitive) or whose
+        slug is exactly `text`."""
+        return self.db.execute(
+            "SELECT path, line, level, text, slug FROM headings WHERE slug = ? OR text LIKE ? ESCAPE '\\' "
+            "ORDER BY path, line",
+            (text, "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"),
+        ).fetchall()
+
+    def links_to(self, target: str) -> list[tuple[str, int, str]]:
+        """`(doc, line, href)` for every Markdown link whose path resolves to `target` (with or without `.md`)."""
+        stem = target[: -len(".md")] if target.endswith(".md") else target
+        return self.db.execute(
+            "SELECT path, line, href FROM links WHERE target IN (?, ?, ?) ORDER BY path, line",
+            (target, stem, stem + ".md"),
+        ).fetchall()
+
+    def toc(self, doc: str) -> list[tuple[str, str | None]]:
+        return self.db.execute(
+            "SELECT item_id, title FROM toc_items WHERE path = ? ORDER BY rowid", (doc,)
+        ).fetchall()
+
+    def query(self, sql: str, params: tuple[object, ...] = ()) -> list[tuple[object, ...]]:
+        return self.db.execute(sql, params).fetchall()
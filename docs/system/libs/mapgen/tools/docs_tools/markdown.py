@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+
+BACKTICK_RE = re.compile(r"`([^`]+)`")
+FENCE_OPEN_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+# The normalizer's historical fence rule: any line whose first non-blank text is ``` toggles, at any indent.
+TOGGLE_FENCE_RE = re.compile(r"^\s*```")
+ATX_HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+
+
+def code_spans(text: str) -> list[str]:
+    """Contents of every single-backtick code span in `text`, unstripped."""
+    return BACKTICK_RE.findall(text)
+
+
+class FenceTracker:
+    """Line-at-a-time fenced code block state: ``` or ~~~ opens, and only a same-character marker at least as
+    long closes (so a ```` fence can show ``` examples).
+
+    With `toggle=True` every ``` line flips the state instead, at any indentation, and ~~~ is ignored. The link
+    normalizer keeps that rule so its rewrites stay byte-identical on docs that indent or nest fence markers.
+    """
+
+    def __init__(self, *, toggle: bool = False) -> None:
+        self.marker: str | None = None
+        self.toggle = toggle
+
+    @property
+    def inside(self) -> bool:
+        return self.marker is not None
+
+    def feed(self, line: str) -> str | None:
+        """Classify `line`: "open" / "close" for fence delimiters, "body" inside a fence, None outside."""
+        if self.toggle:
+            if TOGGLE_FENCE_RE.match(line):
+                self.marker = None if self.marker is not None else "```"
+                return "close" if self.marker is None else "open"
+            return "body" if self.marker is not None else None
+        m = FENCE_OPEN_RE.match(line)
+        if m:
+            marker = m.group(1)
+            if self.marker is None:
+                self.marker = marker[0] * len(marker)
+                return "open"
+            if marker.startswith(self.marker):
+                self.marker = None
+                return "close"
+        return "body" if self.marker is not None else None
+
+
+@dataclass(frozen=True)
+class Block:
+    """A run of lines of one kind: "heading" (one line), "fence" (delimiters included), "text" or "blank"."""
+
+    kind: str
+    # 1-based line number of the first line.
+    start: int
+    lines: tuple[str, ...]
+    # Heading level, or 0.
+    level: int = 0
+    # Heading text, or the fence info string.
+    info: str = ""
+
+
+def tokenize_blocks(lines: Iterable[str]) -> Iterator[Block]:
+    """Split Markdown lines into blocks; headings and blank lines are never recognized inside fences."""
+    fences = FenceTracker()
+    kind = ""
+    start = 0
+    run: list[str] = []
+    info = ""
+
+    def flush() -> Iterator[Block]:
+        if run:
+            yield Block(kind=kind, start=start, lines=tuple(run), info=info)
+
+    for lineno, line in enumerate(lines, start=1):
+        state = fences.feed(line)
+        if state == "open":
+            yield from flush()
+            kind, start, run, info = "fence", lineno, [line], FENCE_OPEN_RE.sub("", line, count=1).strip()
+            continue
+        if state is not None:
+            run.append(line)
+            if state == "close":
+                yield from flush()
+                kind, run, info = "", [], ""
+            continue
+
+        h = ATX_HEADING_RE.match(line)
+        if h:
+            yield from flush()
+            kind, run, info = "", [], ""
+            yield Block(kind="heading", start=lineno, lines=(line,), level=len(h.group(1)), info=h.group(2))
+            continue
+
+        line_kind = "blank" if not line.strip() else "text"
+        if line_kind != kind:
+            yield from flush()
+            kind, start, run, info = line_kind, lineno, [], ""
+        run.append(line)
+
+    # An unclosed fence runs to the end of the document.
+    yield from flush()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+
+ROUTER_TITLE_SUFFIX = "(legacy router)"
+ROUTER_PURPOSE_LINE = "This page exists only to preserve older links."
+
+
+def router_stub(*, title: str, replaced_by: list[str], archived_as: str) -> str:
+    """The legacy-router page left at an archived doc's old path, pointing at its canonical replacements."""
+    toc_items = "\n".join(
+        [
+            '  <item id="purpose" title="Purpose"/>',
+            '  <item id="replacements" title="Canonical replacements"/>',
+            '  <item id="archive" title="Legacy archive"/>',
+        ]
+    )
+    replaced_links = "\n".join([f"- `{p}`" for p in replaced_by]) if replaced_by else "- (none listed)"
+    return (
+        "<toc>\n"
+        f"{toc_items}\n"
+        "</toc>\n\n"
+        f"# {title} {ROUTER_TITLE_SUFFIX}\n\n"
+        "## Purpose\n\n"
+        f"{ROUTER_PURPOSE_LINE}\n"
+        "It is **not** canonical documentation.\n\n"
+        "## Canonical replacements\n\n"
+        f"{replaced_links}\n\n"
+        "## Legacy archive\n\n"
+        f"The previous contents of this page were moved to `{archived_as}`.\n"
+    )
+
+
+def looks_like_router_stub(text: str) -> bool:
+    return ROUTER_PURPOSE_LINE in text and ROUTER_TITLE_SUFFIX in text
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+
+DEFAULT_SYMBOL_CACHE_PATH = ".cache/mapgen-docs/ts-symbols.json"
+# Source trees whose `.ts`/`.tsx` files are indexed when docs cite them.
+SYMBOL_ROOTS = ("packages", "mods", "plugins")
+TS_SUFFIXES = (".ts", ".tsx")
+
+# One lexical token after optional whitespace: a comment, a quoted string, a template-literal opener, an
+# identifier, or any other single character. Regex literals are not recognized; they are rare enough in this tree
+# that treating them as punctuation costs nothing.
+TS_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (//[^\n]*|/\*.*?(?:\*/|\Z))
+      | '((?:\\.|[^'\\\n])*)'
+      | "((?:\\.|[^"\\\n])*)"
+      | (`)
+      | ([A-Za-z_$][\w$]*)
+      | (\S)
+    )""",
+    re.DOTALL | re.VERBOSE,
+)
+# Template-literal text up to the closing backtick or the next `${`.
+TEMPLATE_TEXT_RE = re.compile(r"(?:\\.|[^`\\$]|\$(?!\{))*", re.DOTALL)
+
+DECLARATION_KEYWORDS = frozenset({"function", "class", "interface", "type", "enum", "const", "let", "var", "namespace"})
+# Words that may sit between `export` and the declared name (`export default async function f`).
+EXPORT_MODIFIERS = frozenset({"default", "async", "declare", "abstract", "*"}) | DECLARATION_KEYWORDS
+
+
+@dataclass(frozen=True)
+class TsSymbols:
+    """What one TypeScript file defines and mentions, from a lexical scan.
+
+    `names` is every identifier outside comments plus the contents of every quoted string, so step ids and op
+    names written as string keys count as present.
+    """
+
+    declared: frozenset[str]
+    exported: frozenset[str]
+    names: frozenset[str]
+
+    def to_json(self) -> dict[str, list[str]]:
+        return {"declared": sorted(self.declared), "exported": sorted(self.exported), "names": sorted(self.names)}
+
+    @classmethod
+    def from_json(cls, data: dict[str, list[str]]) -> TsSymbols:
+        return cls(
+            declared=frozenset(data["declared"]), exported=frozenset(data["exported"]), names=frozenset(data["names"])
+        )
+
+
+def scan_ts(text: str) -> TsSymbols:
+    """Collect declared, exported and mentioned names without parsing: a single pass over `TS_TOKEN_RE` tokens."""
+    declared: set[str] = set()
+    exported: set[str] = set()
+    names: set[str] = set()
+
+    # Open `${...}` expressions, innermost last, each with its count of unclosed `{`.
+    templates: list[int] = []
+    prev = ""
+    exporting = False
+    export_list = False
+    renamed_from: str | None = None
+    pos = 0
+    in_template = False
+    size = len(text)
+    while pos < size:
+        if in_template:
+            pos = TEMPLATE_TEXT_RE.match(text, pos).end()
+            if text.startswith("${", pos):
+                templates.append(0)
+                pos += 2
+            else:
+                pos += 1
+            in_template = False
+            prev = ""
+            continue
+
+        m = TS_TOKEN_RE.match(text, pos)
+        if m is None or m.end() == pos:
+            break
+        pos = m.end()
+        comment, single, double, backtick, ident, punct = m.groups()
+        if comment is not None:
+            continue
+        if single is not None or double is not None:
+            names.add(single if single is not None else double)
+            prev = "'"
+            continue
+        if backtick is not None:
+            in_template = True
+            continue
+
+        if ident is not None:
+            names.add(ident)
+            if export_list:
+                # `export { a, b as c }`: `c` is the exported name.
+                if ident == "as":
+                    renamed_from = prev
+                else:
+                    if renamed_from is not None:
+                        exported.discard(renamed_from)
+                        renamed_from = None
+                    exported.add(ident)
+            elif prev in DECLARATION_KEYWORDS and ident not in EXPORT_MODIFIERS:
+                declared.add(ident)
+                if exporting:
+                    exported.add(ident)
+                exporting = False
+            elif ident == "export":
+                exporting = True
+            elif exporting and prev == "default" and ident not in EXPORT_MODIFIERS:
+                exported.add(ident)
+                exporting = False
+            elif ident not in EXPORT_MODIFIERS:
+                exporting = False
+            prev = ident
+            continue
+
+        if punct == "{":
+            if exporting and prev in ("export", "type"):
+                export_list = True
+            if templates:
+                templates[-1] += 1
+        elif punct == "}":
+            export_list = False
+            if templates:
+                if templates[-1] == 0:
+                    templates.pop()
+                    in_template = True
+                else:
+                    templates[-1] -= 1
+        if punct != "*":
+            exporting = exporting and export_list
+        if punct != "*" or prev != "function":
+            # `function* gen`: keep `function` as the previous token so `gen` still counts as declared.
+            prev = punct
+    return TsSymbols(declared=frozenset(declared), exported=frozenset(exported), names=frozenset(names))
+
+
+def scan_ts_file(path: Path) -> TsSymbols:
+    return scan_ts(path.read_bytes().decode("utf-8", errors="replace"))
+
+
+class SymbolIndex:
+    """Lexical symbol tables for cited TypeScript files, cached on disk by content hash.
+
+    Files are re-hashed only when their size or mtime changes, and re-scanned only when the hash is new, so a warm
+    run costs one `stat` per cited file. Cold scans run across worker processes.
+    """
+
+    # Bump whenever `scan_ts` changes what it extracts.
+    VERSION = 1
+
+    def __init__(self, *, repo_root: Path, cache_path: Path | None = None) -> None:
+        self.repo_root = repo_root
+        self.cache_path = cache_path
+        # rel -> [size, mtime_ns, sha256]
+        self.paths: dict[str, list[Any]] = {}
+        self.by_hash: dict[str, TsSymbols] = {}
+        self.files: dict[str, TsSymbols] = {}
+        self.scanned = 0
+        if cache_path is not None:
+            self._load(cache_path)
+
+    def _load(self, path: Path) -> None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.VERSION:
+            return
+        self.paths = data.get("paths", {})
+        self.by_hash = {sha: TsSymbols.from_json(entry) for sha, entry in data.get("symbols", {}).items()}
+
+    def save(self) -> None:
+        if self.cache_path is None:
+            return
+        # Keep only what this run used, so the cache does not grow with every edit.
+        live = {entry[2] for rel, entry in self.paths.items() if rel in self.files}
+        payload = {
+            "version": self.VERSION,
+            "paths": {rel: entry for rel, entry in self.paths.items() if rel in self.files},
+            "symbols": {sha: self.by_hash[sha].to_json() for sha in sorted(live)},
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
+
+    def build(self, rels: Iterable[str], *, jobs: int) -> None:
+        pending: dict[str, list[str]] = {}
+        for rel in sorted(set(rels) - set(self.files)):
+            path = self.repo_root / rel
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entry = self.paths.get(rel)
+            if entry is None or entry[:2] != [st.st_size, st.st_mtime_ns]:
+                try:
+                    sha = hashlib.sha256(path.read_bytes()).hexdigest()
+                except OSError:
+                    continue
+                entry = self.paths[rel] = [st.st_size, st.st_mtime_ns, sha]
+            symbols = self.by_hash.get(entry[2])
+            if symbols is None:
+                pending.setdefault(entry[2], []).append(rel)
+            else:
+                self.files[rel] = symbols
+
+        todo = [(sha, rels_[0]) for sha, rels_ in pending.items()]
+        paths = [self.repo_root / rel for _, rel in todo]
+        if jobs <= 1 or len(paths) <= 1:
+            results: Iterable[TsSymbols] = map(scan_ts_file, paths)
+            for (sha, _), symbols in zip(todo, results):
+                self.by_hash[sha] = symbols
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                chunksize = max(1, len(paths) // (jobs * 4))
+                for (sha, _), symbols in zip(todo, pool.map(scan_ts_file, paths, chunksize=chunksize)):
+                    self.by_hash[sha] = symbols
+        self.scanned += len(todo)
+        for sha, rels_ in pending.items():
+            for rel in rels_:
+                self.files[rel] = self.by_hash[sha]
+
+    def get(self, rel: str) -> TsSymbols | None:
+        return self.files.get(rel)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from docs_tools import find_repo_root
+from docs_tools.bundle import (
+    DEFAULT_BUNDLE_DIR,
+    DEFAULT_BUNDLE_ROOT,
+    DEFAULT_MAX_TOKENS,
+    DEFAULT_SPINE_START,
+    MANIFEST_NAME,
+    BundleBuilder,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Build an LLM context bundle of the canonical MapGen docs: pages in spine order (a breadth-first link "
+            "walk from the LLM entrypoint page), `<toc>` blocks removed, streamed into size-bounded Markdown chunks "
+            "with a JSON manifest. Only chunks whose source pages changed are rewritten."
+        )
+    )
+    parser.add_argument(
+        "--repo-root",
+        default="",
+        help="Repo root override (default: auto-detect from this script location).",
+    )
+    parser.add_argument("--root", default=DEFAULT_BUNDLE_ROOT, help=f"Docs tree to bundle (default: {DEFAULT_BUNDLE_ROOT}).")
+    parser.add_argument(
+        "--start",
+        default=DEFAULT_SPINE_START,
+        help=f"Spine entrypoint, repo-relative (default: {DEFAULT_SPINE_START}).",
+    )
+    parser.add_argument(
+        "--out",
+        default=DEFAULT_BUNDLE_DIR,
+        help=f"Output directory for chunks and {MANIFEST_NAME}, repo-relative (default: {DEFAULT_BUNDLE_DIR}).",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=DEFAULT_MAX_TOKENS,
+        help=f"Approximate token budget per chunk (default: {DEFAULT_MAX_TOKENS}).",
+    )
+    parser.add_argument(
+        "--include-research",
+        action="store_true",
+        help="Include docs under research/ (excluded by default, as in the validator).",
+    )
+    parser.add_argument(
+        "--include-adrs",
+        action="store_true",
+        help="Include docs under adrs/ (excluded by default, as in the validator).",
+    )
+    args = parser.parse_args(argv)
+
+    repo_root = Path(args.repo_root).resolve() if args.repo_root else find_repo_root(Path(__file__))
+    if not (repo_root / args.root).is_dir():
+        print(f"ERROR: docs root does not exist: {repo_root / args.root}", file=sys.stderr)
+        return 2
+    if args.max_tokens < 1024:
+        parser.error("--max-tokens must be at least 1024")
+
+    builder = BundleBuilder(
+        repo_root=repo_root,
+        root=args.root,
+        start=args.start,
+        out_dir=repo_root / args.out,
+        max_tokens=args.max_tokens,
+    )
+    if args.include_research:
+        builder.exclude_dirs.discard("research")
+    if args.include_adrs:
+        builder.exclude_dirs.discard("adrs")
+
+    started = time.perf_counter()
+    stats = builder.build()
+    print(
+        f"Bundled {stats.pages} pages into {stats.chunks} chunks under {args.out}: {stats.written} written, "
+        f"{stats.reused} unchanged, {stats.removed} removed; {stats.parsed} pages re-read "
+        f"({time.perf_counter() - started:.3f}s)."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
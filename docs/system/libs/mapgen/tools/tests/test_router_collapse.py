@@ -0,0 +1,115 @@
+"""Router hops come from a router's replacement links, never from its ground-truth anchors.
+
+Run: python -m unittest discover -s docs/system/libs/mapgen/tools/tests
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TOOLS_DIR))
+
+from docs_tools.cli import load_script  # noqa: E402
+
+validate = load_script(TOOLS_DIR / "validate-anchors-and-references.py")
+
+MAPGEN = "docs/system/libs/mapgen"
+NARRATIVE_ROUTER = f"{MAPGEN}/narrative.md"
+NARRATIVE = f"{MAPGEN}/reference/domains/NARRATIVE.md"
+GAMEPLAY = f"{MAPGEN}/reference/domains/GAMEPLAY.md"
+PROSE_ROUTER = f"{MAPGEN}/story.md"
+APPENDIX = "docs/projects/engine-refactor-v1/APPENDIX-SCOPE-AND-ABSORPTION.md"
+
+FILES = {
+    NARRATIVE_ROUTER: f"""# Narrative (legacy router)
+
+## Canonical replacements
+
+- [`{NARRATIVE}`](/{NARRATIVE[len("docs/"):]})
+
+## Legacy archive
+
+Moved to `{MAPGEN}/_archive/narrative.md`.
+""",
+    NARRATIVE: f"""# Narrative domain (legacy router)
+
+## Purpose
+
+Narrative is absorbed into Gameplay:
+
+[`{GAMEPLAY}`](/{GAMEPLAY[len("docs/"):]})
+
+## Ground truth anchors
+
+- Absorption posture: `{APPENDIX}`
+""",
+    PROSE_ROUTER: f"""# Story (legacy router)
+
+## Canonical replacements
+
+Superseded by the narrative router, `{NARRATIVE}`.
+""",
+    GAMEPLAY: "# Gameplay\n",
+    APPENDIX: "# Appendix\n",
+    f"{MAPGEN}/_archive/narrative.md": "# Narrative (archived)\n",
+}
+
+
+class RouterCollapseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        for rel, text in FILES.items():
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+
+    def test_anchors_are_not_hops(self) -> None:
+        routers = validate.RouterGraph(repo_root=self.root, path_index=None)
+        self.assertEqual(routers.targets(NARRATIVE), (GAMEPLAY,))
+        self.assertEqual(routers.resolve(NARRATIVE_ROUTER).finals, (GAMEPLAY,))
+
+    def test_collapse_lists_only_gameplay(self) -> None:
+        routers = validate.RouterGraph(repo_root=self.root, path_index=None)
+        self.assertTrue(routers.collapse(NARRATIVE_ROUTER))
+        scan = validate.scan_document(self.root / NARRATIVE_ROUTER)
+        self.assertEqual(scan.replacement_tokens, [GAMEPLAY])
+
+    def test_collapse_leaves_anchor_lines_alone(self) -> None:
+        routers = validate.RouterGraph(repo_root=self.root, path_index=None)
+        # NARRATIVE.md points straight at a final page, so there is nothing to collapse.
+        self.assertFalse(routers.collapse(NARRATIVE))
+        self.assertEqual((self.root / NARRATIVE).read_text(encoding="utf-8"), FILES[NARRATIVE])
+
+    def test_collapse_without_a_list_item_changes_nothing(self) -> None:
+        routers = validate.RouterGraph(repo_root=self.root, path_index=None)
+        path = self.root / PROSE_ROUTER
+        before = path.stat().st_mtime_ns
+        # The hop is mentioned in prose, not a list item, so the rewrite would not change a byte.
+        self.assertEqual(routers.resolve(PROSE_ROUTER).finals, (GAMEPLAY,))
+        self.assertFalse(routers.collapse(PROSE_ROUTER))
+        self.assertEqual(path.stat().st_mtime_ns, before)
+
+    def test_collapse_keeps_crlf(self) -> None:
+        path = self.root / NARRATIVE_ROUTER
+        path.write_bytes(FILES[NARRATIVE_ROUTER].replace("\n", "\r\n").encode("utf-8"))
+        routers = validate.RouterGraph(repo_root=self.root, path_index=None)
+        self.assertTrue(routers.collapse(NARRATIVE_ROUTER))
+        data = path.read_bytes()
+        self.assertIn(GAMEPLAY.encode("utf-8"), data)
+        self.assertEqual(data.count(b"\n"), data.count(b"\r\n"))
+
+    def test_router_marker_in_any_casing(self) -> None:
+        path = self.root / f"{MAPGEN}/mixed.md"
+        for marker in ("(legacy router)", "(Legacy Router)", "(LEGACY ROUTER)", "(Legacy rOuTeR)"):
+            path.write_text(f"Mixed\n\nThis page is a {marker}.\n", encoding="utf-8")
+            self.assertTrue(validate.scan_document(path).is_router, marker)
+
+
+if __name__ == "__main__":
+    unittest.main()
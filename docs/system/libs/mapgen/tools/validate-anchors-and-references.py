@@ -3,21 +3,75 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import contextlib
+import difflib
+import hashlib
+import heapq
+import json
+import mmap
+import os
 import re
+import select
+import struct
+import subprocess
 import sys
-from dataclasses import dataclass
+import time
+from array import array
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+from urllib.parse import unquote
+
+from docs_tools import (
+    ATX_HEADING_RE,
+    BACKTICK_RE,
+    FenceTracker,
+    PathIndex,
+    active_doc_cache,
+    find_repo_root,
+    iter_markdown_files,
+    stat_exists,
+)
+from docs_tools.ts_symbols import DEFAULT_SYMBOL_CACHE_PATH, SYMBOL_ROOTS, TS_SUFFIXES, SymbolIndex
 
 
 DEFAULT_DOC_ROOT = "docs/system/libs/mapgen"
 DEFAULT_EXCLUDE_DIRS = {"_archive", "adrs", "research"}
+DEFAULT_CACHE_PATH = ".cache/mapgen-docs/validate-anchors-and-references.json"
+DEFAULT_LINKS_ROOT = "docs"
 
-BACKTICK_RE = re.compile(r"`([^`]+)`")
 H1_RE = re.compile(r"^#\s+(.+?)\s*$")
 ANCHORS_H2_RE = re.compile(r"^##\s+Ground truth anchors\s*$", re.IGNORECASE)
+REPLACEMENTS_H2_RE = re.compile(r"^##\s+Canonical replacements?\s*$", re.IGNORECASE)
 HEADING_RE = re.compile(r"^#{1,6}\s+")
 
 LEGACY_ROUTER_RE = re.compile(r"\(legacy router\)", re.IGNORECASE)
+LIST_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+")
+TERM_DEF_RE = re.compile(r"^\s*-\s+\*\*`[^`]+`\*\*:", re.IGNORECASE)
+WORKSPACE_ALIAS = "@mapgen/"
+
+# Link graph (`--links`): Markdown links/reference definitions and the fragment ids they can target.
+MD_LINK_RE = re.compile(r"!?\[[^\]]*\]\(\s*(<[^>]*>|[^)\s]+)(?:\s+[\"'(][^)]*)?\)")
+MD_REF_DEF_RE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*(<[^>]*>|\S+)")
+INLINE_LINK_TEXT_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+CODE_SPAN_RE = re.compile(r"`+[^`]*`+")
+CUSTOM_HEADING_ID_RE = re.compile(r"\s*\{#([^}\s]+)\}\s*$")
+HTML_ID_RE = re.compile(r"<[A-Za-z][^>]*?\s(?:id|name)=[\"']([^\"']+)[\"']")
+URL_SCHEME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+FRAGMENT_LINE_RE = re.compile(r"^L\d+(?:C\d+)?(?:-L\d+(?:C\d+)?)?$")
+
+# Files at or above this size are scanned through a read-only mmap instead of one bulk read.
+MMAP_THRESHOLD_BYTES = 1 << 20
+
+# Line/column suffix of an anchor token: `#L12`, `#L12C3`, `:12` or `:12:3` (what `normalize_path_token` strips).
+LINE_REF_RE = re.compile(r"(?:#L(\d+)(?:C(\d+))?|:(\d+)(?::(\d+))?)$")
+
+# Backticked code symbols next to a `.ts`/`.tsx` anchor: `name`, `name(...)`, `ns.member` or a step id like
+# `plot-coasts`; only the leading name is looked up.
+SYMBOL_REF_RE = re.compile(r"^([A-Za-z_$][\w$]*(?:-[\w$]+)*)(?:\(.*\)|(?:\.[\w$]+)+(?:/[\w$]+)*)?$")
+NON_SYMBOL_WORDS = frozenset({"true", "false", "null", "undefined", "this"})
 
 # Heuristic: backticked tokens that look like repo-relative file paths.
 FILE_EXT_RE = re.compile(
@@ -25,6 +79,10 @@ FILE_EXT_RE = re.compile(
     re.IGNORECASE,
 )
 
+# `-z` entries of `git ls-tree -r` and `git ls-files --stage` as `(mode, object id, path)`, parsed in one pass.
+LS_TREE_ENTRY_RE = re.compile(r"(\d+) \w+ ([0-9a-f]+)\t([^\0]*)\0")
+LS_FILES_STAGE_ENTRY_RE = re.compile(r"(\d+) ([0-9a-f]+) \d\t([^\0]*)\0")
+
 
 @dataclass(frozen=True)
 class Finding:
@@ -33,21 +91,180 @@ class Finding:
     message: str
 
 
-def find_repo_root(start: Path) -> Path:
-    start = start.resolve()
-    for candidate in (start, *start.parents):
-        if (candidate / ".git").exists():
-            return candidate
-    raise RuntimeError("Could not locate repo root (no .git found in parents).")
+@dataclass(frozen=True)
+class FileCheck:
+    findings: list[Finding]
+    # Every anchor/router token that was checked, mapped to whether it existed.
+    targets: dict[str, bool]
+    sha256: str
+    # Per-phase `[seconds, calls]` (plus a "total" entry) when checked with profiling on.
+    timings: dict[str, list[float]] | None = None
+    # Content key (see `LineIndex`) of every file whose line ranges were checked.
+    line_targets: dict[str, str] = field(default_factory=dict)
+    # `(cited .ts/.tsx files that exist under SYMBOL_ROOTS, backticked symbol)` pairs from the anchors section.
+    symbol_refs: list[tuple[tuple[str, ...], str]] = field(default_factory=list)
 
 
-def iter_markdown_files(doc_root: Path, exclude_dirs: set[str]) -> list[Path]:
-    files: list[Path] = []
-    for path in doc_root.rglob("*.md"):
-        if any(part in exclude_dirs for part in path.parts):
-            continue
-        files.append(path)
-    return sorted(files)
+@dataclass
+class DocScan:
+    """Everything the rules need from one document, gathered by `scan_document` in a single pass.
+
+    New rules should add a field here and a line rule to `LINE_RULES` rather than re-reading the file.
+    """
+
+    sha256: str = ""
+    has_workspace_alias: bool = False
+    has_term_definition: bool = False
+    h1_title: str | None = None
+    is_router: bool = False
+    # Lines under the first `## Ground truth anchors` heading (None when the section is absent).
+    anchors_section: list[str] | None = None
+    # `(enclosing H2 heading line or None, raw line)` for lines containing a backtick; file tokens are extracted
+    # from them only when a router needs them.
+    backtick_lines: list[tuple[str | None, str]] = field(default_factory=list)
+    # Backticked file-path tokens inside the anchors section.
+    anchor_tokens: list[str] = field(default_factory=list)
+    # `(raw token, file path, line, column or None)` for anchors-section tokens with a line suffix.
+    anchor_line_refs: list[tuple[str, str, int, int | None]] = field(default_factory=list)
+    # `(.ts/.tsx paths on the line, backticked symbol)` for anchors-section lines that cite TypeScript files.
+    anchor_symbol_refs: list[tuple[tuple[str, ...], str]] = field(default_factory=list)
+    anchors_open: bool = field(default=False, repr=False)
+    h2: str | None = field(default=None, repr=False)
+
+    @property
+    def file_tokens(self) -> list[str]:
+        """Backticked file-path tokens anywhere in the doc."""
+        return extract_backticked_file_paths([line for _, line in self.backtick_lines])
+
+    @property
+    def replacement_tokens(self) -> list[str]:
+        """File tokens a router points at: its `## Canonical replacements` section when it has one, otherwise
+        every backticked path outside `## Ground truth anchors` (which lists evidence, not replacements)."""
+        if any(h2 is not None and REPLACEMENTS_H2_RE.match(h2) for h2, _ in self.backtick_lines):
+            lines = [line for h2, line in self.backtick_lines if h2 is not None and REPLACEMENTS_H2_RE.match(h2)]
+        else:
+            lines = [line for h2, line in self.backtick_lines if h2 is None or not ANCHORS_H2_RE.match(h2)]
+        return extract_backticked_file_paths(lines)
+
+
+class RevisionIndex(PathIndex):
+    """Path index for a git revision, built from `git ls-tree`; never consults the worktree."""
+
+    def __init__(self, *, repo_root: Path, rev: str, files: dict[str, tuple[str, str]], reader: GitBlobReader) -> None:
+        # Only files up front; a directory is confirmed on first lookup (`_is_dir`), so a `--staged` run checking a
+        # handful of docs does not expand every parent of every tracked file.
+        super().__init__(repo_root=repo_root, paths=set(files))
+        self.rev = rev
+        # rel -> (mode, object id)
+        self.files = files
+        self.reader = reader
+        self._sorted_files: list[str] | None = None
+        self._dirs: dict[str, bool] = {}
+
+    @classmethod
+    def from_rev(cls, repo_root: Path, rev: str, reader: GitBlobReader) -> RevisionIndex:
+        out = subprocess.run(
+            ["git", "-C", str(repo_root), "ls-tree", "-r", "-z", "--full-tree", rev],
+            check=True,
+            capture_output=True,
+        ).stdout
+        # `<mode> <type> <object>\t<path>`
+        files = {rel: (mode, oid) for mode, oid, rel in LS_TREE_ENTRY_RE.findall(os.fsdecode(out))}
+        return cls(repo_root=repo_root, rev=rev, files=files, reader=reader)
+
+    @classmethod
+    def from_index(cls, repo_root: Path, reader: GitBlobReader) -> RevisionIndex:
+        """Index the staging area (what the next commit would contain) rather than a commit."""
+        out = subprocess.run(
+            ["git", "-C", str(repo_root), "ls-files", "--stage", "-z"],
+            check=True,
+            capture_output=True,
+        ).stdout
+        # `<mode> <object> <stage>\t<path>`; keep the first stage seen for conflicted paths.
+        files: dict[str, tuple[str, str]] = {}
+        for mode, oid, rel in LS_FILES_STAGE_ENTRY_RE.findall(os.fsdecode(out)):
+            files.setdefault(rel, (mode, oid))
+        return cls(repo_root=repo_root, rev=":0", files=files, reader=reader)
+
+    def read(self, rel: str) -> bytes:
+        return self.reader.read(self.files[rel][1])
+
+    def _resolve(self, rel: str, depth: int = 0) -> str | None:
+        # Follow in-tree symlinks the way `Path.exists()` would on a checkout of this revision.
+        entry = self.files.get(rel)
+        if entry is None or entry[0] != "120000":
+            return rel if entry is not None or self._is_dir(rel) else None
+        if depth > 40:
+            return None
+        link = os.fsdecode(self.reader.read(entry[1]))
+        if os.path.isabs(link):
+            return None
+        target = os.path.normpath(os.path.join(os.path.dirname(rel), link))
+        return None if target.startswith("..") else self._resolve(target, depth + 1)
+
+    def _is_dir(self, rel: str) -> bool:
+        known = self._dirs.get(rel)
+        if known is None:
+            if self._sorted_files is None:
+                self._sorted_files = sorted(self.files)
+            prefix = rel + "/"
+            i = bisect.bisect_left(self._sorted_files, prefix)
+            known = self._dirs[rel] = i < len(self._sorted_files) and self._sorted_files[i].startswith(prefix)
+        return known
+
+    def exists(self, token: str) -> bool:
+        if os.path.isabs(token):
+            try:
+                token = os.path.relpath(token, self.repo_root)
+            except ValueError:
+                return False
+        rel = os.path.normpath(token)
+        if rel.startswith(".."):
+            return False
+        parent = os.path.dirname(rel)
+        if parent and self._resolve(parent) is None:
+            return False
+        return self._resolve(rel) is not None
+
+    def markdown_files(self, doc_root: Path, exclude_dirs: set[str]) -> list[Path]:
+        if any(part in exclude_dirs for part in doc_root.parts):
+            return []
+        prefix = os.path.relpath(doc_root, self.repo_root) + "/"
+        out: list[Path] = []
+        for rel, (mode, _oid) in self.files.items():
+            if not rel.startswith(prefix) or not rel.endswith(".md") or mode == "120000":
+                continue
+            if any(part in exclude_dirs for part in rel[len(prefix) :].split("/")[:-1]):
+                continue
+            out.append(self.repo_root / rel)
+        return sorted(out)
+
+
+class GitBlobReader:
+    """Reads blobs through one long-lived `git cat-file --batch` process."""
+
+    def __init__(self, repo_root: Path) -> None:
+        self.proc = subprocess.Popen(
+            ["git", "-C", str(repo_root), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, oid: str) -> bytes:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self.proc.stdin.write(oid.encode("ascii") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(f"git object not found: {oid}")
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            self.proc.stdin.close()
+        self.proc.wait()
 
 
 def normalize_path_token(token: str) -> str | None:
@@ -82,6 +299,34 @@ def extract_backticked_file_paths(lines: list[str]) -> list[str]:
     return out
 
 
+def extract_backticked_line_refs(lines: list[str]) -> list[tuple[str, str, int, int | None]]:
+    """`(raw token, file path, line, column or None)` for every backticked file path carrying a line suffix."""
+    out: list[tuple[str, str, int, int | None]] = []
+    for line in lines:
+        for m in BACKTICK_RE.finditer(line):
+            raw = m.group(1).strip()
+            ref = LINE_REF_RE.search(raw)
+            if ref is None:
+                continue
+            normalized = normalize_path_token(raw)
+            if normalized:
+                col = ref.group(2) or ref.group(4)
+                out.append((raw, normalized, int(ref.group(1) or ref.group(3)), int(col) if col else None))
+    return out
+
+
+def extract_backticked_symbols(line: str) -> list[str]:
+    """Backticked tokens on `line` that read as code symbols rather than paths, files or literals."""
+    out: list[str] = []
+    for m in BACKTICK_RE.finditer(line):
+        token = m.group(1).strip()
+        if normalize_path_token(token) or FILE_EXT_RE.search(token) or token.endswith(".jsonl"):
+            continue
+        if SYMBOL_REF_RE.match(token) and token not in NON_SYMBOL_WORDS:
+            out.append(token)
+    return out
+
+
 def is_legacy_router(text: str) -> bool:
     # Prefer the title check, but fall back to any mention (routers are short).
     m = H1_RE.search(text)
@@ -90,6 +335,181 @@ def is_legacy_router(text: str) -> bool:
     return bool(LEGACY_ROUTER_RE.search(text))
 
 
+def _iter_doc_lines(file_path: Path, digest: Any) -> Iterator[str]:
+    # Yields exactly what `read_text(errors="replace").splitlines()` would, hashing the raw bytes on the way.
+    with file_path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < MMAP_THRESHOLD_BYTES:
+            data = fh.read()
+            digest.update(data)
+            yield from data.decode("utf-8", errors="replace").splitlines()
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                digest.update(raw)
+                # `\n` never occurs inside a UTF-8 sequence, so per-line decoding matches a whole-file decode.
+                yield from raw.decode("utf-8", errors="replace").splitlines()
+
+
+def _scan_alias(scan: DocScan, line: str) -> None:
+    if not scan.has_workspace_alias and WORKSPACE_ALIAS in line:
+        scan.has_workspace_alias = True
+
+
+def _scan_term_definition(scan: DocScan, line: str) -> None:
+    if not scan.has_term_definition and TERM_DEF_RE.match(line):
+        scan.has_term_definition = True
+
+
+def _scan_router_marker(scan: DocScan, line: str) -> None:
+    if scan.h1_title is None:
+        m = H1_RE.match(line)
+        if m:
+            scan.h1_title = m.group(1)
+    if not scan.is_router and LEGACY_ROUTER_RE.search(line):
+        scan.is_router = True
+
+
+def _scan_anchors(scan: DocScan, line: str) -> None:
+    if line.startswith("## "):
+        scan.h2 = line.strip()
+    if "`" in line:
+        scan.backtick_lines.append((scan.h2, line))
+
+    if scan.anchors_section is None:
+        if ANCHORS_H2_RE.match(line.strip()):
+            scan.anchors_section = []
+            scan.anchors_open = True
+        return
+    if scan.anchors_open:
+        if HEADING_RE.match(line):
+            scan.anchors_open = False
+        else:
+            scan.anchors_section.append(line)
+            tokens = extract_backticked_file_paths([line]) if "`" in line else []
+            scan.anchor_tokens.extend(tokens)
+            if tokens and ("#L" in line or ":" in line):
+                scan.anchor_line_refs.extend(extract_backticked_line_refs([line]))
+            ts_tokens = tuple(t for t in tokens if t.endswith(TS_SUFFIXES))
+            if ts_tokens and line.count("`") > 2 * len(tokens):
+                scan.anchor_symbol_refs.extend((ts_tokens, symbol) for symbol in extract_backticked_symbols(line))
+
+
+@dataclass(frozen=True)
+class LineRule:
+    """A per-line rule and the lines it can act on; `scan_document` never dispatches it on any other line."""
+
+    # Doubles as the `--profile` phase label.
+    name: str
+    fn: Callable[[DocScan, str], None]
+    # Substrings every line the rule can match contains at least one of (plain `in` checks beat a regex here).
+    needles: tuple[str, ...]
+    # Also dispatched on every line while the anchors section is open.
+    in_anchors: bool = False
+    # Needles with letters are lower-case and tested against the lower-cased line, for rules whose regex is
+    # case-insensitive. Each needs a caseless character (e.g. `)`) so most lines are rejected before `lower()`.
+    fold_case: bool = False
+
+    def split_needles(self) -> tuple[tuple[str, ...], tuple[tuple[str, str], ...]]:
+        """`(needles tested as-is, (caseless guard, needle) pairs tested against the lower-cased line)`."""
+        if not self.fold_case:
+            return self.needles, ()
+        plain = tuple(n for n in self.needles if n.lower() == n.upper())
+        folded = tuple((next(c for c in n if c.lower() == c.upper()), n) for n in self.needles if n not in plain)
+        return plain, folded
+
+
+# Per-line rules run by `scan_document`, in order.
+LINE_RULES: tuple[LineRule, ...] = (
+    LineRule("alias scan", _scan_alias, (WORKSPACE_ALIAS,)),
+    LineRule("term scan", _scan_term_definition, ("**`",)),
+    # Headings for the H1 title, and the `(legacy router)` marker in any casing.
+    LineRule("router check", _scan_router_marker, ("#", "router)"), fold_case=True),
+    LineRule("anchors extraction", _scan_anchors, ("#", "`"), in_anchors=True),
+)
+_SPLIT_NEEDLES = [rule.split_needles() for rule in LINE_RULES]
+# Lines containing none of these (most prose) skip every rule; a needle containing another one adds nothing.
+_NEEDLES = {n for plain, _folded in _SPLIT_NEEDLES for n in plain}
+LINE_TRIGGERS = tuple(sorted(n for n in _NEEDLES if not any(o != n and o in n for o in _NEEDLES)))
+# `(guard, needle)`: tested only when no `LINE_TRIGGERS` matched, lower-casing the line only if the guard is in it.
+FOLDED_LINE_TRIGGERS = tuple(sorted({pair for _plain, folded in _SPLIT_NEEDLES for pair in folded}))
+
+
+def _timed(name: str, fn: Callable[..., Any], timings: dict[str, list[float]]) -> Callable[..., Any]:
+    def run(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            acc = timings.setdefault(name, [0.0, 0])
+            acc[0] += time.perf_counter() - started
+            acc[1] += 1
+
+    return run
+
+
+def scan_document(
+    file_path: Path, *, timings: dict[str, list[float]] | None = None, data: bytes | None = None
+) -> DocScan:
+    """Scan `file_path`, or `data` when the content does not come from the worktree (e.g. a git blob)."""
+    scan = DocScan()
+    digest = hashlib.sha256()
+    lines: Iterable[str]
+    cache = active_doc_cache() if data is None else None
+    if cache is not None:
+        # `docs-tools check`: the doc is read once and shared with the other tools in this interpreter.
+        data = cache.get(file_path).data
+    if data is None:
+        lines = _iter_doc_lines(file_path, digest)
+    else:
+        digest.update(data)
+        lines = data.decode("utf-8", errors="replace").splitlines()
+    rules = [(plain, folded, rule.in_anchors, rule.fn) for rule, (plain, folded) in zip(LINE_RULES, _SPLIT_NEEDLES)]
+
+    if timings is not None:
+        # Profiling materializes the lines so read/decode time is not smeared across the rules.
+        lines = _timed("read", lambda: list(lines), timings)()
+        rules = [
+            (plain, folded, in_anchors, _timed(rule.name, fn, timings))
+            for (plain, folded, in_anchors, fn), rule in zip(rules, LINE_RULES)
+        ]
+
+    for line in lines:
+        lowered: str | None = None
+        if not scan.anchors_open:
+            for needle in LINE_TRIGGERS:
+                if needle in line:
+                    break
+            else:
+                for guard, needle in FOLDED_LINE_TRIGGERS:
+                    if guard in line:
+                        if lowered is None:
+                            lowered = line.lower()
+                        if needle in lowered:
+                            break
+                else:
+                    continue
+        for needles, folded, in_anchors, rule in rules:
+            if in_anchors and scan.anchors_open:
+                rule(scan, line)
+                continue
+            for needle in needles:
+                if needle in line:
+                    rule(scan, line)
+                    break
+            else:
+                for guard, needle in folded:
+                    if guard in line:
+                        if lowered is None:
+                            lowered = line.lower()
+                        if needle in lowered:
+                            rule(scan, line)
+                            break
+
+    scan.sha256 = digest.hexdigest()
+    return scan
+
+
 def anchors_section_lines(lines: list[str]) -> list[str] | None:
     start_idx: int | None = None
     for idx, line in enumerate(lines):
@@ -107,20 +527,151 @@ def anchors_section_lines(lines: list[str]) -> list[str] | None:
     return section
 
 
+def _target_exists(repo_root: Path, token: str, path_index: PathIndex | None) -> bool:
+    if path_index is not None:
+        return path_index.exists(token)
+    return stat_exists(repo_root, token)
+
+
+class LineIndex:
+    """Line-start offsets of the files cited with `#L<n>` / `:<n>` anchors, built once per distinct content.
+
+    Newlines are found by scanning a read-only mmap of each file, and offsets are stored as a compact array keyed
+    by content hash (sha256 for the worktree; the blob id when `read_blob` serves a git revision), so thousands of
+    line anchors cost one scan per distinct target file. Worktree entries are revalidated by stat, so edits made
+    during `--watch` are picked up.
+    """
+
+    def __init__(self, *, repo_root: Path, read_blob: Callable[[str], tuple[str, bytes] | None] | None = None) -> None:
+        self.repo_root = repo_root
+        self.read_blob = read_blob
+        # rel -> (size, mtime_ns, content key or None when the path is not a readable regular file)
+        self.paths: dict[str, tuple[int, int, str | None]] = {}
+        # content key -> (line-start offsets, content size)
+        self.offsets: dict[str, tuple[array, int]] = {}
+
+    @staticmethod
+    def _line_starts(buf: Any) -> array:
+        starts = array("Q", [0])
+        pos = buf.find(b"\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = buf.find(b"\n", pos + 1)
+        return starts
+
+    def _index_bytes(self, key: str, data: bytes) -> str:
+        if key not in self.offsets:
+            self.offsets[key] = (self._line_starts(data), len(data))
+        return key
+
+    def key(self, rel: str) -> str | None:
+        """Content key of `rel`, scanning it on first sight; None if it cannot be read as a file."""
+        if self.read_blob is not None:
+            memo = self.paths.get(rel)
+            if memo is None:
+                blob = self.read_blob(rel)
+                key = None if blob is None else self._index_bytes(blob[0], blob[1])
+                memo = self.paths[rel] = (0, 0, key)
+            return memo[2]
+
+        path = self.repo_root / rel
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        memo = self.paths.get(rel)
+        if memo is not None and memo[:2] == (st.st_size, st.st_mtime_ns):
+            return memo[2]
+        key: str | None = None
+        try:
+            with path.open("rb") as fh:
+                if st.st_size == 0:
+                    key = self._index_bytes(hashlib.sha256(b"").hexdigest(), b"")
+                else:
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        key = hashlib.sha256(mm).hexdigest()
+                        if key not in self.offsets:
+                            self.offsets[key] = (self._line_starts(mm), len(mm))
+        except (OSError, ValueError):
+            key = None
+        self.paths[rel] = (st.st_size, st.st_mtime_ns, key)
+        return key
+
+    def check(self, rel: str, line: int, col: int | None) -> str | None:
+        """Why `line`/`col` (1-based; columns in bytes) falls outside `rel`, or None when it is in range."""
+        key = self.key(rel)
+        if key is None:
+            return None
+        starts, size = self.offsets[key]
+        # A trailing newline ends the last line rather than starting an empty one.
+        n_lines = len(starts) - 1 if starts[-1] == size else len(starts)
+        if line < 1 or line > n_lines:
+            return f"`{rel}` has {n_lines} lines"
+        if col is not None:
+            end = starts[line] - 1 if line < len(starts) else size
+            width = end - starts[line - 1]
+            # Columns may point one past the last character.
+            if col < 1 or col > width + 1:
+                return f"line {line} of `{rel}` has {width} columns"
+        return None
+
+
 def check_file(
     *,
     file_path: Path,
     repo_root: Path,
     forbid_workspace_aliases: bool,
     strict_terms: bool,
+    path_index: PathIndex | None = None,
+    line_index: LineIndex | None = None,
 ) -> list[Finding]:
+    return _check_file(
+        file_path=file_path,
+        repo_root=repo_root,
+        forbid_workspace_aliases=forbid_workspace_aliases,
+        strict_terms=strict_terms,
+        path_index=path_index,
+        line_index=line_index,
+    ).findings
+
+
+def _check_file(
+    *,
+    file_path: Path,
+    repo_root: Path,
+    forbid_workspace_aliases: bool,
+    strict_terms: bool,
+    path_index: PathIndex | None = None,
+    line_index: LineIndex | None = None,
+    profile: bool = False,
+    scan: DocScan | None = None,
+) -> FileCheck:
+    started = time.perf_counter()
     findings: list[Finding] = []
+    targets: dict[str, bool] = {}
+    line_targets: dict[str, str] = {}
+    symbol_refs: list[tuple[tuple[str, ...], str]] = []
     rel = file_path.relative_to(repo_root)
 
-    text = file_path.read_text(encoding="utf-8", errors="replace")
-    lines = text.splitlines()
+    timings: dict[str, list[float]] | None = {} if profile else None
+    target_exists = _target_exists if timings is None else _timed("existence checks", _target_exists, timings)
+
+    if scan is None:
+        scan = scan_document(file_path, timings=timings)
+
+    def done() -> FileCheck:
+        if timings is not None:
+            timings["total"] = [time.perf_counter() - started, 1]
+        return FileCheck(
+            findings=findings,
+            targets=targets,
+            sha256=scan.sha256,
+            timings=timings,
+            line_targets=line_targets,
+            symbol_refs=symbol_refs,
+        )
 
-    if forbid_workspace_aliases and "@mapgen/" in text:
+    if forbid_workspace_aliases and scan.has_workspace_alias:
         findings.append(
             Finding(
                 severity="error",
@@ -128,7 +679,7 @@ def check_file(
                 message="Found workspace-only alias '@mapgen/*' in canonical docs; prefer published entrypoints (see policies).",
             )
         )
-    elif "@mapgen/" in text:
+    elif scan.has_workspace_alias:
         findings.append(
             Finding(
                 severity="warning",
@@ -137,26 +688,21 @@ def check_file(
             )
         )
 
-    if file_path.name.upper() != "GLOSSARY.MD":
-        # Light heuristic: discourage local term re-definition patterns.
-        term_def_re = re.compile(r"^\s*-\s+\*\*`[^`]+`\*\*:", re.IGNORECASE)
-        if any(term_def_re.match(line) for line in lines):
-            findings.append(
-                Finding(
-                    severity="error" if strict_terms else "warning",
-                    file=rel,
-                    message="Local term definition detected (use reference/GLOSSARY.md as the single source of truth).",
-                )
+    # Light heuristic: discourage local term re-definition patterns.
+    if file_path.name.upper() != "GLOSSARY.MD" and scan.has_term_definition:
+        findings.append(
+            Finding(
+                severity="error" if strict_terms else "warning",
+                file=rel,
+                message="Local term definition detected (use reference/GLOSSARY.md as the single source of truth).",
             )
+        )
 
-    if is_legacy_router(text):
+    if scan.is_router:
         # Routers don't require a Ground truth anchors section, but their replacement pointers must exist.
-        file_tokens = extract_backticked_file_paths(lines)
-        for token in sorted(set(file_tokens)):
-            target = Path(token)
-            if not target.is_absolute():
-                target = repo_root / target
-            if not target.exists():
+        for token in sorted(set(scan.file_tokens)):
+            targets[token] = target_exists(repo_root, token, path_index)
+            if not targets[token]:
                 findings.append(
                     Finding(
                         severity="error",
@@ -164,14 +710,12 @@ def check_file(
                         message=f"Broken router target: `{token}` does not exist.",
                     )
                 )
-        return findings
+        return done()
 
-    section = anchors_section_lines(lines)
-    if section is None:
-        return findings
+    if scan.anchors_section is None:
+        return done()
 
-    anchor_tokens = extract_backticked_file_paths(section)
-    if not anchor_tokens:
+    if not scan.anchor_tokens:
         findings.append(
             Finding(
                 severity="warning",
@@ -179,13 +723,11 @@ def check_file(
                 message="No file path anchors found under 'Ground truth anchors' section.",
             )
         )
-        return findings
+        return done()
 
-    for token in sorted(set(anchor_tokens)):
-        target = Path(token)
-        if not target.is_absolute():
-            target = repo_root / target
-        if not target.exists():
+    for token in sorted(set(scan.anchor_tokens)):
+        targets[token] = target_exists(repo_root, token, path_index)
+        if not targets[token]:
             findings.append(
                 Finding(
                     severity="error",
@@ -194,9 +736,1097 @@ def check_file(
                 )
             )
 
+    for ts_tokens, symbol in scan.anchor_symbol_refs:
+        cited = tuple(t for t in ts_tokens if targets.get(t) and t.split("/", 1)[0] in SYMBOL_ROOTS)
+        if cited:
+            symbol_refs.append((cited, symbol))
+
+    if line_index is not None:
+        check_line = line_index.check if timings is None else _timed("line ranges", line_index.check, timings)
+        for raw, token, line, col in scan.anchor_line_refs:
+            if not targets.get(token):
+                continue
+            problem = check_line(token, line, col)
+            key = line_index.key(token)
+            if key is not None:
+                line_targets[token] = key
+            if problem is not None:
+                findings.append(
+                    Finding(
+                        severity="error",
+                        file=rel,
+                        message=f"Anchor line out of range: `{raw}` ({problem}).",
+                    )
+                )
+
+    return done()
+
+
+class FindingsCache:
+    """Persistent per-file findings, keyed by content hash, rule flags and anchor-target existence.
+
+    Entries are keyed by repo-relative path so a cache file exported from one checkout can warm another.
+    """
+
+    # Bump whenever rule behaviour changes so stale findings are never replayed.
+    VERSION = 3
+
+    def __init__(self, *, flags: str) -> None:
+        self.flags = flags
+        self.entries: dict[str, dict[str, Any]] = {}
+        # Docs looked up or stored this run; `save` drops every other entry.
+        self.seen: set[str] = set()
+
+    def load(self, path: Path) -> None:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.VERSION or data.get("flags") != self.flags:
+            return
+        self.entries.update(data.get("entries", {}))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Keep only the docs this run checked, so entries for deleted or renamed docs do not pile up.
+        entries = {rel: entry for rel, entry in self.entries.items() if rel in self.seen}
+        payload = {"version": self.VERSION, "flags": self.flags, "entries": entries}
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def lookup(
+        self,
+        *,
+        file_path: Path,
+        repo_root: Path,
+        path_index: PathIndex | None = None,
+        line_index: LineIndex | None = None,
+    ) -> FileCheck | None:
+        rel = file_path.relative_to(repo_root)
+        self.seen.add(str(rel))
+        entry = self.entries.get(str(rel))
+        if entry is None:
+            return None
+
+        st = file_path.stat()
+        if (entry["size"], entry["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+            # Stat drift alone (checkout, touch, imported cache) is not a change; fall back to the hash.
+            if entry["sha256"] != _sha256_file(file_path):
+                return None
+            entry["size"], entry["mtime_ns"] = st.st_size, st.st_mtime_ns
+
+        for token, existed in entry["targets"].items():
+            if _target_exists(repo_root, token, path_index) != existed:
+                return None
+
+        # Line-anchored files are keyed by content, not existence: any edit may move the cited lines.
+        line_targets = entry["line_targets"]
+        if line_targets and (
+            line_index is None or any(line_index.key(token) != key for token, key in line_targets.items())
+        ):
+            return None
+
+        return FileCheck(
+            findings=[Finding(severity=sev, file=rel, message=msg) for sev, msg in entry["findings"]],
+            targets=dict(entry["targets"]),
+            sha256=entry["sha256"],
+            line_targets=dict(line_targets),
+            symbol_refs=[(tuple(files), symbol) for files, symbol in entry["symbol_refs"]],
+        )
+
+    def store(self, *, file_path: Path, repo_root: Path, result: FileCheck) -> None:
+        st = file_path.stat()
+        rel = str(file_path.relative_to(repo_root))
+        self.seen.add(rel)
+        self.entries[rel] = {
+            "sha256": result.sha256,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "targets": result.targets,
+            "line_targets": result.line_targets,
+            "symbol_refs": [[list(files), symbol] for files, symbol in result.symbol_refs],
+            "findings": [[f.severity, f.message] for f in result.findings],
+        }
+
+
+def _sha256_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+# This run's `_check_file` partial inside a worker process, installed once per worker by `_init_check_worker` so
+# the path and line indexes it carries are pickled once per process rather than with every chunk of docs.
+_WORKER_CHECK: partial[FileCheck] | None = None
+
+
+def _init_check_worker(check: partial[FileCheck]) -> None:
+    global _WORKER_CHECK
+    _WORKER_CHECK = check
+
+
+def _check_in_worker(file_path: Path) -> FileCheck:
+    assert _WORKER_CHECK is not None
+    return _WORKER_CHECK(file_path=file_path)
+
+
+def check_file_results(
+    *,
+    md_files: list[Path],
+    repo_root: Path,
+    forbid_workspace_aliases: bool,
+    strict_terms: bool,
+    jobs: int,
+    cache: FindingsCache | None = None,
+    path_index: PathIndex | None = None,
+    line_index: LineIndex | None = None,
+    profile: bool = False,
+) -> dict[Path, FileCheck]:
+    check = partial(
+        _check_file,
+        repo_root=repo_root,
+        forbid_workspace_aliases=forbid_workspace_aliases,
+        strict_terms=strict_terms,
+        path_index=path_index,
+        line_index=line_index,
+        profile=profile,
+    )
+
+    per_file: dict[Path, FileCheck] = {}
+    pending: list[Path] = []
+    for file_path in md_files:
+        cached = (
+            cache.lookup(file_path=file_path, repo_root=repo_root, path_index=path_index, line_index=line_index)
+            if cache
+            else None
+        )
+        if cached is None:
+            pending.append(file_path)
+        else:
+            per_file[file_path] = cached
+
+    if jobs <= 1 or len(pending) <= 1:
+        results = (check(file_path=file_path) for file_path in pending)
+        pool = None
+    else:
+        # Imported here: `concurrent.futures.process` alone costs ~30ms, which a serial or `--staged` run never needs.
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(pending) // (jobs * 4))
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_check_worker, initargs=(check,))
+        results = pool.map(_check_in_worker, pending, chunksize=chunksize)
+    try:
+        for file_path, result in zip(pending, results):
+            per_file[file_path] = result
+            if cache is not None:
+                cache.store(file_path=file_path, repo_root=repo_root, result=result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Re-key in discovery order so output matches a cold serial run.
+    return {file_path: per_file[file_path] for file_path in md_files}
+
+
+def check_files(
+    *,
+    md_files: list[Path],
+    repo_root: Path,
+    forbid_workspace_aliases: bool,
+    strict_terms: bool,
+    jobs: int,
+    cache: FindingsCache | None = None,
+    path_index: PathIndex | None = None,
+    line_index: LineIndex | None = None,
+) -> list[Finding]:
+    results = check_file_results(
+        md_files=md_files,
+        repo_root=repo_root,
+        forbid_workspace_aliases=forbid_workspace_aliases,
+        strict_terms=strict_terms,
+        jobs=jobs,
+        cache=cache,
+        path_index=path_index,
+        line_index=line_index,
+    )
+    findings: list[Finding] = []
+    for result in results.values():
+        findings.extend(result.findings)
+    return findings
+
+
+def check_anchor_symbols(
+    *, results: dict[Path, FileCheck], repo_root: Path, symbols: SymbolIndex, jobs: int
+) -> list[Finding]:
+    """Flag anchors-section symbols that no longer appear in any `.ts`/`.tsx` file cited on the same line.
+
+    Only files under `SYMBOL_ROOTS` are indexed; a symbol passes when the cited file declares, exports or mentions
+    it, so the check catches renames and moves without type information.
+    """
+    symbols.build((rel for result in results.values() for files, _ in result.symbol_refs for rel in files), jobs=jobs)
+
+    findings: list[Finding] = []
+    for file_path, result in results.items():
+        rel = file_path.relative_to(repo_root)
+        seen: set[tuple[tuple[str, ...], str]] = set()
+        for files, symbol in result.symbol_refs:
+            tables = [t for t in map(symbols.get, files) if t is not None]
+            if not tables or (files, symbol) in seen:
+                continue
+            seen.add((files, symbol))
+            name = SYMBOL_REF_RE.match(symbol).group(1)
+            if any(name in table.names for table in tables):
+                continue
+            hint = difflib.get_close_matches(name, sorted(set().union(*(t.declared | t.exported for t in tables))), n=1)
+            findings.append(
+                Finding(
+                    severity="error",
+                    file=rel,
+                    message=(
+                        f"Anchor symbol not found: `{symbol}` does not appear in `{'`, `'.join(files)}`"
+                        + (f" (did you mean `{hint[0]}`?)." if hint else ".")
+                    ),
+                )
+            )
+    return findings
+
+
+@dataclass
+class DocLinks:
+    """One doc's outgoing links and the fragment ids it defines (heading slugs, `<toc>` items, html ids)."""
+
+    anchors: set[str] = field(default_factory=set)
+    # `(line number, href)` for every inline link, image and reference definition outside code.
+    links: list[tuple[int, str]] = field(default_factory=list)
+
+
+def slugify_heading(text: str) -> str:
+    # GitHub-style: drop inline markup, lowercase, keep word chars/spaces/hyphens, then spaces -> hyphens.
+    text = INLINE_LINK_TEXT_RE.sub(r"\1", text)
+    text = re.sub(r"<[^>]+>", "", text).replace("`", "").lower()
+    text = re.sub(r"[^\w\- ]", "", text)
+    return text.replace(" ", "-")
+
+
+def parse_doc_links(file_path: Path, data: bytes | None = None) -> DocLinks:
+    doc = DocLinks()
+    slug_counts: dict[str, int] = {}
+    fences = FenceTracker()
+
+    with (
+        file_path.open(encoding="utf-8", errors="replace")
+        if data is None
+        else contextlib.nullcontext(data.decode("utf-8", errors="replace").splitlines(keepends=True))
+    ) as fh:
+        for lineno, line in enumerate(fh, start=1):
+            if fences.feed(line) is not None:
+                continue
+
+            h = ATX_HEADING_RE.match(line)
+            if h:
+                text = h.group(2)
+                custom = CUSTOM_HEADING_ID_RE.search(text)
+                if custom:
+                    doc.anchors.add(custom.group(1))
+                    text = text[: custom.start()]
+                slug = slugify_heading(text.strip())
+                seen = slug_counts.get(slug, 0)
+                slug_counts[slug] = seen + 1
+                doc.anchors.add(slug if seen == 0 else f"{slug}-{seen}")
+
+            if "<" in line:
+                doc.anchors.update(m.group(1) for m in HTML_ID_RE.finditer(line))
+
+            if "](" in line or "]:" in line:
+                # Blank out code spans so paths shown as code are not mistaken for links.
+                visible = CODE_SPAN_RE.sub(lambda m: "x" * len(m.group(0)), line) if "`" in line else line
+                doc.links.extend((lineno, m.group(1)) for m in MD_LINK_RE.finditer(visible))
+                ref = MD_REF_DEF_RE.match(visible)
+                if ref:
+                    doc.links.append((lineno, ref.group(1)))
+
+    return doc
+
+
+class LinkGraph:
+    """Every doc's links and fragment ids under one docs root, parsed once and checked with set lookups."""
+
+    def __init__(
+        self,
+        *,
+        repo_root: Path,
+        docs_root: Path,
+        path_index: PathIndex | None,
+        read: Callable[[str], bytes] | None = None,
+    ) -> None:
+        self.repo_root = repo_root
+        self.docs_root = docs_root
+        self.path_index = path_index
+        # Content source for non-worktree runs (`--rev`); None reads files from disk.
+        self.read = read
+        self.docs: dict[str, DocLinks] = {}
+
+    def _parse(self, rel: str) -> DocLinks:
+        return parse_doc_links(self.repo_root / rel, data=self.read(rel) if self.read else None)
+
+    def _is_file(self, rel: str) -> bool:
+        if isinstance(self.path_index, RevisionIndex):
+            return rel in self.path_index.files
+        return (self.repo_root / rel).is_file()
+
+    def build(self, files: list[Path], *, jobs: int) -> None:
+        rels = [os.path.relpath(p, self.repo_root) for p in files]
+        if self.read is not None:
+            self.docs.update((rel, self._parse(rel)) for rel in rels)
+            return
+        if jobs <= 1 or len(files) <= 1:
+            parsed: Iterable[DocLinks] = map(parse_doc_links, files)
+            self.docs.update(zip(rels, parsed))
+            return
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunksize = max(1, len(files) // (jobs * 4))
+            self.docs.update(zip(rels, pool.map(parse_doc_links, files, chunksize=chunksize)))
+
+    def _exists(self, rel: str) -> bool:
+        return _target_exists(self.repo_root, rel, self.path_index)
+
+    def _anchors_for(self, rel: str) -> set[str]:
+        # Targets outside the checked set (e.g. `_archive/`) are parsed on first fragment lookup only.
+        doc = self.docs.get(rel)
+        if doc is None:
+            doc = self.docs[rel] = self._parse(rel)
+        return doc.anchors
+
+    def resolve(self, source_rel: str, href: str) -> tuple[str | None, str] | None:
+        """Map an href to `(repo-relative target or None if unresolvable, fragment)`; None means skip."""
+        href = href.strip("<>")
+        if URL_SCHEME_RE.match(href) or href.startswith("//"):
+            return None
+        path, _, fragment = href.partition("#")
+        path = unquote(path.split("?", 1)[0])
+        fragment = unquote(fragment)
+        if not path:
+            return source_rel, fragment
+
+        if path.startswith("/"):
+            # Docs-site hrefs are rooted at `docs/`; fall back to repo-rooted paths.
+            candidates = [os.path.join(os.path.relpath(self.docs_root, self.repo_root), path[1:]), path[1:]]
+        else:
+            candidates = [os.path.join(os.path.dirname(source_rel), path)]
+
+        for candidate in candidates:
+            rel = os.path.normpath(candidate)
+            if rel.startswith(".."):
+                continue
+            if self._exists(rel):
+                return rel, fragment
+            if not os.path.splitext(rel)[1]:
+                for ext in (".md", ".mdx"):
+                    if self._exists(rel + ext):
+                        return rel + ext, fragment
+        return None, fragment
+
+    def check(self, sources: list[Path], *, severity: str) -> list[Finding]:
+        findings: list[Finding] = []
+        for source in sources:
+            source_rel = os.path.relpath(source, self.repo_root)
+            doc = self.docs[source_rel]
+            for lineno, href in doc.links:
+                resolved = self.resolve(source_rel, href)
+                if resolved is None:
+                    continue
+                target, fragment = resolved
+                if target is None:
+                    findings.append(
+                        Finding(
+                            severity=severity,
+                            file=Path(source_rel),
+                            message=f"Broken link (line {lineno}): `{href}` does not exist.",
+                        )
+                    )
+                    continue
+                if not fragment or not target.endswith((".md", ".mdx")) or FRAGMENT_LINE_RE.match(fragment):
+                    continue
+                if not self._is_file(target):
+                    continue
+                anchors = self._anchors_for(target)
+                if fragment not in anchors and fragment.lower() not in anchors:
+                    findings.append(
+                        Finding(
+                            severity=severity,
+                            file=Path(source_rel),
+                            message=f"Broken link fragment (line {lineno}): `{href}` has no heading or id `#{fragment}`.",
+                        )
+                    )
+        return findings
+
+
+@dataclass(frozen=True)
+class RouterChain:
+    """Where a legacy router leads: `hops` is its longest router path (itself first), `finals` the pages it ends at."""
+
+    hops: tuple[str, ...]
+    finals: tuple[str, ...]
+    cycle: tuple[str, ...] | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self.hops)
+
+
+class RouterGraph:
+    """Legacy-router stubs and their targets, followed on demand; every doc is scanned and every edge walked once."""
+
+    def __init__(self, *, repo_root: Path, path_index: PathIndex | None) -> None:
+        self.repo_root = repo_root
+        self.path_index = path_index
+        # rel -> router targets, or None when `rel` is not a router (or does not exist).
+        self.edges: dict[str, tuple[str, ...] | None] = {}
+        self.chains: dict[str, RouterChain] = {}
+
+    def targets(self, rel: str) -> tuple[str, ...] | None:
+        if rel in self.edges:
+            return self.edges[rel]
+        edges: tuple[str, ...] | None = None
+        file_path = self.repo_root / rel
+        if rel.endswith((".md", ".mdx")) and _target_exists(self.repo_root, rel, self.path_index) and file_path.is_file():
+            scan = scan_document(file_path)
+            if scan.is_router:
+                # The `_archive/` copy a router mentions is history, not a hop.
+                edges = tuple(
+                    t
+                    for t in sorted(set(scan.replacement_tokens))
+                    if t != rel and t.endswith((".md", ".mdx")) and "_archive" not in Path(t).parts
+                )
+        self.edges[rel] = edges
+        return edges
+
+    def resolve(self, rel: str) -> RouterChain | None:
+        """Chain for router `rel` (None if `rel` is not a router), via an iterative, memoized depth-first walk."""
+        root_targets = self.targets(rel)
+        if root_targets is None:
+            return None
+        if rel in self.chains:
+            return self.chains[rel]
+
+        on_path: dict[str, int] = {rel: 0}
+        path = [rel]
+        stack = [(rel, iter(root_targets))]
+        cycles: dict[str, tuple[str, ...]] = {}
+        while stack:
+            node, pending = stack[-1]
+            for target in pending:
+                target_edges = self.targets(target)
+                if target_edges is None or target in self.chains:
+                    continue
+                if target in on_path:
+                    loop = tuple(path[on_path[target] :]) + (target,)
+                    for member in loop:
+                        cycles.setdefault(member, loop)
+                    continue
+                on_path[target] = len(path)
+                path.append(target)
+                stack.append((target, iter(target_edges)))
+                break
+            else:
+                stack.pop()
+                path.pop()
+                del on_path[node]
+                self.chains[node] = self._finish(node, cycles.get(node))
+        return self.chains[rel]
+
+    def _finish(self, node: str, cycle: tuple[str, ...] | None) -> RouterChain:
+        longest: tuple[str, ...] = ()
+        finals: list[str] = []
+        for target in self.targets(node) or ():
+            chain = self.chains.get(target)
+            if chain is None:
+                if self.targets(target) is None and _target_exists(self.repo_root, target, self.path_index):
+                    finals.append(target)
+                # Otherwise broken (reported by the router check) or a cycle member still on the walk.
+                continue
+            if chain.depth > len(longest):
+                longest = chain.hops
+            finals.extend(chain.finals)
+            cycle = cycle or chain.cycle
+        return RouterChain(hops=(node,) + longest, finals=tuple(dict.fromkeys(finals)), cycle=cycle)
+
+    def check(self, sources: list[Path], *, max_depth: int | None) -> list[Finding]:
+        findings: list[Finding] = []
+        for source in sources:
+            rel = os.path.relpath(source, self.repo_root)
+            chain = self.resolve(rel)
+            if chain is None:
+                continue
+            if chain.cycle is not None:
+                findings.append(
+                    Finding(
+                        severity="error",
+                        file=Path(rel),
+                        message=f"Router cycle: {' -> '.join(f'`{r}`' for r in chain.cycle)}.",
+                    )
+                )
+            elif max_depth is not None and chain.depth > max_depth:
+                findings.append(
+                    Finding(
+                        severity="error",
+                        file=Path(rel),
+                        message=(
+                            f"Router chain depth {chain.depth} exceeds {max_depth}: "
+                            f"{' -> '.join(f'`{r}`' for r in chain.hops)} -> "
+                            f"{', '.join(f'`{f}`' for f in chain.finals) or '(nothing)'} "
+                            "(point at the final pages directly; see --collapse-routers)."
+                        ),
+                    )
+                )
+        return findings
+
+    def collapse(self, rel: str) -> bool:
+        """Rewrite router `rel` so list items naming another router name that router's final pages instead.
+
+        Returns False, leaving the file untouched, when the rewrite would not change a byte.
+        """
+        chain = self.resolve(rel)
+        if chain is None or chain.cycle is not None or chain.depth <= 1:
+            return False
+        direct = self.targets(rel) or ()
+        via = {t: self.chains[t].finals for t in direct if t in self.chains}
+        listed = set(direct) - set(via)
+        file_path = self.repo_root / rel
+        # `newline=""` on both sides: CRLF routers stay CRLF.
+        with file_path.open(encoding="utf-8", newline="") as fh:
+            text = fh.read()
+        out: list[str] = []
+        in_anchors = False
+        for line in text.splitlines(keepends=True):
+            if HEADING_RE.match(line):
+                in_anchors = bool(ANCHORS_H2_RE.match(line.strip()))
+            hops = {t for t in (normalize_path_token(m.group(1)) for m in BACKTICK_RE.finditer(line)) if t in via}
+            # Evidence under `## Ground truth anchors` is not a hop and is never rewritten.
+            if in_anchors or len(hops) != 1 or not LIST_ITEM_RE.match(line):
+                out.append(line)
+                continue
+            hop = hops.pop()
+            for final in via[hop]:
+                if final not in listed:
+                    listed.add(final)
+                    out.append(_swap_doc_path(line, hop, final))
+        new_text = "".join(out)
+        if new_text == text:
+            return False
+        tmp = file_path.with_name(file_path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8", newline="") as fh:
+            fh.write(new_text)
+        os.replace(tmp, file_path)
+        return True
+
+
+def _swap_doc_path(line: str, old: str, new: str) -> str:
+    # Swap both the repo path (`docs/x.md`) and its docs-site href (`/x.md`) forms.
+    placeholder = "\0"
+    line = line.replace(old, placeholder)
+    if old.startswith("docs/") and new.startswith("docs/"):
+        line = line.replace("/" + old[len("docs/") :], "/" + new[len("docs/") :])
+    return line.replace(placeholder, new)
+
+
+def _read_revision_blob(index: RevisionIndex, rel: str) -> tuple[str, bytes] | None:
+    entry = index.files.get(os.path.normpath(rel))
+    if entry is None:
+        return None
+    return entry[1], index.reader.read(entry[1])
+
+
+def check_revision(
+    *,
+    index: RevisionIndex,
+    doc_root: Path,
+    exclude_dirs: set[str],
+    forbid_workspace_aliases: bool,
+    strict_terms: bool,
+    scans: dict[str, DocScan],
+    only: set[str] | None = None,
+    line_ranges: bool = True,
+) -> list[Finding]:
+    """Check the docs as they exist at `index.rev`; `scans` memoizes blob scans across revisions by object id.
+
+    `only` restricts the pass to those repo-relative docs (still subject to root/exclusion filtering).
+    """
+    findings: list[Finding] = []
+    line_index = (
+        LineIndex(repo_root=index.repo_root, read_blob=partial(_read_revision_blob, index)) if line_ranges else None
+    )
+    for file_path in index.markdown_files(doc_root, exclude_dirs):
+        rel = os.path.relpath(file_path, index.repo_root)
+        if only is not None and rel not in only:
+            continue
+        oid = index.files[rel][1]
+        scan = scans.get(oid)
+        if scan is None:
+            scan = scans[oid] = scan_document(file_path, data=index.reader.read(oid))
+        findings.extend(
+            _check_file(
+                file_path=file_path,
+                repo_root=index.repo_root,
+                forbid_workspace_aliases=forbid_workspace_aliases,
+                strict_terms=strict_terms,
+                path_index=index,
+                line_index=line_index,
+                scan=scan,
+            ).findings
+        )
     return findings
 
 
+def staged_changes(repo_root: Path) -> tuple[set[str], set[str]]:
+    """Return `(staged paths with new content, paths added/deleted/renamed by the staged commit)`."""
+    out = subprocess.run(
+        ["git", "-C", str(repo_root), "diff", "--cached", "--name-status", "-z", "-M", "--no-ext-diff"],
+        check=True,
+        capture_output=True,
+    ).stdout
+    fields = [f for f in out.decode("utf-8", errors="surrogateescape").split("\0") if f]
+    touched: set[str] = set()
+    moved: set[str] = set()
+    i = 0
+    while i < len(fields):
+        status = fields[i][0]
+        if status in "RC":
+            old, new = fields[i + 1], fields[i + 2]
+            touched.add(new)
+            moved.add(new)
+            if status == "R":
+                moved.add(old)
+            i += 3
+            continue
+        path = fields[i + 1]
+        if status != "D":
+            touched.add(path)
+        if status in "ADT":
+            moved.add(path)
+        i += 2
+    return touched, moved
+
+
+def docs_mentioning(*, repo_root: Path, doc_root: Path, paths: set[str]) -> set[str]:
+    """Staged docs under `doc_root` whose text mentions any of `paths` (one `git grep --cached` call)."""
+    if not paths:
+        return set()
+    cmd = ["git", "-C", str(repo_root), "grep", "--cached", "-l", "-z", "-F"]
+    for path in sorted(paths):
+        cmd += ["-e", path]
+    cmd += ["--", os.path.relpath(doc_root, repo_root)]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode not in (0, 1):
+        raise subprocess.CalledProcessError(proc.returncode, cmd, proc.stdout, proc.stderr)
+    return {p for p in proc.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p}
+
+
+class Profile:
+    """Aggregates per-file `FileCheck.timings` into phase totals and the slowest files.
+
+    "symbols" runs once over all results after the per-file checks, so it is recorded with `record()` rather
+    than taken from `FileCheck.timings`.
+    """
+
+    PHASES = ("read", *(rule.name for rule in LINE_RULES), "existence checks", "line ranges", "symbols")
+
+    def __init__(self, *, top: int) -> None:
+        self.top = top
+        self.phases: dict[str, list[float]] = {name: [0.0, 0] for name in self.PHASES}
+        self.files: list[tuple[float, str]] = []
+        self.cache_hits = 0
+        self.wall_s = 0.0
+        # Seconds spent in `record()`ed phases, which no per-file total includes.
+        self.run_phase_s = 0.0
+
+    def add(self, rel: Path, result: FileCheck) -> None:
+        if result.timings is None:
+            self.cache_hits += 1
+            return
+        for name, (seconds, calls) in result.timings.items():
+            if name == "total":
+                self.files.append((seconds, str(rel)))
+                continue
+            acc = self.phases.setdefault(name, [0.0, 0])
+            acc[0] += seconds
+            acc[1] += calls
+
+    def record(self, name: str, seconds: float, calls: int) -> None:
+        acc = self.phases.setdefault(name, [0.0, 0])
+        acc[0] += seconds
+        acc[1] += calls
+        self.run_phase_s += seconds
+
+    def slowest(self) -> list[tuple[float, str]]:
+        return heapq.nlargest(self.top, self.files)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "wall_s": self.wall_s,
+            "files_checked": len(self.files),
+            "cache_hits": self.cache_hits,
+            "phases": {name: {"seconds": s, "calls": int(c)} for name, (s, c) in self.phases.items()},
+            "slowest_files": [{"file": rel, "seconds": s} for s, rel in self.slowest()],
+        }
+
+    def print_table(self) -> None:
+        checked_s = sum(s for s, _ in self.files) + self.run_phase_s or 1e-9
+        print(
+            f"\nProfile: {len(self.files)} files checked, {self.cache_hits} cache hits, {self.wall_s:.3f}s wall",
+            file=sys.stderr,
+        )
+        print(f"{'phase':<20} {'seconds':>10} {'calls':>10} {'share':>7}", file=sys.stderr)
+        for name, (seconds, calls) in sorted(self.phases.items(), key=lambda kv: -kv[1][0]):
+            print(f"{name:<20} {seconds:>10.4f} {int(calls):>10} {seconds / checked_s:>7.1%}", file=sys.stderr)
+        if self.files:
+            print(f"\nSlowest {min(self.top, len(self.files))} files:", file=sys.stderr)
+            for seconds, rel in self.slowest():
+                print(f"{seconds * 1000:>9.2f} ms  {rel}", file=sys.stderr)
+
+
+def print_findings(findings: list[Finding]) -> None:
+    for f in findings:
+        if f.severity == "error":
+            print(f"ERROR {f.file}: {f.message}", file=sys.stderr)
+    for f in findings:
+        if f.severity == "warning":
+            print(f"WARN  {f.file}: {f.message}", file=sys.stderr)
+
+
+def report(findings: list[Finding]) -> int:
+    errors = [f for f in findings if f.severity == "error"]
+    warnings = [f for f in findings if f.severity == "warning"]
+
+    print_findings(findings)
+
+    if errors:
+        print(f"\nFAILED: {len(errors)} errors, {len(warnings)} warnings", file=sys.stderr)
+        return 1
+
+    if warnings:
+        print(f"\nOK (with warnings): {len(warnings)} warnings", file=sys.stderr)
+        return 0
+
+    print("OK: MapGen docs hardening checks passed.")
+    return 0
+
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify (directory watches only)."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    DIR_MASK = (
+        IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+        | IN_ONLYDIR
+    )
+
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        # Imported lazily: only --watch needs ctypes, and it is a noticeable share of startup.
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, Path] = {}
+        self.wds: dict[Path, int] = {}
+
+    def watch_dir(self, path: Path) -> bool:
+        if path in self.wds:
+            return True
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.DIR_MASK)
+        if wd < 0:
+            return False
+        self.dirs[wd] = path
+        self.wds[path] = wd
+        return True
+
+    def read(self, timeout_s: float | None) -> list[tuple[Path | None, str, int]]:
+        """Block up to `timeout_s` for events; returns `(dir, name, mask)` triples (dir is None on overflow)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout_s)
+        if not ready:
+            return []
+        try:
+            buf = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        events: list[tuple[Path | None, str, int]] = []
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _cookie, name_len = self._EVENT.unpack_from(buf, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(buf[offset : offset + name_len].rstrip(b"\0"))
+            offset += name_len
+            if mask & self.IN_IGNORED:
+                path = self.dirs.pop(wd, None)
+                if path is not None:
+                    self.wds.pop(path, None)
+                continue
+            events.append((self.dirs.get(wd), name, mask))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DocsWatcher:
+    """Keeps per-doc results and the path index in memory and re-checks only docs touched by fs events."""
+
+    # Quiet period used to coalesce the burst of events a single editor save produces.
+    DEBOUNCE_S = 0.02
+
+    def __init__(
+        self,
+        *,
+        doc_root: Path,
+        repo_root: Path,
+        exclude_dirs: set[str],
+        check: partial[FileCheck],
+        path_index: PathIndex,
+        results: dict[Path, FileCheck],
+    ) -> None:
+        self.doc_root = doc_root
+        self.repo_root = repo_root
+        self.exclude_dirs = exclude_dirs
+        self.check = check
+        self.path_index = path_index
+        self.results = results
+        self.refs: dict[str, set[Path]] = {}
+        self.inotify = Inotify()
+        self._watch_doc_tree(doc_root)
+        for doc, result in results.items():
+            self._index_refs(doc, result)
+
+    def _is_doc(self, path: Path) -> bool:
+        if path.suffix != ".md":
+            return False
+        try:
+            rel = path.relative_to(self.doc_root)
+        except ValueError:
+            return False
+        return not any(part in self.exclude_dirs for part in rel.parts[:-1])
+
+    def _watch_doc_tree(self, root: Path) -> None:
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in self.exclude_dirs]
+            self.inotify.watch_dir(Path(dirpath))
+
+    def _rel_key(self, token: str) -> str | None:
+        path = Path(token)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.repo_root)
+            except ValueError:
+                return None
+        return os.path.normpath(path)
+
+    def _watch_target(self, rel: str) -> None:
+        # Watch the nearest existing ancestor so creations along the path are seen too.
+        parent = (self.repo_root / rel).parent
+        while not parent.is_dir() and parent != self.repo_root:
+            parent = parent.parent
+        self.inotify.watch_dir(parent)
+
+    def _index_refs(self, doc: Path, result: FileCheck) -> None:
+        for token in result.targets:
+            rel = self._rel_key(token)
+            if rel is None:
+                continue
+            self.refs.setdefault(rel, set()).add(doc)
+            self._watch_target(rel)
+
+    def _drop_refs(self, doc: Path) -> None:
+        result = self.results.get(doc)
+        if result is None:
+            return
+        for token in result.targets:
+            rel = self._rel_key(token)
+            docs = self.refs.get(rel) if rel is not None else None
+            if docs is not None:
+                docs.discard(doc)
+                if not docs:
+                    del self.refs[rel]
+
+    def _is_doc_dir(self, path: Path) -> bool:
+        try:
+            rel = path.relative_to(self.doc_root)
+        except ValueError:
+            return False
+        return not any(part in self.exclude_dirs for part in rel.parts)
+
+    def _ref_keys(self, rel: str, *, is_dir: bool) -> list[str]:
+        keys = [rel] if rel in self.refs else []
+        if is_dir:
+            prefix = rel + "/"
+            keys.extend(key for key in self.refs if key.startswith(prefix))
+        return keys
+
+    def _apply_events(self, events: list[tuple[Path | None, str, int]]) -> tuple[set[Path], set[Path]]:
+        recheck: set[Path] = set()
+        removed: set[Path] = set()
+        for directory, name, mask in events:
+            if directory is None or mask & Inotify.IN_Q_OVERFLOW:
+                # Kernel queue overflowed: fall back to a full pass over the doc tree.
+                recheck |= set(iter_markdown_files(self.doc_root, self.exclude_dirs)) | set(self.results)
+                continue
+            if not name:
+                continue
+            path = directory / name
+            rel = os.path.relpath(path, self.repo_root)
+            is_dir = bool(mask & Inotify.IN_ISDIR)
+
+            keys = self._ref_keys(rel, is_dir=is_dir)
+            for key in keys:
+                recheck |= self.refs[key]
+
+            if mask & (Inotify.IN_CREATE | Inotify.IN_MOVED_TO):
+                self.path_index.add(rel)
+                if is_dir and self._is_doc_dir(path):
+                    self._watch_doc_tree(path)
+                    recheck |= set(iter_markdown_files(path, self.exclude_dirs))
+                elif is_dir:
+                    # Move the watch down toward any anchored targets that may now be reachable.
+                    for key in keys:
+                        self._watch_target(key)
+            if mask & (Inotify.IN_DELETE | Inotify.IN_MOVED_FROM):
+                self.path_index.discard(rel)
+                if is_dir:
+                    removed |= {doc for doc in self.results if doc.is_relative_to(path)}
+            if self._is_doc(path):
+                recheck.add(path)
+        return recheck, removed
+
+    def _recheck(self, docs: set[Path], removed: set[Path]) -> list[Finding]:
+        findings: list[Finding] = []
+        for doc in sorted(docs | removed):
+            self._drop_refs(doc)
+            if not doc.is_file():
+                self.results.pop(doc, None)
+                continue
+            result = self.check(file_path=doc)
+            self.results[doc] = result
+            self._index_refs(doc, result)
+            findings.extend(result.findings)
+        return findings
+
+    def run(self) -> int:
+        print(f"[watch] watching {self.doc_root.relative_to(self.repo_root)} (Ctrl-C to stop)", file=sys.stderr)
+        try:
+            while True:
+                events = self.inotify.read(None)
+                started = time.perf_counter()
+                while True:
+                    more = self.inotify.read(self.DEBOUNCE_S)
+                    if not more:
+                        break
+                    events.extend(more)
+                recheck, removed = self._apply_events(events)
+                if not recheck and not removed:
+                    continue
+                changed = self._recheck(recheck, removed)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                totals = [f for result in self.results.values() for f in result.findings]
+                print(f"\n[watch] re-checked {len(recheck | removed)} doc(s) in {elapsed_ms:.0f} ms", file=sys.stderr)
+                print_findings(changed)
+                errors = sum(1 for f in totals if f.severity == "error")
+                print(
+                    f"[watch] tree: {errors} errors, {len(totals) - errors} warnings",
+                    file=sys.stderr,
+                )
+        except KeyboardInterrupt:
+            return 0
+        finally:
+            self.inotify.close()
+
+
+def main_revisions(*, args: argparse.Namespace, repo_root: Path, doc_root: Path, exclude_dirs: set[str]) -> int:
+    reader = GitBlobReader(repo_root)
+    scans: dict[str, DocScan] = {}
+    status = 0
+    try:
+        for rev in args.rev:
+            try:
+                index = RevisionIndex.from_rev(repo_root, rev, reader)
+            except subprocess.CalledProcessError as e:
+                print(f"ERROR: cannot list revision {rev!r}: {e.stderr.decode().strip()}", file=sys.stderr)
+                status = max(status, 2)
+                continue
+            findings = check_revision(
+                index=index,
+                doc_root=doc_root,
+                exclude_dirs=exclude_dirs,
+                forbid_workspace_aliases=args.forbid_workspace_aliases,
+                strict_terms=args.strict_terms,
+                scans=scans,
+                line_ranges=not args.no_line_ranges,
+            )
+            if args.links or args.strict_links:
+                links_root = repo_root / args.links_root
+                link_sources = index.markdown_files(links_root, exclude_dirs)
+                graph = LinkGraph(repo_root=repo_root, docs_root=links_root, path_index=index, read=index.read)
+                graph.build(link_sources, jobs=1)
+                findings.extend(graph.check(link_sources, severity="error" if args.strict_links else "warning"))
+            if len(args.rev) > 1:
+                print(f"\n== {rev} ==", file=sys.stderr)
+            status = max(status, report(findings))
+    finally:
+        reader.close()
+    return status
+
+
+def main_staged(*, args: argparse.Namespace, repo_root: Path, doc_root: Path, exclude_dirs: set[str]) -> int:
+    touched, moved = staged_changes(repo_root)
+    only = {p for p in touched if p.endswith(".md")}
+    # A staged edit to a cited file can push its `#L<n>` anchors out of range, so those docs are re-checked too.
+    cited = moved if args.no_line_ranges else moved | {p for p in touched if not p.endswith(".md")}
+    only |= docs_mentioning(repo_root=repo_root, doc_root=doc_root, paths=cited)
+    if not only:
+        print("OK: no staged MapGen docs affected.")
+        return 0
+
+    reader = GitBlobReader(repo_root)
+    try:
+        index = RevisionIndex.from_index(repo_root, reader)
+        findings = check_revision(
+            index=index,
+            doc_root=doc_root,
+            exclude_dirs=exclude_dirs,
+            forbid_workspace_aliases=args.forbid_workspace_aliases,
+            strict_terms=args.strict_terms,
+            scans={},
+            only=only,
+            line_ranges=not args.no_line_ranges,
+        )
+    finally:
+        reader.close()
+    return report(findings)
+
+
 def main(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(
         description=(
@@ -209,6 +1839,11 @@ def main(argv: list[str]) -> int:
         default=DEFAULT_DOC_ROOT,
         help=f"Docs root to scan (default: {DEFAULT_DOC_ROOT})",
     )
+    parser.add_argument(
+        "--repo-root",
+        default="",
+        help="Repo root override (default: auto-detect from this script location).",
+    )
     parser.add_argument(
         "--include-research",
         action="store_true",
@@ -229,12 +1864,126 @@ def main(argv: list[str]) -> int:
         action="store_true",
         help="Treat local term definitions as errors (otherwise warnings).",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Check files across N worker processes (0 = one per CPU; default: 1, serial).",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const=DEFAULT_CACHE_PATH,
+        default=None,
+        metavar="FILE",
+        help=(
+            "Reuse per-file findings for unchanged docs whose anchor targets are unchanged "
+            f"(repo-relative; default when given without a value: {DEFAULT_CACHE_PATH})."
+        ),
+    )
+    parser.add_argument(
+        "--cache-import",
+        metavar="FILE",
+        help="Seed the findings cache from an exported cache file before checking (implies --cache).",
+    )
+    parser.add_argument(
+        "--cache-export",
+        metavar="FILE",
+        help="Write the findings cache to FILE after checking (implies --cache).",
+    )
+    parser.add_argument(
+        "--rev",
+        action="append",
+        default=[],
+        metavar="COMMIT",
+        help=(
+            "Validate the docs at a git revision instead of the worktree (repeatable). Blobs are read through one "
+            "`git cat-file --batch` process and unchanged blobs are scanned once across revisions."
+        ),
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help=(
+            "Pre-commit fast path: check only staged docs (read from the index), plus docs that mention a path "
+            "the staged commit adds, deletes or renames."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the initial pass, keep running and re-check only docs affected by file changes (Linux inotify).",
+    )
+    parser.add_argument(
+        "--links",
+        action="store_true",
+        help=(
+            "Also build the link graph for every doc under --links-root and check Markdown links, "
+            "docs-site hrefs and #fragments against target headings/<toc> ids."
+        ),
+    )
+    parser.add_argument(
+        "--links-root",
+        default=DEFAULT_LINKS_ROOT,
+        help=f"Docs tree for --links (default: {DEFAULT_LINKS_ROOT}).",
+    )
+    parser.add_argument(
+        "--strict-links",
+        action="store_true",
+        help="Treat broken links and fragments as errors (otherwise warnings; implies --links).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record per-phase wall time and call counts plus the slowest files, and print a summary table.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="FILE",
+        help="Write the profile summary to FILE as JSON (implies --profile).",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of slowest files to report in the profile (default: 10).",
+    )
+    parser.add_argument(
+        "--max-router-depth",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Follow every legacy router under --root to its final canonical pages and fail on chains of more than "
+            "N router hops (a router pointing straight at canonical pages has depth 1). Router cycles always fail."
+        ),
+    )
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        help=(
+            "Also check that backticked symbols next to `.ts`/`.tsx` anchors still appear in the cited file, using a "
+            f"lexical symbol index cached by content hash in {DEFAULT_SYMBOL_CACHE_PATH}."
+        ),
+    )
+    parser.add_argument(
+        "--no-line-ranges",
+        action="store_true",
+        help="Skip checking that `file#L<n>` / `file:<n>:<col>` anchors fall inside the cited file.",
+    )
+    parser.add_argument(
+        "--collapse-routers",
+        action="store_true",
+        help="Rewrite router stubs in place so replacements that are themselves routers point at their final pages.",
+    )
 
     args = parser.parse_args(argv)
 
-    repo_root = find_repo_root(Path(__file__))
+    repo_root = Path(args.repo_root).resolve() if args.repo_root else find_repo_root(Path(__file__))
     doc_root = repo_root / args.root
-    if not doc_root.exists():
+    if not doc_root.exists() and not (args.rev or args.staged):
         print(f"ERROR: docs root does not exist: {doc_root}", file=sys.stderr)
         return 2
 
@@ -244,37 +1993,127 @@ def main(argv: list[str]) -> int:
     if args.include_adrs:
         exclude_dirs.discard("adrs")
 
-    md_files = iter_markdown_files(doc_root, exclude_dirs=exclude_dirs)
-    findings: list[Finding] = []
-    for file_path in md_files:
-        findings.extend(
-            check_file(
-                file_path=file_path,
-                repo_root=repo_root,
-                forbid_workspace_aliases=args.forbid_workspace_aliases,
-                strict_terms=args.strict_terms,
+    if args.rev or args.staged:
+        if args.rev and args.staged:
+            parser.error("--rev and --staged are mutually exclusive")
+        if args.watch or args.cache or args.cache_import or args.cache_export:
+            parser.error("--rev/--staged cannot be combined with --watch or the findings cache")
+        if args.max_router_depth is not None or args.collapse_routers:
+            parser.error("--rev/--staged cannot be combined with the router chain pass")
+        if args.symbols:
+            parser.error("--rev/--staged cannot be combined with --symbols")
+    if args.staged:
+        return main_staged(args=args, repo_root=repo_root, doc_root=doc_root, exclude_dirs=exclude_dirs)
+    if args.rev:
+        return main_revisions(args=args, repo_root=repo_root, doc_root=doc_root, exclude_dirs=exclude_dirs)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    cache: FindingsCache | None = None
+    cache_path: Path | None = None
+    if args.cache or args.cache_import or args.cache_export:
+        cache = FindingsCache(
+            flags=(
+                f"forbid_workspace_aliases={args.forbid_workspace_aliases},strict_terms={args.strict_terms},"
+                f"line_ranges={not args.no_line_ranges}"
             )
         )
+        if args.cache_import:
+            cache.load(Path(args.cache_import))
+        cache_path = repo_root / (args.cache or DEFAULT_CACHE_PATH)
+        cache.load(cache_path)
 
-    errors = [f for f in findings if f.severity == "error"]
-    warnings = [f for f in findings if f.severity == "warning"]
+    # A default one-shot run stats until enough lookups accumulate to justify listing the repo. Worker pools, cache
+    # revalidation, the link graph and watch mode list it up front: one listing shared by every worker and pass.
+    path_index = PathIndex.lazy(repo_root)
+    if jobs > 1 or cache is not None or args.links or args.strict_links or args.watch:
+        path_index.build()
+    # Each worker process gets its own copy and fills it for the files its docs cite.
+    line_index = None if args.no_line_ranges else LineIndex(repo_root=repo_root)
 
-    if findings:
-        for f in errors:
-            print(f"ERROR {f.file}: {f.message}", file=sys.stderr)
-        for f in warnings:
-            print(f"WARN  {f.file}: {f.message}", file=sys.stderr)
+    profile = Profile(top=args.profile_top) if (args.profile or args.profile_json) else None
+    started = time.perf_counter()
 
-    if errors:
-        print(f"\nFAILED: {len(errors)} errors, {len(warnings)} warnings", file=sys.stderr)
-        return 1
+    md_files = iter_markdown_files(doc_root, exclude_dirs=exclude_dirs)
+    results = check_file_results(
+        md_files=md_files,
+        repo_root=repo_root,
+        forbid_workspace_aliases=args.forbid_workspace_aliases,
+        strict_terms=args.strict_terms,
+        jobs=jobs,
+        cache=cache,
+        path_index=path_index,
+        line_index=line_index,
+        profile=profile is not None,
+    )
+    findings = [f for result in results.values() for f in result.findings]
 
-    if warnings:
-        print(f"\nOK (with warnings): {len(warnings)} warnings", file=sys.stderr)
-        return 0
+    if args.symbols:
+        symbols_started = time.perf_counter()
+        symbols = SymbolIndex(repo_root=repo_root, cache_path=repo_root / DEFAULT_SYMBOL_CACHE_PATH)
+        findings.extend(check_anchor_symbols(results=results, repo_root=repo_root, symbols=symbols, jobs=jobs))
+        symbols.save()
+        if profile is not None:
+            calls = sum(len(result.symbol_refs) for result in results.values())
+            profile.record("symbols", time.perf_counter() - symbols_started, calls)
 
-    print("OK: MapGen docs hardening checks passed.")
-    return 0
+    if args.links or args.strict_links:
+        links_root = repo_root / args.links_root
+        link_sources = iter_markdown_files(links_root, exclude_dirs=exclude_dirs)
+        graph = LinkGraph(repo_root=repo_root, docs_root=links_root, path_index=path_index)
+        graph.build(link_sources, jobs=jobs)
+        findings.extend(graph.check(link_sources, severity="error" if args.strict_links else "warning"))
+
+    if args.max_router_depth is not None or args.collapse_routers:
+        routers = RouterGraph(repo_root=repo_root, path_index=path_index)
+        if args.collapse_routers:
+            collapsed = [p for p in md_files if routers.collapse(os.path.relpath(p, repo_root))]
+            for file_path in collapsed:
+                print(f"Collapsed router chain: {file_path.relative_to(repo_root)}")
+            if collapsed:
+                # Re-walk the rewritten stubs so the depth check sees the result.
+                routers = RouterGraph(repo_root=repo_root, path_index=path_index)
+        findings.extend(routers.check(md_files, max_depth=args.max_router_depth))
+
+    if profile is not None:
+        profile.wall_s = time.perf_counter() - started
+        for file_path, result in results.items():
+            profile.add(file_path.relative_to(repo_root), result)
+        if args.profile_json:
+            Path(args.profile_json).write_text(json.dumps(profile.to_json(), indent=2) + "\n", encoding="utf-8")
+
+    if cache is not None and cache_path is not None:
+        cache.save(cache_path)
+        if args.cache_export:
+            cache.save(Path(args.cache_export))
+
+    status = report(findings)
+    if profile is not None:
+        profile.print_table()
+    if not args.watch:
+        return status
+
+    assert path_index is not None
+    try:
+        watcher = DocsWatcher(
+            doc_root=doc_root,
+            repo_root=repo_root,
+            exclude_dirs=exclude_dirs,
+            check=partial(
+                _check_file,
+                repo_root=repo_root,
+                forbid_workspace_aliases=args.forbid_workspace_aliases,
+                strict_terms=args.strict_terms,
+                path_index=path_index,
+                line_index=line_index,
+            ),
+            path_index=path_index,
+            results=results,
+        )
+    except OSError as e:
+        print(f"ERROR: --watch requires Linux inotify: {e}", file=sys.stderr)
+        return 2
+    return watcher.run()
 
 
 if __name__ == "__main__":
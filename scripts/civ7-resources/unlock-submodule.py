@@ -1,49 +1,180 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
 import os
+import re
+import select
 import subprocess
-import sys
 import time
+from dataclasses import dataclass
 from pathlib import Path
 
 
-SUBMODULE_REL = ".civ7/outputs/resources"
+# Lock files git leaves at the top of a gitdir when a writer dies; `refs/**/*.lock` is scanned separately.
+GITDIR_LOCKS = (
+    "index.lock",
+    "HEAD.lock",
+    "ORIG_HEAD.lock",
+    "FETCH_HEAD.lock",
+    "MERGE_HEAD.lock",
+    "config.lock",
+    "packed-refs.lock",
+    "shallow.lock",
+)
 
+_SECTION_RE = re.compile(r'^\s*\[\s*submodule\s+"((?:[^"\\]|\\.)*)"\s*\]\s*$')
+_OTHER_SECTION_RE = re.compile(r"^\s*\[")
+_KEY_RE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9-]*)\s*=\s*(.*?)\s*$")
 
-def sh(*args: str) -> str:
-    return subprocess.check_output(args, text=True).strip()
+# `--wait` tickets live here, inside the submodule gitdir (git ignores unknown entries there).
+WAIT_QUEUE_DIR = "unlock-wait-queue"
+DEFAULT_WAIT_TIMEOUT_S = 60.0
+# Poll interval when inotify is unavailable (non-Linux).
+FALLBACK_POLL_S = 0.2
+DEAD_HEAD_RECHECK_S = 1.0
 
 
-def resolve_repo_root() -> Path:
-    return Path(sh("git", "rev-parse", "--show-toplevel")).resolve()
+@dataclass(frozen=True)
+class Submodule:
+    name: str
+    path: str
 
 
-def gitdir_for_submodule(submodule_abs: Path) -> Path | None:
+@dataclass(frozen=True)
+class Holder:
+    pid: int
+    cmdline: str
+    reason: str
+
+
+def read_gitdir_pointer(dot_git: Path) -> Path | None:
+    """Resolve a `.git` entry: a directory is the gitdir itself, a file holds `gitdir: <path>`."""
+    if dot_git.is_dir():
+        return dot_git
     try:
-        gd = sh("git", "-C", str(submodule_abs), "rev-parse", "--git-dir")
-    except Exception:
+        text = dot_git.read_text(encoding="utf-8")
+    except OSError:
         return None
-    p = Path(gd)
-    if not p.is_absolute():
-        p = (submodule_abs / p).resolve()
-    return p
+    for line in text.splitlines():
+        if line.startswith("gitdir:"):
+            p = Path(line[len("gitdir:") :].strip())
+            return (p if p.is_absolute() else dot_git.parent / p).resolve()
+    return None
+
+
+def resolve_repo_root(start: Path | None = None) -> Path:
+    # Nearest enclosing worktree, skipping submodule worktrees (whose `.git` points into `.../modules/...`).
+    here = (start or Path.cwd()).resolve()
+    for d in (here, *here.parents):
+        dot_git = d / ".git"
+        if not dot_git.exists():
+            continue
+        gitdir = read_gitdir_pointer(dot_git)
+        if dot_git.is_file() and gitdir is not None and "modules" in gitdir.parts:
+            continue
+        return d
+    raise SystemExit("Not inside a git repository.")
 
 
-def is_submodule_configured(repo_root: Path) -> bool:
-    gitmodules = repo_root / ".gitmodules"
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def parse_gitmodules(gitmodules: Path) -> list[Submodule]:
+    """Read `submodule.<name>.path` entries from `.gitmodules` (git config syntax) without running git."""
     if not gitmodules.exists():
-        return False
-    try:
-        # `submodule.<name>.path` is usually keyed by submodule name, which here is also the path.
-        subprocess.check_output(
-            ["git", "config", "-f", str(gitmodules), "--get", f"submodule.{SUBMODULE_REL}.path"],
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        return True
-    except Exception:
-        return False
+        return []
+    out: list[Submodule] = []
+    name: str | None = None
+    for line in gitmodules.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.lstrip().startswith(("#", ";")):
+            continue
+        m = _SECTION_RE.match(line)
+        if m:
+            name = re.sub(r"\\(.)", r"\1", m.group(1))
+            continue
+        if _OTHER_SECTION_RE.match(line):
+            name = None
+            continue
+        m = _KEY_RE.match(line)
+        if name is not None and m and m.group(1).lower() == "path":
+            out.append(Submodule(name=name, path=_unquote(m.group(2))))
+    return out
+
+
+def gitdir_for_submodule(repo_root: Path, submodule: Submodule) -> Path | None:
+    # Primary: the submodule's own `.git` pointer; fallback: the default location under the superproject gitdir.
+    gitdir = read_gitdir_pointer(repo_root / submodule.path / ".git")
+    if gitdir is not None and gitdir.is_dir():
+        return gitdir
+    super_gitdir = read_gitdir_pointer(repo_root / ".git")
+    if super_gitdir is None:
+        return None
+    fallback = super_gitdir / "modules" / submodule.name
+    return fallback if fallback.is_dir() else None
+
+
+def find_locks(gitdir: Path) -> list[Path]:
+    locks = [gitdir / name for name in GITDIR_LOCKS if (gitdir / name).exists()]
+    for dirpath, _dirnames, filenames in os.walk(gitdir / "refs"):
+        locks.extend(Path(dirpath) / f for f in sorted(filenames) if f.endswith(".lock"))
+    return locks
+
+
+def _is_within(path: Path, roots: list[Path]) -> bool:
+    return any(path == root or root in path.parents for root in roots)
+
+
+def lock_holders(locks: list[Path], *, scope: list[Path]) -> dict[Path, list[Holder]] | None:
+    """Live processes that may hold each lock, from one sweep of `/proc` (None when `/proc` is unavailable).
+
+    A process holds a lock if it has the lock file open, or if it is a git process working inside `scope`
+    (git closes some lock fds before the final rename, so an open fd alone is not conclusive).
+    """
+    proc = Path("/proc")
+    if not (proc / "self" / "fd").is_dir():
+        return None
+    wanted = {str(lock): lock for lock in locks}
+    scope_strs = [str(s) for s in scope]
+    holders: dict[Path, list[Holder]] = {lock: [] for lock in locks}
+    self_pid = os.getpid()
+    for entry in os.scandir(proc):
+        if not entry.name.isdigit() or int(entry.name) == self_pid:
+            continue
+        pid = int(entry.name)
+        try:
+            argv = (proc / entry.name / "cmdline").read_bytes().split(b"\0")
+        except OSError:
+            continue
+        cmdline = " ".join(a.decode("utf-8", errors="replace") for a in argv if a)
+
+        try:
+            fds = os.listdir(proc / entry.name / "fd")
+        except OSError:
+            fds = []
+        for fd in fds:
+            try:
+                target = os.readlink(proc / entry.name / "fd" / fd)
+            except OSError:
+                continue
+            if target in wanted:
+                holders[wanted[target]].append(Holder(pid=pid, cmdline=cmdline, reason="has the lock open"))
+
+        exe = os.path.basename(argv[0].decode("utf-8", errors="replace")) if argv and argv[0] else ""
+        if exe != "git" and not exe.startswith("git-"):
+            continue
+        try:
+            cwd = Path(os.readlink(proc / entry.name / "cwd"))
+        except OSError:
+            cwd = None
+        if (cwd is not None and _is_within(cwd, scope)) or any(s in cmdline for s in scope_strs):
+            for lock in locks:
+                if not any(h.pid == pid for h in holders[lock]):
+                    holders[lock].append(Holder(pid=pid, cmdline=cmdline, reason="git process in this repository"))
+    return holders
 
 
 def unlink_if_exists(p: Path) -> bool:
@@ -56,29 +187,261 @@ def unlink_if_exists(p: Path) -> bool:
     return True
 
 
+def unlock_submodule(repo_root: Path, submodule: Submodule, *, dry_run: bool) -> tuple[int, int]:
+    """Remove unheld locks for one submodule; returns `(removed, still held)`."""
+    gitdir = gitdir_for_submodule(repo_root, submodule)
+    if gitdir is None:
+        print(f"{submodule.path}: not initialized; nothing to unlock.")
+        return (0, 0)
+    locks = find_locks(gitdir)
+    if not locks:
+        return (0, 0)
+
+    holders = lock_holders(locks, scope=[(repo_root / submodule.path).resolve(), gitdir])
+    if holders is None:
+        print("(No /proc on this platform: cannot check for live git processes before removing locks.)")
+    removed = held = 0
+    for lock in locks:
+        owners = holders.get(lock, []) if holders is not None else []
+        if owners:
+            held += 1
+            for h in owners:
+                print(f"Leaving lock: {lock} (pid {h.pid} {h.reason}: {h.cmdline})")
+            continue
+        if dry_run:
+            print(f"[dry-run] would remove lock: {lock}")
+            removed += 1
+        elif unlink_if_exists(lock):
+            removed += 1
+    return (removed, held)
+
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify (directory watches only)."""
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ONLYDIR = 0x01000000
+    DIR_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+    def __init__(self) -> None:
+        # Imported lazily: only --wait needs ctypes.
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched: set[Path] = set()
+
+    def watch_dir(self, path: Path) -> None:
+        if path not in self.watched and self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.DIR_MASK) >= 0:
+            self.watched.add(path)
+
+    def wait(self, timeout_s: float) -> None:
+        """Block until any watched directory changes (or `timeout_s` passes), then drain the event queue."""
+        ready, _, _ = select.select([self.fd], [], [], timeout_s)
+        if ready:
+            try:
+                os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WaitQueue:
+    """FIFO of `--wait` callers for one gitdir, as ticket files named `<arrival ns>-<pid>`.
+
+    Only the oldest live ticket may proceed, so concurrent callers are served in arrival order instead of all
+    waking on the same release; tickets of dead callers are skipped and cleaned up. The last caller to leave
+    removes the queue directory, so an idle gitdir carries nothing extra.
+    """
+
+    def __init__(self, gitdir: Path) -> None:
+        self.dir = gitdir / WAIT_QUEUE_DIR
+        self.ticket = self.dir / f"{time.time_ns():020d}-{os.getpid()}"
+        while True:
+            self.dir.mkdir(exist_ok=True)
+            try:
+                self.ticket.touch(exist_ok=False)
+                break
+            except FileNotFoundError:
+                # The previous last caller removed the directory between our mkdir and touch.
+                continue
+
+    def is_head(self) -> bool:
+        for name in sorted(os.listdir(self.dir)):
+            if name == self.ticket.name:
+                return True
+            try:
+                pid = int(name.rsplit("-", 1)[1])
+            except (IndexError, ValueError):
+                pid = -1
+            if pid > 0 and _pid_alive(pid):
+                return False
+            (self.dir / name).unlink(missing_ok=True)
+        return True
+
+    def release(self) -> None:
+        self.ticket.unlink(missing_ok=True)
+        try:
+            self.dir.rmdir()
+        except OSError:
+            # Still holds other callers' tickets (or is already gone).
+            pass
+
+
+def wait_for_release(
+    repo_root: Path, submodule: Submodule, gitdir: Path, queue: WaitQueue, *, timeout_s: float
+) -> bool:
+    """Block until this caller is first in line and the gitdir has no locks; True when it may proceed.
+
+    The timeout starts once this caller is first in line. If locks remain after it, unheld ones are removed (the
+    age-based stale-lock path); a lock a live process still holds is left and False is returned.
+    """
+    try:
+        inotify: Inotify | None = Inotify()
+    except OSError:
+        inotify = None
+    try:
+        if inotify is not None:
+            # Watches go in before every check, so a release between check and wait still wakes us.
+            inotify.watch_dir(gitdir)
+            inotify.watch_dir(queue.dir)
+        head_since: float | None = None
+        while True:
+            locks = find_locks(gitdir)
+            if inotify is not None:
+                for lock in locks:
+                    inotify.watch_dir(lock.parent)
+            if not queue.is_head():
+                # A crashed head leaves no event behind, so re-check liveness periodically.
+                head_since = None
+                remaining = DEAD_HEAD_RECHECK_S
+            else:
+                if not locks:
+                    return True
+                now = time.monotonic()
+                head_since = head_since if head_since is not None else now
+                remaining = head_since + timeout_s - now
+                if remaining <= 0:
+                    removed, held = unlock_submodule(repo_root, submodule, dry_run=False)
+                    if held:
+                        return False
+                    head_since = None
+                    continue
+            if inotify is not None:
+                inotify.wait(remaining)
+            else:
+                time.sleep(min(remaining, FALLBACK_POLL_S))
+    finally:
+        if inotify is not None:
+            inotify.close()
+
+
+def main_wait(repo_root: Path, submodules: list[Submodule], *, timeout_s: float, command: list[str]) -> int:
+    # Submodules are always queued in path order, so two callers waiting on several never deadlock.
+    queues: list[WaitQueue] = []
+    try:
+        for submodule in sorted(submodules, key=lambda s: s.path):
+            gitdir = gitdir_for_submodule(repo_root, submodule)
+            if gitdir is None:
+                print(f"{submodule.path}: not initialized; nothing to wait for.")
+                continue
+            queue = WaitQueue(gitdir)
+            queues.append(queue)
+            if not wait_for_release(repo_root, submodule, gitdir, queue, timeout_s=timeout_s):
+                print(f"{submodule.path}: lock still held after {timeout_s:.0f}s; giving up.")
+                return 1
+            print(f"{submodule.path}: unlocked.")
+        if not command:
+            return 0
+        # Our tickets stay at the head of each queue until the command exits, so later callers wait their turn.
+        return subprocess.run(command).returncode
+    finally:
+        for queue in queues:
+            queue.release()
+
+
 def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Remove stale git lock files (index.lock, HEAD.lock, refs/**/*.lock, ...) in every submodule listed in "
+            ".gitmodules, leaving any lock a live git process still holds."
+        )
+    )
+    parser.add_argument(
+        "--submodule",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Only unlock this submodule path (repeatable; default: every submodule in .gitmodules).",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without removing it.")
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help=(
+            "Instead of removing locks, wait (inotify, no polling on Linux) until they are released, serving "
+            "concurrent callers in arrival order. Stale unheld locks are removed only after --timeout. With a "
+            "trailing `-- COMMAND...`, run it while holding this caller's turn."
+        ),
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_WAIT_TIMEOUT_S,
+        metavar="SECONDS",
+        help=f"With --wait: how long a lock may outlive its release before it counts as stale (default: {DEFAULT_WAIT_TIMEOUT_S:.0f}).",
+    )
+    parser.add_argument("command", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if command and not args.wait:
+        parser.error("a trailing command requires --wait")
+    if args.wait and args.dry_run:
+        parser.error("--wait and --dry-run are mutually exclusive")
+
     repo_root = resolve_repo_root()
-    if not is_submodule_configured(repo_root):
-        print(f"Submodule {SUBMODULE_REL!r} not configured; nothing to unlock.")
+    submodules = parse_gitmodules(repo_root / ".gitmodules")
+    if args.submodule:
+        wanted = {p.rstrip("/") for p in args.submodule}
+        submodules = [s for s in submodules if s.path in wanted]
+    if not submodules:
+        print("No matching submodules configured; nothing to unlock.")
         return 0
+    if args.wait:
+        return main_wait(repo_root, submodules, timeout_s=args.timeout, command=command)
 
-    submodule_abs = (repo_root / SUBMODULE_REL).resolve()
-    gitdir = gitdir_for_submodule(submodule_abs)
+    removed = held = 0
+    for submodule in submodules:
+        r, h = unlock_submodule(repo_root, submodule, dry_run=args.dry_run)
+        removed += r
+        held += h
 
-    removed_any = False
-    # Primary: lock in the actual submodule gitdir (common case).
-    if gitdir is not None:
-        removed_any |= unlink_if_exists(gitdir / "index.lock")
-
-    # Fallback: expected path under the superproject's .git/modules.
-    fallback_gitdir = repo_root / ".git" / "modules" / Path(SUBMODULE_REL)
-    removed_any |= unlink_if_exists(fallback_gitdir / "index.lock")
-
-    if not removed_any:
+    if not removed and not held:
         print("No lock files found.")
-    return 0
+    # Non-zero when a lock is still held, so callers don't proceed as if the submodule were unlocked.
+    return 1 if held else 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-